@@ -1,22 +1,45 @@
 from datetime import datetime
+import math
 import random
-from flask import Flask, jsonify, request, current_app, g
+from flask import Flask, Response, jsonify, request, current_app, g
 from flask_sqlalchemy import SQLAlchemy
 from flask_restx import Api, Resource, fields
-from .utilities import Utility
+from werkzeug.middleware.proxy_fix import ProxyFix
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from .utilities import Utility, text_parser, parse_date, parse_bool, parse_id
 from .configs import DevelopmentConfig, TestingConfig, ProductionConfig
 from .services.token_decorator import token_required
+from .services.etag_decorator import conditional_get
+from .services.token_cache import token_cache
+from .services.response_cache import event_detail_cache, make_backend as make_cache_backend
+from .services.event_stream import event_hub, make_broker
+from .services.internal_decorator import internal_only
+from .services.rate_limit_decorator import rate_limited
+from .services.admission import rate_limiter, concurrency_limiter, make_store as make_rate_limit_store
+from .services.pool_metrics import pool_metrics, replica_pool_metrics
+from .services.query_timing import query_timer
+from .services.metrics import request_metrics
+from .services.replica_routing import RoutingSession, init_replica_routing, get_replica_engine
+from .services.pagination import parse_page_args, next_cursor
+from .services.serialization import iso
+from .services.archival import archive_expired_events
+from .services.job_queue import job_queue
+from .services.date_ranking import AvailabilityMatrix, rank_days, find_windows
 
 import os
 import logging
 
+import click
+import json
+
 standardize_response = Utility.standardize_response
 
 # Initialize extensions outside
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 api = Api()
 
-def create_app(config_name=None):
+def create_app(config_name=None, config_overrides=None):
     app = Flask(__name__)
 
     config_modes = {
@@ -27,18 +50,94 @@ def create_app(config_name=None):
 
     config_mode = config_modes.get(config_name, DevelopmentConfig)
     app.config.from_object(config_mode)
+    app.config.update(config_overrides or {})
+    if app.config['PROXY_FIX_X_FOR']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
 
     # Initialize extensions after configuring the app
     db.init_app(app)
     api.init_app(app)
+    api.representations['application/json'] = Utility.output_json
+    init_replica_routing(app)
+    query_timer.init_app(app)
+    request_metrics.init_app(app)
+    concurrency_limiter.init_app(app)
+    job_queue.init_app(app)
+    request_metrics.register_collector('db_pool', pool_metrics.stats)
+    request_metrics.register_collector('token_cache', token_cache.stats)
+    request_metrics.register_collector('detail_cache', event_detail_cache.stats)
+    request_metrics.register_collector('event_stream', event_hub.stats)
+    request_metrics.register_collector('rate_limit', rate_limiter.stats)
+    request_metrics.register_collector('admission', concurrency_limiter.stats)
+    request_metrics.register_collector('jobs', job_queue.stats)
+    token_cache.configure(maxsize=app.config['TOKEN_CACHE_SIZE'], ttl=app.config['TOKEN_CACHE_TTL'])
+    event_detail_cache.configure(
+        maxsize=app.config['DETAIL_CACHE_SIZE'],
+        ttl=app.config['DETAIL_CACHE_TTL'],
+        shared=make_cache_backend(app.config['DETAIL_CACHE_URL'])
+    )
+    rate_limiter.configure(
+        limits=app.config['RATE_LIMITS'],
+        store=make_rate_limit_store(app.config['RATE_LIMIT_STORE_URL']),
+        enabled=app.config['RATE_LIMIT_ENABLED']
+    )
+    event_hub.configure(broker=make_broker(app.config['EVENT_STREAM_BROKER_URL']), queue_size=app.config['EVENT_STREAM_QUEUE_SIZE'])
+
+    logging.basicConfig(level=app.config['LOG_LEVEL'])
+
+    @app.cli.command('init-db')
+    def init_db():
+        """
+        Creates any missing tables. Schema setup is an explicit deploy step, never part of
+        booting a worker; the MySQL container loads initdb/ instead.
+        """
+        db.create_all()
 
-    logging.basicConfig(level=logging.DEBUG)
+    @app.cli.command('archive-events')
+    @click.option('--max-batches', type=int, default=None, help='stop after this many batches')
+    def archive_events(max_batches):
+        """
+        Moves expired events and their rows from the hot tables into event_archive.
+        """
+        archived = archive_expired_events(
+            after_days=app.config['ARCHIVE_AFTER_DAYS'],
+            inactive_after_days=app.config['ARCHIVE_INACTIVE_AFTER_DAYS'],
+            batch_size=app.config['ARCHIVE_BATCH_SIZE'],
+            pause=app.config['ARCHIVE_BATCH_PAUSE'],
+            max_batches=max_batches
+        )
+        click.echo(f'Archived {archived} events')
+
+    @app.cli.command('run-jobs')
+    @click.option('--limit', type=int, default=None, help='stop after this many jobs')
+    def run_jobs(limit):
+        """
+        Runs the due background jobs in this process, e.g. from cron when JOB_WORKERS is 0.
+        """
+        ran = job_queue.run_pending(limit=limit)
+        click.echo(f'Ran {ran} jobs')
+
+    @app.cli.command('enqueue-job')
+    @click.argument('kind')
+    @click.argument('payload', default='{}')
+    def enqueue_job(kind, payload):
+        """
+        Queues a background job, e.g. `flask enqueue-job archive_events` from a scheduler.
+        """
+        job = job_queue.enqueue(kind, **json.loads(payload))
+        db.session.commit()
+        click.echo(f'Queued job {job.job_id}')
 
     with app.app_context():
         # Import models here
-        from .models import Date, Event, Account, Participant, Date, EventAddress, AccessToken
-        db.create_all()
-
+        from .models import Date, Event, Account, Participant, Date, EventAddress, AccessToken, EventArchive, is_availability_level
+        from . import tasks  # registers the job handlers
+        pool_metrics.attach(db.engine)
+        query_timer.attach(db.engine)
+        if get_replica_engine() is not None:
+            query_timer.attach(get_replica_engine())
+            replica_pool_metrics.attach(get_replica_engine())
+            request_metrics.register_collector('db_replica_pool', replica_pool_metrics.stats)
 
         participant_list_model = api.model('ParticipantDetail', {
             'participant_id': fields.Integer,
@@ -105,11 +204,27 @@ def create_app(config_name=None):
             'addresses': fields.List(fields.Nested(event_address_create_model), required=False)
         })
 
+        event_update_model = api.model('EventUpdate', {
+            'event_name': fields.String,
+            'description': fields.String,
+            'max_date': fields.Date,
+            'min_date': fields.Date
+        })
+
+        # PATCH /events/<token> fields and their parsers
+        event_update_fields = {
+            'event_name': text_parser(45),
+            'description': text_parser(255, nullable=True),
+            'max_date': parse_date,
+            'min_date': parse_date
+        }
+
         events_ns = api.namespace('events', path='/events', description='Event operations')
         api.add_namespace(events_ns)
 
         @events_ns.route('')
         class EventListResource(Resource):
+            @rate_limited('event_create')
             @events_ns.expect(event_create_model)
             def post(self):
                 try:
@@ -117,6 +232,12 @@ def create_app(config_name=None):
 
                     max_date = datetime.strptime(data['max_date'], '%Y-%m-%d').date()
                     min_date = datetime.strptime(data['min_date'], '%Y-%m-%d').date()
+                    if Event.span_days(min_date, max_date) > current_app.config['EVENT_MAX_DAYS']:
+                        return standardize_response(
+                            status='error',
+                            message=f"An event may span at most {current_app.config['EVENT_MAX_DAYS']} days",
+                            code=400
+                        )
 
                     event = Event.create(
                         event_name=data['event_name'],
@@ -126,6 +247,7 @@ def create_app(config_name=None):
                     )
                     db.session.flush()
                     
+                    addresses = []
                     addresses_data = data.get('addresses', [])
                     if len(addresses_data) > 0:
                         for address in addresses_data:
@@ -138,14 +260,22 @@ def create_app(config_name=None):
                                 state_or_province=address.get('state_or_province', ''),
                                 country_code=address.get('country_code', ''),
                                 postal_code=address.get('postal_code', ''),
-                                latitude=address.get('lat', None),
-                                longitude=address.get('lon', None)
+                                latitude=address.get('latitude', address.get('lat')),
+                                longitude=address.get('longitude', address.get('lon'))
                             )
+                            addresses.append(address)
 
                     token = AccessToken.create(
                         event_uuid=event.event_uuid
                     )
 
+                    # Geocoded in the background; the jobs commit together with the event
+                    if app.config['GEOCODER_URL']:
+                        db.session.flush()
+                        for address in addresses:
+                            if address.latitude is None:
+                                job_queue.enqueue('geocode_address', event_address_id=address.event_address_id)
+
                     db.session.commit()
                     return standardize_response(
                         status='success',
@@ -164,7 +294,93 @@ def create_app(config_name=None):
 
         @events_ns.route('/<string:token>')
         class EventDetailResource(Resource):
+            @token_required(allow_archived=True)
+            @conditional_get()
+            def get(self, token):
+                try:
+                    event_uuid = g.event_uuid
+                    if g.get('event_archived'):
+                        return standardize_response(
+                            status='success',
+                            data=EventArchive.get_detail(event_uuid),
+                            message='Event retrieved from the archive',
+                            code=200
+                        )
+
+                    def build():
+                        event = Event.get_event_detail_by_uuid(event_uuid)
+                        if not event:
+                            return None
+                        body, _ = standardize_response(
+                            status='success',
+                            data=event.to_detail_dict(),
+                            message='Event retrieved successfully',
+                            code=200
+                        )
+                        return Utility.dump_json(body)
+
+                    # conditional_get sets event_version whenever the event exists
+                    version = g.get('event_version')
+                    body = build() if version is None else event_detail_cache.get_or_build(event_uuid, version, build)
+                    if body is None:
+                        return standardize_response(
+                            status='error',
+                            message='Event not found',
+                            code=404
+                        )
+                    return Response(body, status=200, mimetype='application/json')
+                except Exception as e:
+                    current_app.logger.exception(e)
+                    return standardize_response(
+                        status='error',
+                        message='An error occurred while retrieving the event',
+                        code=500
+                    )
+
+            @token_required()
+            @events_ns.expect(event_update_model)
+            def patch(self, token):
+                try:
+                    event_uuid = g.event_uuid
+                    try:
+                        changes = Utility.parse_patch(request.get_json(silent=True), event_update_fields)
+                    except (TypeError, ValueError):
+                        return standardize_response(status='error', message='Invalid request', code=400)
+                    max_days = current_app.config['EVENT_MAX_DAYS']
+                    if 'min_date' in changes and 'max_date' in changes:
+                        if changes['min_date'] > changes['max_date']:
+                            return standardize_response(status='error', message='min_date must not be after max_date', code=400)
+                        if Event.span_days(changes['min_date'], changes['max_date']) > max_days:
+                            return standardize_response(status='error', message=f'An event may span at most {max_days} days', code=400)
+
+                    if not Event.apply_update(event_uuid, changes, max_days=max_days):
+                        db.session.rollback()
+                        # Only a failed update needs the row, to tell a missing event from an invalid range
+                        if Event.get_version(event_uuid) is None:
+                            return standardize_response(status='error', message='Event not found', code=404)
+                        return standardize_response(
+                            status='error',
+                            message=f'min_date must not be after max_date, and an event may span at most {max_days} days',
+                            code=400
+                        )
+                    db.session.commit()
+                    event_detail_cache.invalidate(event_uuid)
+
+                    updated = {name: iso(value) if name in ('min_date', 'max_date') else value for name, value in changes.items()}
+                    event_hub.publish(event_uuid, 'event_updated', updated)
+                    return standardize_response(status='success', data=updated, message='Event updated successfully', code=200)
+                except Exception as e:
+                    current_app.logger.exception(e)
+                    return standardize_response(
+                        status='error',
+                        message='An error occurred while updating the event',
+                        code=500
+                    )
+
+        @events_ns.route('/<string:token>/availability')
+        class EventAvailabilityResource(Resource):
             @token_required()
+            @conditional_get()
             def get(self, token):
                 try:
                     event_uuid = g.event_uuid
@@ -175,17 +391,149 @@ def create_app(config_name=None):
                             message='Event not found',
                             code=404
                         )
+                    if Event.span_days(event.min_date, event.max_date) > current_app.config['EVENT_MAX_DAYS']:
+                        return standardize_response(status='error', message='Event spans too many days', code=422)
+                    days = Date.get_availability_summary(
+                        event_uuid=event_uuid,
+                        min_date=event.min_date,
+                        max_date=event.max_date
+                    )
                     return standardize_response(
                         status='success',
-                        data=event.to_detail_dict(),
-                        message='Event retrieved successfully',
+                        data={
+                            'min_date': event.min_date.isoformat(),
+                            'max_date': event.max_date.isoformat(),
+                            'days': days
+                        },
+                        message='Availability retrieved successfully',
                         code=200
                     )
                 except Exception as e:
                     current_app.logger.exception(e)
                     return standardize_response(
                         status='error',
-                        message='An error occurred while retrieving the event',
+                        message='An error occurred while retrieving the availability',
+                        code=500
+                    )
+
+        @events_ns.route('/<string:token>/stream')
+        class EventStreamResource(Resource):
+            @token_required()
+            def get(self, token):
+                subscription = event_hub.subscribe(g.event_uuid)
+                return Response(
+                    subscription.stream(heartbeat=current_app.config['EVENT_STREAM_HEARTBEAT']),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+                )
+
+        @events_ns.route('/<string:token>/best-dates')
+        class EventBestDatesResource(Resource):
+            @token_required()
+            def get(self, token):
+                try:
+                    event_uuid = g.event_uuid
+                    try:
+                        top_k = int(request.args.get('top_k', 5))
+                        min_drivers = int(request.args.get('min_drivers', 0))
+                        require_organizers = request.args.get('require_organizers', 'true').lower() != 'false'
+                        weights = {
+                            level: float(request.args[f'{level}_weight'])
+                            for level in ('available', 'tentative', 'unavailable', 'no_response')
+                            if f'{level}_weight' in request.args
+                        }
+                    except ValueError:
+                        return standardize_response(status='error', message='Invalid request', code=400)
+                    if (not 1 <= top_k <= current_app.config['RANKING_TOP_K_MAX'] or min_drivers < 0
+                            or not all(math.isfinite(weight) for weight in weights.values())):
+                        return standardize_response(status='error', message='Invalid request', code=400)
+
+                    event = Event.get_event_by_uuid(event_uuid)
+                    if not event:
+                        return standardize_response(
+                            status='error',
+                            message='Event not found',
+                            code=404
+                        )
+                    if Event.span_days(event.min_date, event.max_date) > current_app.config['EVENT_MAX_DAYS']:
+                        return standardize_response(status='error', message='Event spans too many days', code=422)
+                    matrix = AvailabilityMatrix.from_rows(
+                        min_date=event.min_date,
+                        max_date=event.max_date,
+                        participants=Participant.get_roster_by_event_uuid(event_uuid),
+                        date_rows=Date.get_availability_rows_by_event(event_uuid)
+                    )
+                    days = rank_days(
+                        matrix,
+                        top_k=top_k,
+                        weights=weights,
+                        require_organizers=require_organizers,
+                        min_drivers=min_drivers
+                    )
+                    return standardize_response(
+                        status='success',
+                        data={'dates': [{**day, 'date': day['date'].isoformat()} for day in days]},
+                        message='Best dates retrieved successfully',
+                        code=200
+                    )
+                except Exception as e:
+                    current_app.logger.exception(e)
+                    return standardize_response(
+                        status='error',
+                        message='An error occurred while ranking the dates',
+                        code=500
+                    )
+
+        @events_ns.route('/<string:token>/windows')
+        class EventWindowsResource(Resource):
+            @token_required()
+            def get(self, token):
+                try:
+                    event_uuid = g.event_uuid
+                    try:
+                        window_length = int(request.args['window_length'])
+                        min_attendance = int(request.args.get('min_attendance', 0))
+                        top_k = int(request.args.get('top_k', 5))
+                    except (KeyError, ValueError):
+                        return standardize_response(status='error', message='Invalid request', code=400)
+                    if window_length < 1 or min_attendance < 0 or not 1 <= top_k <= current_app.config['RANKING_TOP_K_MAX']:
+                        return standardize_response(status='error', message='Invalid request', code=400)
+
+                    event = Event.get_event_by_uuid(event_uuid)
+                    if not event:
+                        return standardize_response(
+                            status='error',
+                            message='Event not found',
+                            code=404
+                        )
+                    if Event.span_days(event.min_date, event.max_date) > current_app.config['EVENT_MAX_DAYS']:
+                        return standardize_response(status='error', message='Event spans too many days', code=422)
+                    matrix = AvailabilityMatrix.from_rows(
+                        min_date=event.min_date,
+                        max_date=event.max_date,
+                        participants=Participant.get_roster_by_event_uuid(event_uuid),
+                        date_rows=Date.get_availability_rows_by_event(event_uuid)
+                    )
+                    windows = find_windows(
+                        matrix,
+                        window_length=window_length,
+                        min_attendance=min_attendance,
+                        top_k=top_k
+                    )
+                    return standardize_response(
+                        status='success',
+                        data={'windows': [
+                            {**w, 'start_date': w['start_date'].isoformat(), 'end_date': w['end_date'].isoformat()}
+                            for w in windows
+                        ]},
+                        message='Date windows retrieved successfully',
+                        code=200
+                    )
+                except Exception as e:
+                    current_app.logger.exception(e)
+                    return standardize_response(
+                        status='error',
+                        message='An error occurred while searching the date windows',
                         code=500
                     )
 
@@ -196,11 +544,27 @@ def create_app(config_name=None):
             'is_driver': fields.Boolean
         })
 
+        participant_update_model = api.model('ParticipantUpdate', {
+            'name': fields.String,
+            'postal_code': fields.String,
+            'color': fields.String,
+            'is_driver': fields.Boolean
+        })
+
+        # PATCH /events/<token>/participants/<phone> fields and their parsers
+        participant_update_fields = {
+            'name': text_parser(100),
+            'postal_code': text_parser(20, nullable=True),
+            'color': text_parser(45),
+            'is_driver': parse_bool
+        }
+
         participants_ns = api.namespace('participants', path='/events/<string:token>/participants', description='Participant operations')
         api.add_namespace(participants_ns)
 
         @participants_ns.route('')
         class ParticipantListResource(Resource):
+            @rate_limited('participant_join', by=('ip', 'token'))
             @token_required()
             @participants_ns.expect(participant_create_model)
             def post(self, token):
@@ -217,6 +581,8 @@ def create_app(config_name=None):
                         is_driver=data['is_driver']
                     )
                     db.session.commit()
+                    event_detail_cache.invalidate(event_uuid)
+                    event_hub.publish(event_uuid, 'participant_joined', participant.to_dict())
                     return standardize_response(
                         status='success',
                         data=participant.to_dict(),
@@ -231,13 +597,24 @@ def create_app(config_name=None):
                         code=500
                     )
             @token_required()
+            @conditional_get()
             def get(self, token):
                 try:
                     event_uuid = g.event_uuid
-                    participants = Participant.get_participants_by_event_uuid(event_uuid) # TODO Fix this line, it should be token not event_uuid
+                    try:
+                        fields, after, limit = parse_page_args(
+                            request.args,
+                            allowed_fields=Participant.schema.names,
+                            key='participant_id',
+                            default_limit=current_app.config['PAGE_SIZE_DEFAULT'],
+                            max_limit=current_app.config['PAGE_SIZE_MAX']
+                        )
+                    except ValueError:
+                        return standardize_response(status='error', message='Invalid request', code=400)
+                    participants, has_more = Participant.get_participants_page(event_uuid, fields=fields, after=after, limit=limit)
                     return standardize_response(
                         status='success',
-                        data={'participants': [p.to_dict() for p in participants]},
+                        data={'participants': participants, 'next_cursor': next_cursor(participants, 'participant_id', has_more)},
                         message='Participants retrieved successfully',
                         code=200
                     )
@@ -276,12 +653,39 @@ def create_app(config_name=None):
                 except Exception as e:
                     current_app.logger.exception(e)
                     return standardize_response(status='error', message='Failed to retrieve participants', code=500)      
+
+            @token_required()
+            @participants_ns.expect(participant_update_model)
+            def patch(self, phone, token):
+                try:
+                    event_uuid = g.event_uuid
+                    try:
+                        changes = Utility.parse_patch(request.get_json(silent=True), participant_update_fields)
+                    except (TypeError, ValueError):
+                        return standardize_response(status='error', message='Invalid request', code=400)
+
+                    if not Participant.apply_update(event_uuid, changes, phone=phone):
+                        db.session.rollback()
+                        return standardize_response(status='error', message='Participant not found', code=404)
+                    db.session.commit()
+                    event_detail_cache.invalidate(event_uuid)
+
+                    updated = {'phone': phone, **changes}
+                    event_hub.publish(event_uuid, 'participant_updated', updated)
+                    return standardize_response(status='success', data=updated, message='Participant updated successfully', code=200)
+                except Exception as e:
+                    current_app.logger.exception(e)
+                    return standardize_response(status='error', message='Failed to update participant', code=500)
             
         date_create_model = api.model('DateCreate', {
             'date': fields.DateTime(default='2023-10-01'),
             'availability_level': fields.Integer  # 0: available, 1: preferred, 2: unavailable
         })
 
+        date_bulk_model = api.model('DateBulk', {
+            'dates': fields.List(fields.Nested(date_create_model))
+        })
+
         dates_ns = api.namespace('dates', path='/events/<string:token>/participants/<string:participant_id>/dates', description='Date operations')
         api.add_namespace(dates_ns)
         
@@ -301,21 +705,151 @@ def create_app(config_name=None):
                         availability_level=data['availability_level']
                     )
                     db.session.commit()
+                    event_detail_cache.invalidate(event_uuid)
+                    event_hub.publish(event_uuid, 'date_added', date.to_dict())
                     return standardize_response(status='success', data=date.to_dict(), message='Date created', code=201)
                 except Exception as e:
                     current_app.logger.exception(e)
                     return standardize_response(status='error', message='Failed to create date', code=500)
 
             @token_required()
+            @conditional_get()
             def get(self, participant_id, token):
                 try:
                     event_uuid = g.event_uuid
-                    dates = Date.get_dates_by_participant_and_event(event_uuid=event_uuid, participant_id=participant_id)
-                    return standardize_response(status='success', data=[d.to_dict() for d in dates], message='Dates retrieved', code=200)
+                    try:
+                        fields, after, limit = parse_page_args(
+                            request.args,
+                            allowed_fields=Date.schema.names,
+                            key='date_id',
+                            default_limit=current_app.config['PAGE_SIZE_DEFAULT'],
+                            max_limit=current_app.config['PAGE_SIZE_MAX']
+                        )
+                    except ValueError:
+                        return standardize_response(status='error', message='Invalid request', code=400)
+                    dates, has_more = Date.get_dates_page(participant_id=participant_id, event_uuid=event_uuid, fields=fields, after=after, limit=limit)
+                    response, code = standardize_response(status='success', data=dates, message='Dates retrieved', code=200)
+                    # data stays a plain list for existing clients, so the cursor travels in a header
+                    cursor = next_cursor(dates, 'date_id', has_more)
+                    return response, code, {'X-Next-Cursor': cursor} if cursor else {}
                 except Exception as e:
                     current_app.logger.exception(e)
                     return standardize_response(status='error', message='Failed to retrieve dates', code=500)
 
+            @token_required()
+            @dates_ns.expect(date_bulk_model)
+            def put(self, participant_id, token):
+                try:
+                    event_uuid = g.event_uuid
+                    data = request.get_json()
+                    items = data.get('dates') if isinstance(data, dict) else None
+                    if not isinstance(items, list) or len(items) > current_app.config['BULK_DATES_MAX_ITEMS']:
+                        return standardize_response(status='error', message='Invalid request', code=400)
+                    try:
+                        participant_id = parse_id(participant_id)
+                    except ValueError:
+                        return standardize_response(status='error', message='Invalid participant_id', code=400)
+
+                    availability = {}
+                    try:
+                        for item in items:
+                            d = datetime.strptime(item['date'], '%Y-%m-%d').date()
+                            if not is_availability_level(item['availability_level']):
+                                raise ValueError(item['availability_level'])
+                            availability[d] = item['availability_level']
+                    except (KeyError, TypeError, ValueError):
+                        return standardize_response(status='error', message='Invalid date or availability_level', code=400)
+                    if not Participant.lock_in_event(participant_id, event_uuid):
+                        return standardize_response(status='error', message='Participant not found', code=404)
+
+                    dates, changes = Date.sync_participant_dates(event_uuid=event_uuid, participant_id=participant_id, availability=availability)
+                    db.session.flush()
+                    # Serialized before the commit expires the rows, which a later sync may already have deleted
+                    dates = [d.to_dict() for d in dates]
+                    db.session.commit()
+                    event_detail_cache.invalidate(event_uuid)
+                    event_hub.publish(event_uuid, 'dates_replaced', {
+                        'participant_id': participant_id,
+                        'dates': dates
+                    })
+                    return standardize_response(
+                        status='success',
+                        data={**changes, 'dates': dates},
+                        message='Dates synchronized',
+                        code=200
+                    )
+                except (IntegrityError, StaleDataError):
+                    # Another write to the same dates won the race, e.g. on a database without row locks
+                    db.session.rollback()
+                    return standardize_response(status='error', message='Dates were changed concurrently, please retry', code=409)
+                except Exception as e:
+                    current_app.logger.exception(e)
+                    return standardize_response(status='error', message='Failed to synchronize dates', code=500)
+
+        @dates_ns.route('/bulk')
+        class DateBulkResource(Resource):
+            @token_required()
+            @dates_ns.expect(date_bulk_model)
+            def post(self, participant_id, token):
+                try:
+                    event_uuid = g.event_uuid
+                    data = request.get_json()
+                    items = data.get('dates') if isinstance(data, dict) else None
+                    if not isinstance(items, list) or len(items) > current_app.config['BULK_DATES_MAX_ITEMS']:
+                        return standardize_response(status='error', message='Invalid request', code=400)
+                    try:
+                        participant_id = parse_id(participant_id)
+                    except ValueError:
+                        return standardize_response(status='error', message='Invalid participant_id', code=400)
+
+                    results = []
+                    availability = {}
+                    for item in items:
+                        result = {'date': None, 'availability_level': None}
+                        try:
+                            d = datetime.strptime(item['date'], '%Y-%m-%d').date()
+                            availability_level = item['availability_level']
+                            if not is_availability_level(availability_level):
+                                raise ValueError(availability_level)
+                            result.update(date=d.isoformat(), availability_level=availability_level, status='success')
+                            availability[d] = availability_level
+                        except (KeyError, TypeError, ValueError):
+                            result.update(
+                                date=item.get('date') if isinstance(item, dict) else None,
+                                availability_level=item.get('availability_level') if isinstance(item, dict) else None,
+                                status='error',
+                                message='Invalid date or availability_level'
+                            )
+                        results.append(result)
+
+                    if not availability:
+                        return standardize_response(status='error', data=results, message='No valid dates', code=400)
+                    if not Participant.lock_in_event(participant_id, event_uuid):
+                        return standardize_response(status='error', message='Participant not found', code=404)
+
+                    dates = Date.bulk_upsert(event_uuid=event_uuid, participant_id=participant_id, availability=availability)
+                    # Serialized before the commit expires the rows, which a concurrent sync may delete
+                    dates = [d.to_dict() for d in dates]
+                    db.session.commit()
+                    event_detail_cache.invalidate(event_uuid)
+                    event_hub.publish(event_uuid, 'dates_changed', {
+                        'participant_id': participant_id,
+                        'dates': dates
+                    })
+
+                    date_ids = {d['date']: d['date_id'] for d in dates}
+                    for result in results:
+                        if result['status'] == 'success':
+                            result['date_id'] = date_ids.get(result['date'])
+                    return standardize_response(status='success', data=results, message='Dates saved', code=200)
+                except (IntegrityError, StaleDataError):
+                    # Another write to the same dates won the race, e.g. on a database without row locks
+                    db.session.rollback()
+                    return standardize_response(status='error', message='Dates were changed concurrently, please retry', code=409)
+                except Exception as e:
+                    current_app.logger.exception(e)
+                    return standardize_response(status='error', message='Failed to save dates', code=500)
+
         @dates_ns.route('/<int:date_id>')
         class DateDetailResource(Resource):
             @token_required()
@@ -325,8 +859,11 @@ def create_app(config_name=None):
                     date = Date.get_date_by_date_by_id_participant_and_event(participant_id=participant_id, event_uuid=event_uuid, date_id=date_id)
                     if not date:
                         return standardize_response(status='error', message='Date not found', code=404)
+                    removed = {'date_id': date.date_id, 'participant_id': date.participant_id}
                     db.session.delete(date)
                     db.session.commit()
+                    event_detail_cache.invalidate(event_uuid)
+                    event_hub.publish(event_uuid, 'date_removed', removed)
                     return standardize_response(status='success', message='Date deleted successfully', code=200)
                 except Exception as e:
                     current_app.logger.exception(e)
@@ -351,9 +888,21 @@ def create_app(config_name=None):
                     date.date = d
                     date.availability_level = availability_level
                     db.session.commit()
+                    event_detail_cache.invalidate(event_uuid)
+                    event_hub.publish(event_uuid, 'date_changed', date.to_dict())
                     return standardize_response(status='success', data=date.to_dict(), message='Date updated successfully', code=200)
 
                 except Exception as e:
                     current_app.logger.exception(e)
                     return standardize_response(status='error', message='Failed to update date', code=500)
+
+        internal_ns = api.namespace('internal', path='/internal', description='Operational endpoints')
+        api.add_namespace(internal_ns)
+
+        @internal_ns.route('/pool')
+        class PoolMetricsResource(Resource):
+            @internal_only()
+            def get(self):
+                return standardize_response(status='success', data=pool_metrics.stats(), message='Pool metrics retrieved', code=200)
+
         return app
\ No newline at end of file
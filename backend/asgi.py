@@ -0,0 +1,329 @@
+"""
+ASGI application serving the hot read endpoints and the event stream on SQLAlchemy's async
+engine, so slow clients and long-lived streams wait on the event loop instead of holding a
+worker thread. Every other request, including all writes, is passed to the Flask app.
+
+The async handlers execute the same model statements as the Flask resources and answer with
+identical bodies, ETags and status codes. Serve backend/run_asgi.py with any ASGI server:
+
+    uvicorn backend.run_asgi:app --host 0.0.0.0 --port 5000
+"""
+import asyncio
+import re
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import parse_etags, quote_etag
+
+from .app import create_app
+from .models import Event, Participant, Date, AccessToken, ArchivedToken, EventArchive
+from .utilities import Utility
+from .services.event_stream import event_hub
+from .services.metrics import request_metrics
+from .services.pagination import parse_page_args, next_cursor
+from .services.replica_routing import READ_PRIMARY_COOKIE
+from .services.response_cache import event_detail_cache
+from .services.token_cache import token_cache
+
+standardize_response = Utility.standardize_response
+
+# sync driver -> async driver for the same database
+ASYNC_DRIVERS = {
+    'mysql': 'mysql+aiomysql',
+    'mysql+pymysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite'
+}
+ASYNC_DRIVER_NAMES = ('aiomysql', 'asyncmy', 'aiosqlite')
+
+
+def async_database_uri(uri):
+    """
+    Returns uri with its driver swapped for the async one, e.g. mysql+pymysql -> mysql+aiomysql.
+    """
+    scheme, separator, rest = uri.partition('://')
+    if scheme.partition('+')[2] in ASYNC_DRIVER_NAMES:
+        return uri
+    if scheme not in ASYNC_DRIVERS:
+        raise ValueError(f'No async driver for {scheme}')
+    return ASYNC_DRIVERS[scheme] + separator + rest
+
+
+def async_engine_options(options):
+    """
+    Engine options for the async engine. The sync pool class cannot drive async connections,
+    so the async engine keeps its default pool with the same sizing.
+    """
+    return {key: value for key, value in options.items() if key != 'poolclass'}
+
+
+def request_headers(scope):
+    return {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+
+
+class AsyncReadApp:
+    """
+    ASGI app answering GET requests for event details, availability, participant listings and
+    the event stream, and forwarding everything else to the Flask app through WsgiToAsgi.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.config = flask_app.config
+        self.fallback = WsgiToAsgi(flask_app)
+        options = async_engine_options(self.config['SQLALCHEMY_ENGINE_OPTIONS'])
+        self.engine = create_async_engine(
+            async_database_uri(self.config.get('SQLALCHEMY_ASYNC_DATABASE_URI') or self.config['SQLALCHEMY_DATABASE_URI']),
+            **options
+        )
+        self.replica_engine = None
+        if self.config.get('SQLALCHEMY_REPLICA_URI'):
+            self.replica_engine = create_async_engine(async_database_uri(self.config['SQLALCHEMY_REPLICA_URI']), **options)
+        self.routes = [
+            (re.compile(r'/events/(?P<token>[^/]+)'), 'EventDetailResource', self.event_detail, 'the event'),
+            (re.compile(r'/events/(?P<token>[^/]+)/availability'), 'EventAvailabilityResource', self.event_availability, 'the availability'),
+            (re.compile(r'/events/(?P<token>[^/]+)/participants'), 'ParticipantListResource', self.participant_list, 'the participants')
+        ]
+        self.stream_route = re.compile(r'/events/(?P<token>[^/]+)/stream')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            path = scope['path']
+            match = self.stream_route.fullmatch(path)
+            if match:
+                return await self.event_stream(scope, receive, send, match['token'])
+            for pattern, resource, handler, subject in self.routes:
+                match = pattern.fullmatch(path)
+                if match:
+                    return await self.serve(scope, send, resource, handler, subject, match['token'])
+        return await self.fallback(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                if self.replica_engine is not None:
+                    await self.replica_engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def read_engine(self, headers):
+        """
+        Mirrors init_replica_routing: reads go to the replica unless the client wrote within
+        its read-your-writes window.
+        """
+        if self.replica_engine is None:
+            return self.engine
+        cookie = SimpleCookie(headers.get('cookie', ''))
+        try:
+            until = float(cookie[READ_PRIMARY_COOKIE].value) if READ_PRIMARY_COOKIE in cookie else 0
+        except ValueError:
+            until = 0
+        return self.engine if until > time.time() else self.replica_engine
+
+    async def resolve_token(self, session, token):
+        """
+        Async counterpart of token_required: returns the token's event_uuid, or None if it is invalid.
+        """
+        event_uuid = token_cache.get(token)
+        if event_uuid is not None:
+            return event_uuid
+        statement = select(AccessToken.event_uuid).where(AccessToken.token == token)
+        event_uuid = (await session.execute(statement)).scalar()
+        if event_uuid is None and session.bind is not self.engine:
+            # The token may be newer than the replica, e.g. right after the event was created
+            async with AsyncSession(self.engine) as primary:
+                event_uuid = (await primary.execute(statement)).scalar()
+        if event_uuid is not None:
+            token_cache.set(token, event_uuid)
+        return event_uuid
+
+    async def serve(self, scope, send, resource, handler, subject, token):
+        """
+        Runs handler with the same token check, conditional GET and error handling the Flask
+        resources apply, then records the request in request_metrics.
+        """
+        start = time.perf_counter()
+        headers = request_headers(scope)
+        response_headers = {}
+        try:
+            async with AsyncSession(self.read_engine(headers)) as session:
+                event_uuid = await self.resolve_token(session, token)
+                if event_uuid is None:
+                    body, status = await self.archived(session, token, handler)
+                else:
+                    # Read before the handler runs so a concurrent write can only make the ETag stale, never too new
+                    version = (await session.execute(Event.version_statement(event_uuid))).scalar()
+                    if version is not None:
+                        etag = str(version)
+                        response_headers = {'ETag': quote_etag(etag, weak=True), 'Cache-Control': 'no-cache'}
+                        if parse_etags(headers.get('if-none-match')).contains_weak(etag):
+                            await self.respond(send, 304, None, response_headers)
+                            request_metrics.observe(resource, 'GET', 304, time.perf_counter() - start)
+                            return
+                    query = MultiDict(parse_qsl(scope['query_string'].decode('latin-1')))
+                    body, status = await handler(session, event_uuid, query, version)
+                    if status != 200:
+                        response_headers = {}
+        except Exception as e:
+            self.flask_app.logger.exception(e)
+            body, status = standardize_response(status='error', message=f'An error occurred while retrieving {subject}', code=500)
+            response_headers = {}
+        await self.respond(send, status, body, response_headers)
+        request_metrics.observe(resource, 'GET', status, time.perf_counter() - start)
+
+    async def archived(self, session, token, handler):
+        """
+        Answers a token that matches no live event like token_required(allow_archived=True) does
+        for the event detail, and with 410 on the other endpoints.
+        """
+        event_uuid = (await session.execute(ArchivedToken.event_uuid_statement(token))).scalar()
+        if event_uuid is None:
+            return standardize_response(status='error', message='Invalid token', code=401)
+        if handler != self.event_detail:
+            return standardize_response(status='error', message='Event has been archived', code=410)
+        payload = (await session.execute(EventArchive.payload_statement(event_uuid))).scalar()
+        return standardize_response(
+            status='success',
+            data=EventArchive.decode(payload)['detail'],
+            message='Event retrieved from the archive',
+            code=200
+        )
+
+    async def respond(self, send, status, body, headers):
+        """
+        Sends body, either a dict to serialize or an already serialized JSON payload.
+        """
+        if body is None:
+            payload = b''
+        else:
+            payload = body if isinstance(body, bytes) else Utility.dump_json(body)
+        raw_headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()]
+        if body is not None:
+            raw_headers += [(b'content-type', b'application/json'), (b'content-length', str(len(payload)).encode())]
+        await send({'type': 'http.response.start', 'status': status, 'headers': raw_headers})
+        await send({'type': 'http.response.body', 'body': payload})
+
+    async def event_detail(self, session, event_uuid, query, version):
+        """
+        Serves the body from event_detail_cache like EventDetailResource. The cache blocks while
+        another request builds the same version, so it is consulted from a worker thread; the
+        build itself runs its query back on the event loop.
+        """
+        async def build():
+            event = (await session.execute(Event.detail_statement(event_uuid))).unique().scalar_one_or_none()
+            if not event:
+                return None
+            body, _ = standardize_response(
+                status='success',
+                data=event.to_detail_dict(),
+                message='Event retrieved successfully',
+                code=200
+            )
+            return Utility.dump_json(body)
+
+        if version is None:
+            body = await build()
+        else:
+            loop = asyncio.get_running_loop()
+            body = await asyncio.to_thread(
+                event_detail_cache.get_or_build,
+                event_uuid,
+                version,
+                lambda: asyncio.run_coroutine_threadsafe(build(), loop).result()
+            )
+        if body is None:
+            return standardize_response(status='error', message='Event not found', code=404)
+        return body, 200
+
+    async def event_availability(self, session, event_uuid, query, version):
+        event = (await session.execute(
+            select(Event.min_date, Event.max_date).where(Event.event_uuid == event_uuid)
+        )).first()
+        if not event:
+            return standardize_response(status='error', message='Event not found', code=404)
+        if Event.span_days(event.min_date, event.max_date) > self.config['EVENT_MAX_DAYS']:
+            return standardize_response(status='error', message='Event spans too many days', code=422)
+        counts = (await session.execute(Date.availability_counts_statement(event_uuid))).all()
+        return standardize_response(
+            status='success',
+            data={
+                'min_date': event.min_date.isoformat(),
+                'max_date': event.max_date.isoformat(),
+                'days': Date.summarize_availability(event.min_date, event.max_date, counts)
+            },
+            message='Availability retrieved successfully',
+            code=200
+        )
+
+    async def participant_list(self, session, event_uuid, query, version):
+        try:
+            fields, after, limit = parse_page_args(
+                query,
+                allowed_fields=Participant.schema.names,
+                key='participant_id',
+                default_limit=self.config['PAGE_SIZE_DEFAULT'],
+                max_limit=self.config['PAGE_SIZE_MAX']
+            )
+        except ValueError:
+            return standardize_response(status='error', message='Invalid request', code=400)
+        schema, statement = Participant.page_statement(event_uuid, fields=fields, after=after, limit=limit)
+        rows = (await session.execute(statement)).all()
+        participants, has_more = schema.dump_rows(rows[:limit]), len(rows) > limit
+        return standardize_response(
+            status='success',
+            data={'participants': participants, 'next_cursor': next_cursor(participants, 'participant_id', has_more)},
+            message='Participants retrieved successfully',
+            code=200
+        )
+
+    async def event_stream(self, scope, receive, send, token):
+        headers = request_headers(scope)
+        async with AsyncSession(self.read_engine(headers)) as session:
+            event_uuid = await self.resolve_token(session, token)
+            if event_uuid is None:
+                body, status = await self.archived(session, token, self.event_stream)
+        if event_uuid is None:
+            await self.respond(send, status, body, {})
+            request_metrics.observe('EventStreamResource', 'GET', status, 0.0)
+            return
+
+        subscription = event_hub.subscribe_async(event_uuid)
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no')
+        ]})
+        request_metrics.observe('EventStreamResource', 'GET', 200, 0.0)
+
+        async def pump():
+            async for frame in subscription.stream(heartbeat=self.config['EVENT_STREAM_HEARTBEAT']):
+                await send({'type': 'http.response.body', 'body': frame.encode(), 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+
+        async def disconnected():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+
+        tasks = [asyncio.ensure_future(pump()), asyncio.ensure_future(disconnected())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            subscription.close()
+
+
+def create_asgi_app(config_name=None, config_overrides=None):
+    return AsyncReadApp(create_app(config_name, config_overrides))
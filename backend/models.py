@@ -1,11 +1,24 @@
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import enum
 from .app import db
-from sqlalchemy import Column, Date, DateTime, String, Enum, ForeignKey, Numeric, Index, UniqueConstraint, CheckConstraint, and_, text, Integer
-from sqlalchemy.dialects.mysql import INTEGER, TINYINT, BOOLEAN
-from sqlalchemy.orm import relationship
+from .services.token_cache import token_cache
+from .services.response_cache import event_detail_cache
+from .services.job_queue import job_queue
+from .services.serialization import Schema, iso, as_float
+from .utilities import Utility
+from .services.uuid_type import uuid_column_type
+from sqlalchemy import Column, Date, DateTime, String, Text, Enum, ForeignKey, Numeric, Index, UniqueConstraint, CheckConstraint, LargeBinary, and_, or_, text, Integer, func, select, update, delete, insert
+from sqlalchemy.event import listens_for
+from sqlalchemy.types import Date as DateType  # the Date model below shadows sqlalchemy's Date
+from sqlalchemy.dialects.mysql import INTEGER, TINYINT, BOOLEAN, MEDIUMBLOB
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import relationship, column_property, joinedload, selectinload, undefer
+from itertools import chain
 import uuid
 import secrets
+import json
+import zlib
 
 def generate_uuid():
     return str(uuid.uuid4())
@@ -13,10 +26,22 @@ def generate_uuid():
 def generate_token(length=32):
     return secrets.token_urlsafe(length)
 
+# Date.availability_level values, in the order they are reported by the API
+AVAILABILITY_LEVELS = {
+    0: 'available',
+    1: 'tentative',
+    2: 'unavailable'
+}
+
+def is_availability_level(value):
+    # bool is a subclass of int, so True and False would otherwise pass as 1 and 0
+    return isinstance(value, int) and not isinstance(value, bool) and value in AVAILABILITY_LEVELS
+
 class Event(db.Model):
     __tablename__ = 'event'
+    __table_args__ = (Index('ix_event_max_date', 'max_date'),)
 
-    event_uuid = Column(String(45), primary_key=True, default=generate_uuid)
+    event_uuid = Column(uuid_column_type(), primary_key=True, default=generate_uuid)
     event_name = Column(String(45), nullable=False)
     description = Column(String(255))
     date_created = Column(DateTime, nullable=False, server_default=db.func.current_timestamp())
@@ -24,80 +49,41 @@ class Event(db.Model):
     max_date = Column(Date, nullable=False, default=lambda: date.today() + timedelta(days=30)) 
     min_date = Column(Date, nullable=False, default=lambda: date.today() + timedelta(days=1))
     is_active = Column(BOOLEAN, default=True, nullable=False)
+    # Bumped whenever the event or its participants, dates or addresses change; used for ETags
+    version = Column(INTEGER(unsigned=True), nullable=False, default=0, server_default=text('0'))
 
     participants = relationship('Participant', backref='event', cascade="all, delete")
     dates = relationship('Date', backref='event', cascade="all, delete")
     access_tokens = relationship('AccessToken', backref='event', cascade="all, delete")
     addresses = relationship('EventAddress', backref='event', cascade="all, delete")
 
+    schema = Schema(
+        'event_name',
+        'description',
+        ('date_created', iso),
+        ('max_date', iso),
+        ('min_date', iso),
+        'is_active'
+    )
+    counts_schema = Schema('participants_count', 'addresses_count')
+
+    @staticmethod
+    def span_days(min_date, max_date):
+        return (max_date - min_date).days + 1
+
     def to_dict(self):
         return {
-            'event_name': self.event_name,
-            'description': self.description,
-            'date_created': self.date_created.isoformat() if self.date_created else None,
-            'max_date': self.max_date.isoformat() if self.max_date else None,
-            'min_date': self.min_date.isoformat() if self.min_date else None,
-            'is_active': self.is_active,
-            'addresses': [
-                {
-                    'event_address_id': a.event_address_id,
-                    'address_name': a.address_name,
-                    'street_line_1': a.street_line_1,
-                    'street_line_2': a.street_line_2,
-                    'city': a.city,
-                    'state_or_province': a.state_or_province,
-                    'country_code': a.country_code,
-                    'postal_code': a.postal_code,
-                    'latitude': float(a.latitude) if a.latitude is not None else None,
-                    'longitude': float(a.longitude) if a.longitude is not None else None
-                } for a in self.addresses
-            ]
+            **Event.schema.dump(self),
+            'addresses': EventAddress.schema.dump_many(self.addresses)
         }
 
     def to_detail_dict(self):
         return {
-            'event_name': self.event_name,
-            'description': self.description,
-            'date_created': self.date_created.isoformat() if self.date_created else None,
-            'max_date': self.max_date.isoformat() if self.max_date else None,
-            'min_date': self.min_date.isoformat() if self.min_date else None,
-            'is_active': self.is_active,
-            'participants_count': len(self.participants),
-            'addresses_count': len(self.addresses),
-            'participants': [
-                {
-                    'participant_id': p.participant_id,
-                    'name': p.name,
-                    'phone': p.phone,
-                    'postal_code': p.postal_code,
-                    'icon_path': p.icon_path,
-                    'color': p.color,
-                    'is_driver': p.is_driver,
-                    'role': p.role
-                } for p in self.participants
-            ],
-            'addresses': [
-                {
-                    'event_address_id': a.event_address_id,
-                    'address_name': a.address_name,
-                    'street_line_1': a.street_line_1,
-                    'street_line_2': a.street_line_2,
-                    'city': a.city,
-                    'state_or_province': a.state_or_province,
-                    'country_code': a.country_code,
-                    'postal_code': a.postal_code,
-                    'latitude': float(a.latitude) if a.latitude is not None else None,
-                    'longitude': float(a.longitude) if a.longitude is not None else None
-                } for a in self.addresses
-            ],
-            'dates': [
-                {
-                    'date_id': d.date_id,
-                    'participant_id': d.participant_id,
-                    'date': d.date.isoformat() if d.date else None,
-                    'availability_level': d.availability_level
-                } for d in self.dates
-            ]
+            **Event.schema.dump(self),
+            **Event.counts_schema.dump(self),
+            'participants': Participant.summary_schema.dump_many(self.participants),
+            'addresses': EventAddress.schema.dump_many(self.addresses),
+            'dates': Date.schema.dump_many(self.dates)
         }
 
     @classmethod
@@ -115,33 +101,59 @@ class Event(db.Model):
         except Exception as e:
             raise e
 
+    @classmethod
+    def apply_update(cls, event_uuid, changes, max_days=None):
+        """
+        Applies a partial update and bumps the version in one UPDATE, without loading the event
+        or committing. A min_date or max_date changed on its own is checked against the stored
+        bound in the WHERE clause, so the update also matches no row when the range would invert
+        or span more than max_days. Returns whether the event was updated.
+        """
+        try:
+            statement = update(Event).where(Event.event_uuid == event_uuid)
+            if 'min_date' in changes and 'max_date' not in changes:
+                statement = statement.where(Event.max_date >= changes['min_date'])
+                if max_days is not None:
+                    statement = statement.where(Event.max_date < changes['min_date'] + timedelta(days=max_days))
+            elif 'max_date' in changes and 'min_date' not in changes:
+                statement = statement.where(Event.min_date <= changes['max_date'])
+                if max_days is not None:
+                    statement = statement.where(Event.min_date > changes['max_date'] - timedelta(days=max_days))
+            result = db.session.execute(
+                statement.values(**changes, version=Event.version + 1).execution_options(synchronize_session=False)
+            )
+            return result.rowcount > 0
+        except Exception as e:
+            raise e
+
     @classmethod
     def update_name(cls, event_uuid, event_name):
         try:
-            event = Event.query.get(event_uuid)
-            event.event_name = event_name
+            updated = cls.apply_update(event_uuid, {'event_name': event_name})
             db.session.commit()
-            return event
+            event_detail_cache.invalidate(event_uuid)
+            return updated
         except Exception as e:
             raise e
 
     @classmethod
     def update_description(cls, event_uuid, description):
         try:
-            event = Event.query.get(event_uuid)
-            event.description = description
+            updated = cls.apply_update(event_uuid, {'description': description})
             db.session.commit()
-            return event
+            event_detail_cache.invalidate(event_uuid)
+            return updated
         except Exception as e:
             raise e
 
     @classmethod
     def deactivate(cls, event_uuid):
         try:
-            event = Event.query.get(event_uuid)
-            event.is_active = False
+            updated = cls.apply_update(event_uuid, {'is_active': False})
             db.session.commit()
-            return event
+            token_cache.invalidate_event(event_uuid)
+            event_detail_cache.invalidate(event_uuid)
+            return updated
         except Exception as e:
             raise e
 
@@ -152,12 +164,67 @@ class Event(db.Model):
         except Exception as e:
             raise e
 
+    @classmethod
+    def get_version(cls, uuid):
+        """
+        Returns the event's version without loading the event, or None if it does not exist.
+        """
+        try:
+            return db.session.execute(cls.version_statement(uuid)).scalar()
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def version_statement(cls, uuid):
+        return select(Event.version).where(Event.event_uuid == uuid)
+
+    @classmethod
+    def bump_version(cls, uuid):
+        """
+        Bumps the version of an event after writes that bypass the ORM unit of work.
+        ORM changes to participants, dates and addresses are versioned automatically on flush.
+        """
+        try:
+            db.session.execute(
+                update(Event).where(Event.event_uuid == uuid).values(version=Event.version + 1).execution_options(synchronize_session=False)
+            )
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def get_event_detail_by_uuid(cls, uuid):
+        """
+        Loads an event with everything to_detail_dict needs in three queries, however large
+        the event is: the event with its counts and addresses, then participants, then dates.
+        """
+        try:
+            return db.session.execute(cls.detail_statement(uuid)).unique().scalar_one_or_none()
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def detail_statement(cls, uuid):
+        """
+        SELECT behind get_event_detail_by_uuid, also executed on the async engine by backend.asgi.
+        """
+        return select(Event).options(*cls.detail_options()).where(Event.event_uuid == uuid)
+
+    @classmethod
+    def detail_options(cls):
+        return (
+            undefer(Event.participants_count),
+            undefer(Event.addresses_count),
+            joinedload(Event.addresses),
+            selectinload(Event.participants),
+            selectinload(Event.dates)
+        )
+
 class Account(db.Model):
     __tablename__ = 'account'
     __table_args__ = (UniqueConstraint('email', name='uix_email'),)
 
-    account_id = Column(String(45), primary_key=True, default=generate_uuid)
-    email = Column(String(255), nullable=False, unique=True)
+    account_id = Column(uuid_column_type(), primary_key=True, default=generate_uuid)
+    email = Column(String(255), nullable=False)
     password_hash = Column(String(255), nullable=False)
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
@@ -169,28 +236,34 @@ class Account(db.Model):
     created_at = Column(DateTime, default=db.func.current_timestamp())
     updated_at = Column(DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
 
+    schema = Schema(
+        'account_id',
+        'email',
+        'first_name',
+        'last_name',
+        'phone',
+        'postal_code',
+        'icon_path',
+        'color',
+        'is_active',
+        ('created_at', iso),
+        ('updated_at', iso)
+    )
+
     def to_dict(self):
-        return {
-            'account_id': self.account_id,
-            'email': self.email,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'phone': self.phone,
-            'postal_code': self.postal_code,
-            'icon_path': self.icon_path,
-            'color': self.color,
-            'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        return Account.schema.dump(self)
 
 class Participant(db.Model):
     __tablename__ = 'participant'
-    __table_args__ = (UniqueConstraint('event_uuid', 'phone', name='uix_event_account_phone'),)
+    __table_args__ = (
+        UniqueConstraint('event_uuid', 'phone', name='uix_event_account_phone'),
+        # Serves lookups by event and keyset pagination in participant_id order
+        Index('ix_participant_event', 'event_uuid', 'participant_id')
+    )
 
     participant_id = Column(INTEGER(unsigned=True), primary_key=True)
-    event_uuid = Column(String(45), ForeignKey('event.event_uuid'), nullable=False)
-    account_id = Column(String(45), ForeignKey('account.account_id'), nullable=True)
+    event_uuid = Column(uuid_column_type(), ForeignKey('event.event_uuid'), nullable=False)
+    account_id = Column(uuid_column_type(), ForeignKey('account.account_id'), nullable=True)
     name = Column(String(100), nullable=False)
     phone = Column(String(64))
     postal_code = Column(String(20))
@@ -201,36 +274,17 @@ class Participant(db.Model):
 
     dates = relationship('Date', backref='participant', cascade="all, delete")
 
+    schema = Schema('participant_id', 'account_id', 'name', 'phone', 'postal_code', 'icon_path', 'color', 'is_driver', 'role')
+    # Embedded in event and participant details, which never expose account_id
+    summary_schema = Schema('participant_id', 'name', 'phone', 'postal_code', 'icon_path', 'color', 'is_driver', 'role')
+
     def to_dict(self):
-        return {
-            'participant_id': self.participant_id,
-            'account_id': self.account_id,
-            'name': self.name,
-            'phone': self.phone,
-            'postal_code': self.postal_code,
-            'icon_path': self.icon_path,
-            'color': self.color,
-            'is_driver': self.is_driver,
-            'role': self.role
-        }
+        return Participant.schema.dump(self)
 
     def to_detail_dict(self):
         return {
-            'participant_id': self.participant_id,
-            'name': self.name,
-            'phone': self.phone,
-            'postal_code': self.postal_code,
-            'icon_path': self.icon_path,
-            'color': self.color,
-            'is_driver': self.is_driver,
-            'role': self.role,
-            'selected_dates': [
-                {
-                    'date_id': date.date_id,
-                    'date': date.date.isoformat() if date.date else None,
-                    'availability_level': date.availability_level
-                } for date in self.dates
-            ]
+            **Participant.summary_schema.dump(self),
+            'selected_dates': Date.selected_schema.dump_many(self.dates)
         }
 
     @classmethod
@@ -251,22 +305,46 @@ class Participant(db.Model):
             raise e
 
     @classmethod
-    def update_location(cls, participant_id, postal_code):
+    def apply_update(cls, event_uuid, changes, participant_id=None, phone=None):
+        """
+        Applies a partial update to the event's participant with the given id or phone in one
+        UPDATE, without loading it or committing, and bumps the event's version.
+        Exactly one of participant_id and phone must be given.
+        Returns whether the participant was updated.
+        """
+        if (participant_id is None) == (phone is None):
+            raise ValueError('Exactly one of participant_id and phone is required')
         try:
-            participant = Participant.query.get(participant_id)
-            participant.postal_code = postal_code
+            statement = update(Participant).where(Participant.event_uuid == event_uuid)
+            if participant_id is not None:
+                statement = statement.where(Participant.participant_id == participant_id)
+            if phone is not None:
+                statement = statement.where(Participant.phone == phone)
+            result = db.session.execute(statement.values(**changes).execution_options(synchronize_session=False))
+            if result.rowcount == 0:
+                return False
+            Event.bump_version(event_uuid)
+            return True
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def update_location(cls, participant_id, postal_code, event_uuid):
+        try:
+            updated = cls.apply_update(event_uuid, {'postal_code': postal_code}, participant_id=participant_id)
             db.session.commit()
-            return participant
+            event_detail_cache.invalidate(event_uuid)
+            return updated
         except Exception as e:
             raise e
 
     @classmethod
-    def update_is_driver(cls, participant_id, is_driver):
+    def update_is_driver(cls, participant_id, is_driver, event_uuid):
         try:
-            participant = Participant.query.get(participant_id)
-            participant.is_driver = is_driver
+            updated = cls.apply_update(event_uuid, {'is_driver': is_driver}, participant_id=participant_id)
             db.session.commit()
-            return participant
+            event_detail_cache.invalidate(event_uuid)
+            return updated
         except Exception as e:
             raise e
 
@@ -277,6 +355,59 @@ class Participant(db.Model):
         except Exception as e:
             raise e
 
+    @classmethod
+    def get_participants_page(cls, event_uuid, fields=None, after=None, limit=100):
+        """
+        Returns up to limit participants with participant_id greater than after, in participant_id
+        order, serialized from rows holding only the selected fields, plus whether more follow.
+        """
+        try:
+            schema, statement = cls.page_statement(event_uuid, fields=fields, after=after, limit=limit)
+            rows = db.session.execute(statement).all()
+            return schema.dump_rows(rows[:limit]), len(rows) > limit
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def page_statement(cls, event_uuid, fields=None, after=None, limit=100):
+        """
+        Returns the schema for the selected fields and a SELECT of up to limit + 1 matching rows.
+        """
+        schema = Participant.schema.only(fields) if fields else Participant.schema
+        statement = select(*schema.columns(Participant)).where(Participant.event_uuid == event_uuid)
+        if after is not None:
+            statement = statement.where(Participant.participant_id > after)
+        return schema, statement.order_by(Participant.participant_id).limit(limit + 1)
+
+    @classmethod
+    def get_roster_by_event_uuid(cls, event_uuid):
+        """
+        Returns (participant_id, role, is_driver) rows for an event without loading ORM objects.
+        """
+        try:
+            return db.session.query(Participant.participant_id, Participant.role, Participant.is_driver).filter(
+                Participant.event_uuid == event_uuid
+            ).all()
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def lock_in_event(cls, participant_id, event_uuid):
+        """
+        Returns whether the participant belongs to the event. On MySQL the row is locked until
+        the transaction ends, so writes to the participant's dates run one at a time and each
+        reads the dates the previous one committed.
+        """
+        try:
+            return db.session.execute(
+                select(Participant.participant_id).where(
+                    Participant.participant_id == participant_id,
+                    Participant.event_uuid == event_uuid
+                ).with_for_update()
+            ).first() is not None
+        except Exception as e:
+            raise e
+
     @classmethod
     def get_participant_by_phone_and_event_uuid(cls, phone, event_uuid):
         try:
@@ -299,23 +430,28 @@ class Participant(db.Model):
 class Date(db.Model):
     __tablename__ = 'date'
     __table_args__ = (
+        # Also serves every lookup by event, and by event and participant
         UniqueConstraint('event_uuid', 'participant_id', 'date', name='uix_participant_date'),
+        # Covers the per-day availability counts without touching the rows
+        Index('ix_date_event_day', 'event_uuid', 'date', 'availability_level'),
+        # Serves the participant foreign key and a participant's dates in date_id order
+        Index('ix_date_participant', 'participant_id', 'date_id'),
+        Index('ix_date_day', 'date'),
         CheckConstraint('availability_level IN (0, 1, 2)', name='check_availability_level')
     )
 
     date_id = Column(INTEGER(unsigned=True), primary_key=True)
-    event_uuid = Column(String(45), ForeignKey('event.event_uuid'), nullable=False, index=True)
-    participant_id = Column(INTEGER(unsigned=True), ForeignKey('participant.participant_id'), nullable=False, index=True)
+    event_uuid = Column(uuid_column_type(), ForeignKey('event.event_uuid'), nullable=False)
+    participant_id = Column(INTEGER(unsigned=True), ForeignKey('participant.participant_id'), nullable=False)
     date = Column(Date, nullable=False)
     availability_level = Column(Integer, nullable=False, default=0)  # 0: Available, 1: Tentative, 2: Unavailable
 
+    schema = Schema('date_id', 'participant_id', ('date', iso), 'availability_level')
+    # A participant's own dates, listed without the redundant participant_id
+    selected_schema = Schema('date_id', ('date', iso), 'availability_level')
+
     def to_dict(self):
-        return {
-            'date_id': self.date_id,
-            'participant_id': self.participant_id,
-            'date': self.date.isoformat() if self.date else None,
-            'availability_level': self.availability_level
-        }
+        return Date.schema.dump(self)
 
     @classmethod
     def get_date_by_date_by_id_participant_and_event(cls, date_id, participant_id, event_uuid):
@@ -331,6 +467,80 @@ class Date(db.Model):
         except Exception as e:
             raise e
 
+    @classmethod
+    def get_dates_page(cls, participant_id, event_uuid, fields=None, after=None, limit=100):
+        """
+        Returns up to limit of a participant's dates with date_id greater than after, in date_id
+        order, serialized from rows holding only the selected fields, plus whether more follow.
+        """
+        try:
+            schema = Date.schema.only(fields) if fields else Date.schema
+            query = db.session.query(*schema.columns(Date)).filter(
+                Date.participant_id == participant_id,
+                Date.event_uuid == event_uuid
+            )
+            if after is not None:
+                query = query.filter(Date.date_id > after)
+            rows = query.order_by(Date.date_id).limit(limit + 1).all()
+            return schema.dump_rows(rows[:limit]), len(rows) > limit
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def get_availability_rows_by_event(cls, event_uuid):
+        """
+        Returns (participant_id, date, availability_level) rows for an event without loading ORM objects.
+        """
+        try:
+            return db.session.query(Date.participant_id, Date.date, Date.availability_level).filter(
+                Date.event_uuid == event_uuid
+            ).all()
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def get_availability_counts_by_event(cls, event_uuid):
+        """
+        Returns (date, availability_level, count) rows for an event, aggregated in a single GROUP BY query.
+        """
+        try:
+            return db.session.execute(cls.availability_counts_statement(event_uuid)).all()
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def availability_counts_statement(cls, event_uuid):
+        return select(Date.date, Date.availability_level, func.count(Date.date_id)).where(
+            Date.event_uuid == event_uuid
+        ).group_by(Date.date, Date.availability_level)
+
+    @classmethod
+    def get_availability_summary(cls, event_uuid, min_date, max_date):
+        """
+        Returns one entry per day between min_date and max_date with participant counts per availability level.
+        """
+        try:
+            return cls.summarize_availability(min_date, max_date, cls.get_availability_counts_by_event(event_uuid))
+        except Exception as e:
+            raise e
+
+    @staticmethod
+    def summarize_availability(min_date, max_date, counts):
+        """
+        Spreads (date, availability_level, count) rows over every day between min_date and max_date.
+        """
+        days = {}
+        day = min_date
+        while day <= max_date:
+            days[day] = {level: 0 for level in AVAILABILITY_LEVELS.values()}
+            day += timedelta(days=1)
+
+        for d, availability_level, count in counts:
+            if d in days and availability_level in AVAILABILITY_LEVELS:
+                days[d][AVAILABILITY_LEVELS[availability_level]] = count
+
+        return [{'date': d.isoformat(), **counts} for d, counts in days.items()]
+
     @classmethod
     def create(cls, event_uuid, participant_id, date, availability_level=0):
         try:
@@ -345,11 +555,91 @@ class Date(db.Model):
         except Exception as e:
             raise e
 
+    @classmethod
+    def sync_participant_dates(cls, event_uuid, participant_id, availability):
+        """
+        Makes a participant's dates match availability (date -> availability_level) by applying
+        only the inserts, updates and deletes needed. The caller commits.
+        Returns the resulting Date rows and a count of each kind of change.
+        """
+        try:
+            existing = {d.date: d for d in cls.get_dates_by_participant_and_event(participant_id=participant_id, event_uuid=event_uuid)}
+            changes = {'created': 0, 'updated': 0, 'deleted': 0}
+            dates = []
+
+            for d, row in existing.items():
+                if d not in availability:
+                    db.session.delete(row)
+                    changes['deleted'] += 1
+                    continue
+                if row.availability_level != availability[d]:
+                    row.availability_level = availability[d]
+                    changes['updated'] += 1
+                dates.append(row)
+
+            for d, availability_level in availability.items():
+                if d not in existing:
+                    dates.append(cls.create(
+                        event_uuid=event_uuid,
+                        participant_id=participant_id,
+                        date=d,
+                        availability_level=availability_level
+                    ))
+                    changes['created'] += 1
+
+            return dates, changes
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def bulk_upsert(cls, event_uuid, participant_id, availability):
+        """
+        Inserts or updates a participant's availability with a single multi-row statement.
+        availability maps date -> availability_level. Existing rows are matched through the
+        uix_participant_date constraint, so repeating a request is idempotent. The caller commits.
+        Returns the resulting Date rows.
+        """
+        try:
+            if not availability:
+                return []
+            rows = [
+                {
+                    'event_uuid': event_uuid,
+                    'participant_id': participant_id,
+                    'date': d,
+                    'availability_level': availability_level
+                } for d, availability_level in availability.items()
+            ]
+
+            dialect = db.session.get_bind().dialect.name
+            if dialect == 'mysql':
+                stmt = mysql_insert(Date).values(rows)
+                stmt = stmt.on_duplicate_key_update(availability_level=stmt.inserted.availability_level)
+            elif dialect == 'sqlite':
+                stmt = sqlite_insert(Date).values(rows)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['event_uuid', 'participant_id', 'date'],
+                    set_={'availability_level': stmt.excluded.availability_level}
+                )
+            else:
+                raise NotImplementedError(f'Bulk upsert is not supported for {dialect}')
+            db.session.execute(stmt)
+            Event.bump_version(event_uuid)
+
+            return Date.query.filter(
+                Date.event_uuid == event_uuid,
+                Date.participant_id == participant_id,
+                Date.date.in_(list(availability))
+            ).execution_options(populate_existing=True).all()
+        except Exception as e:
+            raise e
+
 class EventAddress(db.Model):
     __tablename__ = 'event_address'
+    __table_args__ = (Index('ix_event_address_event', 'event_uuid'),)
 
     event_address_id = Column(INTEGER(unsigned=True), primary_key=True, autoincrement=True)
-    event_uuid = Column(String(45), ForeignKey('event.event_uuid'), nullable=False)
+    event_uuid = Column(uuid_column_type(), ForeignKey('event.event_uuid'), nullable=False)
     address_name = Column(String(255), nullable=False)
     street_line_1 = Column(String(255), nullable=False)
     street_line_2 = Column(String(255))
@@ -360,19 +650,21 @@ class EventAddress(db.Model):
     latitude = Column(Numeric(9, 6))
     longitude = Column(Numeric(9, 6))
 
+    schema = Schema(
+        'event_address_id',
+        'address_name',
+        'street_line_1',
+        'street_line_2',
+        'city',
+        'state_or_province',
+        'country_code',
+        'postal_code',
+        ('latitude', as_float),
+        ('longitude', as_float)
+    )
+
     def to_dict(self):
-        return {
-            'event_address_id': self.event_address_id,
-            'address_name': self.address_name,
-            'street_line_1': self.street_line_1,
-            'street_line_2': self.street_line_2,
-            'city': self.city,
-            'state_or_province': self.state_or_province,
-            'country_code': self.country_code,
-            'postal_code': self.postal_code,
-            'latitude': float(self.latitude) if self.latitude is not None else None,
-            'longitude': float(self.longitude) if self.longitude is not None else None
-        }
+        return EventAddress.schema.dump(self)
 
     @classmethod
     def create(cls, event_uuid, address_name, street_line_1, street_line_2, city, state_or_province, country_code, postal_code, latitude=None, longitude=None):
@@ -394,19 +686,60 @@ class EventAddress(db.Model):
         except Exception as e:
             raise e
 
+    @classmethod
+    def get_geocoding_query(cls, event_address_id):
+        """
+        Returns (event_uuid, free-form address) for an address still missing coordinates, else None.
+        """
+        try:
+            address = db.session.get(EventAddress, event_address_id)
+            if address is None or address.latitude is not None:
+                return None
+            parts = (address.street_line_1, address.street_line_2, address.city, address.state_or_province, address.postal_code, address.country_code)
+            return address.event_uuid, ', '.join(part for part in parts if part)
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def set_coordinates(cls, event_uuid, event_address_id, latitude, longitude):
+        try:
+            db.session.execute(
+                update(EventAddress).where(EventAddress.event_address_id == event_address_id)
+                .values(latitude=latitude, longitude=longitude).execution_options(synchronize_session=False)
+            )
+            Event.bump_version(event_uuid)
+            db.session.commit()
+            event_detail_cache.invalidate(event_uuid)
+        except Exception as e:
+            raise e
+
+# Counted in SQL so the totals never require loading the collections
+Event.participants_count = column_property(
+    select(func.count(Participant.participant_id)).where(
+        Participant.event_uuid == Event.event_uuid
+    ).correlate_except(Participant).scalar_subquery(),
+    deferred=True
+)
+Event.addresses_count = column_property(
+    select(func.count(EventAddress.event_address_id)).where(
+        EventAddress.event_uuid == Event.event_uuid
+    ).correlate_except(EventAddress).scalar_subquery(),
+    deferred=True
+)
+
 class AccessToken(db.Model):
     __tablename__ = 'access_token'
+    __table_args__ = (Index('ix_access_token_event', 'event_uuid'),)
 
     token = Column(String(64), primary_key=True)
-    event_uuid = Column(String(45), ForeignKey('event.event_uuid'), nullable=False, index=True)
-    account_id = Column(String(45), nullable=False, index=True)
+    event_uuid = Column(uuid_column_type(), ForeignKey('event.event_uuid'), nullable=False)
+    account_id = Column(String(45), nullable=False)
     created_at = Column(DateTime, default=db.func.current_timestamp())
 
+    schema = Schema('token', ('created_at', iso))
+
     def to_dict(self):
-        return {
-            'token': self.token,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        return AccessToken.schema.dump(self)
 
     @classmethod
     def create(cls, event_uuid, account_id=None):
@@ -420,9 +753,266 @@ class AccessToken(db.Model):
             return token
         except Exception as e:
             raise e
+
+    @classmethod
+    def revoke(cls, token):
+        try:
+            AccessToken.query.filter_by(token=token).delete()
+            db.session.commit()
+            token_cache.invalidate_token(token)
+        except Exception as e:
+            raise e
+
     @classmethod
     def get_by_token(cls, token):
         try:
             return AccessToken.query.filter_by(token=token).first()
         except Exception as e:
             raise e
+
+class EventArchive(db.Model):
+    """
+    Cold storage for expired events: one row per event holding its detail payload and every
+    row it had in the hot tables, as zlib-compressed JSON.
+    """
+    __tablename__ = 'event_archive'
+
+    event_uuid = Column(uuid_column_type(), primary_key=True)
+    max_date = Column(DateType, nullable=False)
+    archived_at = Column(DateTime, nullable=False, server_default=db.func.current_timestamp())
+    payload = Column(LargeBinary().with_variant(MEDIUMBLOB, 'mysql'), nullable=False)
+
+    # Hot tables of an event, children first so they can be deleted in this order
+    HOT_TABLES = ('date', 'participant', 'event_address', 'access_token', 'event')
+
+    @staticmethod
+    def encode(detail, rows):
+        return zlib.compress(Utility.dump_json({'detail': detail, 'rows': rows}))
+
+    @staticmethod
+    def decode(payload):
+        return json.loads(zlib.decompress(payload))
+
+    @classmethod
+    def get_detail(cls, event_uuid):
+        """
+        Returns the archived event as GET /events/<token> served it, or None if it is not archived.
+        """
+        try:
+            payload = db.session.execute(cls.payload_statement(event_uuid)).scalar()
+            return cls.decode(payload)['detail'] if payload is not None else None
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def payload_statement(cls, event_uuid):
+        return select(EventArchive.payload).where(EventArchive.event_uuid == event_uuid)
+
+    @classmethod
+    def expired_statement(cls, cutoff, inactive_cutoff, limit):
+        """
+        Selects events whose max_date is before cutoff, or before inactive_cutoff for deactivated
+        events, oldest first. inactive_cutoff must not be earlier than cutoff.
+        """
+        return select(Event.event_uuid).where(
+            Event.max_date < inactive_cutoff,
+            or_(Event.max_date < cutoff, Event.is_active == False)
+        ).order_by(Event.max_date).limit(limit)
+
+    @classmethod
+    def archive_batch(cls, cutoff, inactive_cutoff, limit):
+        """
+        Moves up to limit expired events and their rows out of the hot tables in one short
+        transaction, and returns their uuids. On MySQL the event rows are locked with SKIP LOCKED,
+        so concurrent archivers take disjoint batches and requests are never waited on.
+        """
+        try:
+            event_uuids = db.session.execute(
+                cls.expired_statement(cutoff, inactive_cutoff, limit).with_for_update(skip_locked=True)
+            ).scalars().all()
+            if not event_uuids:
+                db.session.rollback()
+                return []
+
+            events = {
+                event.event_uuid: event for event in db.session.execute(
+                    select(Event).options(*Event.detail_options()).where(Event.event_uuid.in_(event_uuids))
+                ).unique().scalars()
+            }
+            rows = {}
+            for name in cls.HOT_TABLES:
+                table = db.metadata.tables[name]
+                for row in db.session.execute(select(table).where(table.c.event_uuid.in_(event_uuids))):
+                    rows.setdefault(row.event_uuid, {}).setdefault(name, []).append(dict(row._mapping))
+
+            db.session.execute(insert(EventArchive), [
+                {'event_uuid': u, 'max_date': events[u].max_date, 'payload': cls.encode(events[u].to_detail_dict(), rows.get(u, {}))}
+                for u in event_uuids
+            ])
+            tokens = [
+                {'token': token['token'], 'event_uuid': u} for u in event_uuids for token in rows.get(u, {}).get('access_token', [])
+            ]
+            if tokens:
+                db.session.execute(insert(ArchivedToken), tokens)
+            for name in cls.HOT_TABLES:
+                table = db.metadata.tables[name]
+                db.session.execute(delete(table).where(table.c.event_uuid.in_(event_uuids)))
+            db.session.commit()
+
+            for u in event_uuids:
+                token_cache.invalidate_event(u)
+                event_detail_cache.invalidate(u)
+            return event_uuids
+        except Exception as e:
+            raise e
+
+class ArchivedToken(db.Model):
+    """
+    Access tokens of archived events, kept so their links still resolve.
+    """
+    __tablename__ = 'archived_token'
+    __table_args__ = (Index('ix_archived_token_event', 'event_uuid'),)
+
+    token = Column(String(64), primary_key=True)
+    event_uuid = Column(uuid_column_type(), ForeignKey('event_archive.event_uuid'), nullable=False)
+
+    @classmethod
+    def get_event_uuid(cls, token):
+        try:
+            return db.session.execute(cls.event_uuid_statement(token)).scalar()
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def event_uuid_statement(cls, token):
+        return select(ArchivedToken.event_uuid).where(ArchivedToken.token == token)
+
+class Job(db.Model):
+    """
+    A unit of deferred work run by services.job_queue. run_at is when the job is next due; while
+    a job is running it is the end of the worker's lease, after which another worker retries it.
+    """
+    __tablename__ = 'job'
+    __table_args__ = (Index('ix_job_due', 'status', 'run_at'),)
+
+    job_id = Column(INTEGER(unsigned=True), primary_key=True, autoincrement=True)
+    kind = Column(String(64), nullable=False)
+    payload = Column(Text, nullable=False)
+    status = Column(Enum('queued', 'running', 'done', 'failed'), nullable=False, default='queued')
+    attempts = Column(INTEGER(unsigned=True), nullable=False, default=0)
+    max_attempts = Column(INTEGER(unsigned=True), nullable=False)
+    run_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime)
+    last_error = Column(String(255))
+
+    @classmethod
+    def create(cls, kind, payload, run_at, created_at, max_attempts):
+        try:
+            job = Job(
+                kind=kind,
+                payload=json.dumps(payload),
+                status='queued',
+                attempts=0,
+                max_attempts=max_attempts,
+                run_at=run_at,
+                created_at=created_at
+            )
+            db.session.add(job)
+            return job
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def claim(cls, now, lease_until):
+        """
+        Marks the next due job as running until lease_until and commits. On MySQL, jobs claimed by
+        other workers are skipped rather than waited on. A running job whose lease expired is
+        retried only while it has attempts left; otherwise it is marked failed, so a job that keeps
+        crashing or hanging its worker is not retried forever. Returns (job_id, kind, payload,
+        attempts, max_attempts, created_at), or None when nothing is due.
+        """
+        try:
+            db.session.execute(
+                update(Job).where(Job.status == 'running', Job.run_at <= now, Job.attempts >= Job.max_attempts)
+                .values(status='failed', finished_at=now, last_error='Lease expired on the last attempt')
+                .execution_options(synchronize_session=False)
+            )
+            job = db.session.execute(
+                select(Job).where(
+                    Job.status.in_(('queued', 'running')),
+                    Job.run_at <= now,
+                    or_(Job.status == 'queued', Job.attempts < Job.max_attempts)
+                ).order_by(Job.run_at).limit(1).with_for_update(skip_locked=True)
+            ).scalar_one_or_none()
+            if job is None:
+                db.session.commit()
+                return None
+            job.status = 'running'
+            job.attempts += 1
+            job.run_at = lease_until
+            claimed = (job.job_id, job.kind, json.loads(job.payload), job.attempts, job.max_attempts, job.created_at)
+            db.session.commit()
+            return claimed
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def finish(cls, job_id, attempts, now, error=None, retry_at=None):
+        """
+        Records the outcome of a run: done without an error, queued again for retry_at, or failed.
+        attempts is the attempt the worker claimed; once its lease expired and another worker
+        reclaimed the job, the outcome is discarded. Returns whether it was recorded.
+        """
+        try:
+            if error is None:
+                values = {'status': 'done', 'finished_at': now, 'last_error': None}
+            elif retry_at is not None:
+                values = {'status': 'queued', 'run_at': retry_at, 'last_error': error[:255]}
+            else:
+                values = {'status': 'failed', 'finished_at': now, 'last_error': error[:255]}
+            result = db.session.execute(
+                update(Job).where(Job.job_id == job_id, Job.status == 'running', Job.attempts == attempts)
+                .values(**values).execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            return result.rowcount > 0
+        except Exception as e:
+            raise e
+
+    @classmethod
+    def count_by_status(cls):
+        try:
+            return dict(db.session.execute(
+                select(Job.status, func.count(Job.job_id)).where(Job.status.in_(('queued', 'running'))).group_by(Job.status)
+            ).all())
+        except Exception as e:
+            raise e
+
+@listens_for(db.session, 'after_commit')
+def wake_job_workers(session):
+    """
+    Wakes the job workers once a transaction that enqueued jobs has committed.
+    """
+    if session.info.pop('jobs_enqueued', False):
+        job_queue.notify()
+
+@listens_for(db.session, 'before_flush')
+def bump_event_versions(session, flush_context, instances):
+    """
+    Bumps Event.version for every event whose participants, dates or addresses are written in this flush.
+    """
+    event_uuids = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, (Participant, Date, EventAddress)) and obj.event_uuid is not None:
+            event_uuids.add(obj.event_uuid)
+
+    for obj in session.dirty:
+        if isinstance(obj, Event) and session.is_modified(obj):
+            obj.version = Event.version + 1
+            event_uuids.discard(obj.event_uuid)
+
+    if event_uuids:
+        session.execute(
+            update(Event).where(Event.event_uuid.in_(event_uuids)).values(version=Event.version + 1).execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,5 @@
+from .asgi import create_asgi_app
+import os
+
+config_name = os.getenv('FLASK_ENV', 'development')
+app = create_asgi_app(config_name)
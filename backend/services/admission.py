@@ -0,0 +1,201 @@
+import threading
+import time
+from collections import OrderedDict
+
+from flask import g, request
+
+from ..utilities import Utility
+from .metrics import resource_name
+
+standardize_response = Utility.standardize_response
+
+# Atomic token bucket: refills at ARGV[2] tokens per second up to ARGV[1], using the server clock
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class LocalBucketStore:
+    """
+    Token buckets held in process. The least recently used buckets are dropped beyond max_keys,
+    so a flood of distinct clients or made-up tokens cannot grow it without bound; a dropped
+    bucket simply starts full again.
+    """
+
+    def __init__(self, max_keys=10000, clock=time.monotonic):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._buckets = OrderedDict()
+        self.max_keys = max_keys
+
+    def take(self, key, capacity, rate):
+        """
+        Takes one token from key's bucket. Returns (allowed, seconds until a token is available).
+        """
+        with self._lock:
+            now = self._clock()
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+
+class RedisBucketStore:
+    """
+    Token buckets shared by every worker process, updated atomically by a Lua script.
+    The redis package is only required when this store is configured.
+    """
+
+    def __init__(self, url, prefix='rate-limit:'):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(TOKEN_BUCKET_SCRIPT)
+        self._prefix = prefix
+
+    def take(self, key, capacity, rate):
+        allowed, tokens = self._script(keys=[self._prefix + key], args=[capacity, rate])
+        return bool(allowed), 0.0 if allowed else (1 - float(tokens)) / rate
+
+
+def make_store(url=None):
+    if not url:
+        return LocalBucketStore()
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisBucketStore(url)
+    raise ValueError(f'Unsupported rate limit store: {url}')
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limits named <action>:<key type>, e.g. event_create:ip, each allowing
+    bursts of up to `requests` and refilling at requests / seconds per second.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.store = LocalBucketStore()
+        self.limits = {}
+        self.enabled = False
+        self._rejected = {}
+
+    def configure(self, limits, store, enabled=True):
+        """
+        Applies new limits and store and resets the rejection counters.
+        """
+        with self._lock:
+            self.limits = dict(limits)
+            self.store = store
+            self.enabled = enabled
+            self._rejected = {name: 0 for name in self.limits}
+
+    def check(self, action, key_type, key):
+        """
+        Takes a token for key. Returns None when the request may proceed, otherwise the number
+        of seconds the client should wait.
+        """
+        name = f'{action}:{key_type}'
+        limit = self.limits.get(name)
+        if not self.enabled or limit is None or key is None:
+            return None
+        requests, seconds = limit
+        allowed, retry_after = self.store.take(f'{name}:{key}', requests, requests / seconds)
+        if allowed:
+            return None
+        with self._lock:
+            self._rejected[name] = self._rejected.get(name, 0) + 1
+        return retry_after
+
+    def stats(self):
+        with self._lock:
+            return {f'rejected_{name.replace(":", "_")}': count for name, count in self._rejected.items()}
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the requests handled at once, so that under overload requests are shed with 503 while
+    they are cheap, instead of queueing on the connection pool until pool_timeout.
+
+    A request waits up to timeout seconds for a slot. Long-lived requests that do not hold a
+    database connection, such as event streams, are exempt.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._slots = None
+        self.limit = 0
+        self.timeout = 0.0
+        self.exempt = frozenset()
+        self._reset()
+
+    def init_app(self, app):
+        self.limit = app.config['MAX_CONCURRENT_REQUESTS']
+        if self.limit is None:
+            # Derived from the pool, so a worker never admits more requests than it has connections
+            options = app.config['SQLALCHEMY_ENGINE_OPTIONS']
+            self.limit = options['pool_size'] + options.get('max_overflow', 0) if 'pool_size' in options else 0
+        self.timeout = app.config['ADMISSION_TIMEOUT']
+        self.exempt = frozenset(app.config['ADMISSION_EXEMPT'])
+        with self._lock:
+            self._slots = threading.BoundedSemaphore(self.limit) if self.limit > 0 else None
+            self._reset()
+        if self._slots is None:
+            return
+        app.before_request(self._admit)
+        app.teardown_request(self._release)
+
+    def stats(self):
+        with self._lock:
+            return {'limit': self.limit, 'in_flight': self.in_flight, 'admitted': self.admitted, 'shed': self.shed}
+
+    def _admit(self):
+        if request.endpoint is None or resource_name() in self.exempt:
+            return None
+        slots = self._slots
+        if not slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.shed += 1
+            body, code = standardize_response(status='error', message='Server is busy, please retry', code=503)
+            return Utility.output_json(body, code, {'Retry-After': '1'})
+        g.admission_slot = slots
+        with self._lock:
+            self.in_flight += 1
+            self.admitted += 1
+        return None
+
+    def _release(self, exc=None):
+        slots = g.pop('admission_slot', None)
+        if slots is None:
+            return
+        with self._lock:
+            self.in_flight -= 1
+        slots.release()
+
+    def _reset(self):
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+
+
+rate_limiter = RateLimiter()
+concurrency_limiter = ConcurrencyLimiter()
@@ -0,0 +1,31 @@
+import logging
+import time
+from datetime import date, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+def archive_expired_events(after_days, inactive_after_days, batch_size=100, pause=0.0, max_batches=None, today=None):
+    """
+    Moves events that ended more than after_days ago, or deactivated events that ended more than
+    inactive_after_days ago, into event_archive. Each batch is its own short transaction and
+    batches are spaced by pause seconds, so the hot tables are never locked for long.
+    Returns the number of events archived.
+    """
+    from ..models import EventArchive
+
+    today = today or date.today()
+    cutoff = today - timedelta(days=after_days)
+    inactive_cutoff = today - timedelta(days=min(after_days, inactive_after_days))
+    archived = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        event_uuids = EventArchive.archive_batch(cutoff, inactive_cutoff, batch_size)
+        batches += 1
+        archived += len(event_uuids)
+        if event_uuids:
+            logger.info('archived %d events', len(event_uuids))
+        if len(event_uuids) < batch_size:
+            break
+        time.sleep(pause)
+    return archived
@@ -0,0 +1,190 @@
+from datetime import timedelta
+import re
+
+# Matches Date.availability_level; NO_RESPONSE marks days a participant never filled in
+AVAILABLE = 0
+TENTATIVE = 1
+UNAVAILABLE = 2
+NO_RESPONSE = 255
+
+# Maps level bytes to 1 when the participant can attend that day, 0 otherwise
+_ATTENDING_TABLE = bytes(1 if level in (0, 1) else 0 for level in range(256))
+_ATTENDING_RUN = re.compile(b'\x01+')
+
+DEFAULT_WEIGHTS = {
+    'available': 1.0,
+    'tentative': 0.5,
+    'unavailable': 0.0,
+    'no_response': 0.0
+}
+
+
+class AvailabilityMatrix:
+    """
+    Participant x day matrix of availability levels for a single event.
+
+    Levels are stored day-major in one bytearray, one byte per participant, so a day is a
+    contiguous slice and per-day counts run as bytes.count() in C instead of Python loops.
+    Participants are ordered organizers-without-car, organizers-with-car, drivers, everyone
+    else, which keeps both organizers and drivers in contiguous slices of every day row.
+    """
+
+    def __init__(self, min_date, max_date, participants):
+        """
+        participants is an iterable of (participant_id, role, is_driver) tuples.
+        """
+        groups = ([], [], [], [])
+        for participant_id, role, is_driver in participants:
+            is_organizer = role == 'organizer'
+            if is_organizer and not is_driver:
+                groups[0].append(participant_id)
+            elif is_organizer:
+                groups[1].append(participant_id)
+            elif is_driver:
+                groups[2].append(participant_id)
+            else:
+                groups[3].append(participant_id)
+
+        self.participant_ids = groups[0] + groups[1] + groups[2] + groups[3]
+        self.index = {participant_id: i for i, participant_id in enumerate(self.participant_ids)}
+        self.organizers = slice(0, len(groups[0]) + len(groups[1]))
+        self.drivers = slice(len(groups[0]), len(groups[0]) + len(groups[1]) + len(groups[2]))
+
+        self.min_date = min_date
+        self.max_date = max_date
+        self.width = len(self.participant_ids)
+        self.day_count = max((max_date - min_date).days + 1, 0)
+        self.levels = bytearray([NO_RESPONSE]) * (self.width * self.day_count)
+
+    @classmethod
+    def from_rows(cls, min_date, max_date, participants, date_rows):
+        """
+        Builds the matrix from (participant_id, date, availability_level) rows in one pass.
+        Rows outside min_date..max_date or for unknown participants are ignored.
+        """
+        matrix = cls(min_date, max_date, participants)
+        index = matrix.index
+        levels = matrix.levels
+        width = matrix.width
+        day_count = matrix.day_count
+        first_ordinal = min_date.toordinal()
+        for participant_id, d, availability_level in date_rows:
+            column = index.get(participant_id)
+            day = d.toordinal() - first_ordinal
+            if column is None or day < 0 or day >= day_count:
+                continue
+            levels[day * width + column] = availability_level
+        return matrix
+
+    def date_at(self, day):
+        return self.min_date + timedelta(days=day)
+
+    def day_row(self, day):
+        start = day * self.width
+        return bytes(self.levels[start:start + self.width])
+
+    def participant_column(self, participant_id):
+        """
+        Returns one level byte per day for a participant.
+        """
+        return bytes(self.levels[self.index[participant_id]::self.width])
+
+
+def _attending(row):
+    return row.count(AVAILABLE) + row.count(TENTATIVE)
+
+
+def score_days(matrix, weights=None, require_organizers=True, min_drivers=0):
+    """
+    Scores every day of the matrix in a single pass.
+
+    A day's score is the sum of the weight of each participant's availability level. Days are
+    ineligible when an organizer cannot attend (with require_organizers) or when fewer than
+    min_drivers drivers are available or tentative.
+    """
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    organizer_count = matrix.organizers.stop - matrix.organizers.start
+
+    scores = []
+    for day in range(matrix.day_count):
+        row = matrix.day_row(day)
+        available = row.count(AVAILABLE)
+        tentative = row.count(TENTATIVE)
+        unavailable = row.count(UNAVAILABLE)
+        no_response = matrix.width - available - tentative - unavailable
+        drivers = _attending(row[matrix.drivers])
+        organizers = _attending(row[matrix.organizers])
+
+        eligible = drivers >= min_drivers
+        if require_organizers and organizers < organizer_count:
+            eligible = False
+
+        scores.append({
+            'date': matrix.date_at(day),
+            'score': (
+                available * weights['available']
+                + tentative * weights['tentative']
+                + unavailable * weights['unavailable']
+                + no_response * weights['no_response']
+            ),
+            'available': available,
+            'tentative': tentative,
+            'unavailable': unavailable,
+            'no_response': no_response,
+            'drivers': drivers,
+            'organizers': organizers,
+            'eligible': eligible
+        })
+    return scores
+
+
+def rank_days(matrix, top_k=5, weights=None, require_organizers=True, min_drivers=0):
+    """
+    Returns the top_k eligible days ordered by score, earliest day first on ties.
+    """
+    scores = score_days(matrix, weights=weights, require_organizers=require_organizers, min_drivers=min_drivers)
+    eligible = [s for s in scores if s['eligible']]
+    eligible.sort(key=lambda s: (-s['score'], s['date']))
+    return eligible[:top_k]
+
+
+def find_windows(matrix, window_length, min_attendance=0, top_k=5, weights=None):
+    """
+    Returns the best runs of window_length consecutive days.
+
+    attendance is the number of participants available or tentative on every day of the window,
+    score is the sum of the day scores. Both are computed for every window start in one scan:
+    each participant's runs of attending days are added to a difference array, and day scores
+    are summed with a prefix sum. Windows are ordered by attendance, then score, then start date.
+    """
+    window_count = matrix.day_count - window_length + 1
+    if window_length < 1 or window_count < 1:
+        return []
+
+    prefix = [0.0]
+    for day in score_days(matrix, weights=weights, require_organizers=False):
+        prefix.append(prefix[-1] + day['score'])
+
+    starts = [0] * (window_count + 1)
+    for participant_id in matrix.participant_ids:
+        attending = matrix.participant_column(participant_id).translate(_ATTENDING_TABLE)
+        for run in _ATTENDING_RUN.finditer(attending):
+            if run.end() - run.start() >= window_length:
+                starts[run.start()] += 1
+                starts[run.end() - window_length + 1] -= 1
+
+    windows = []
+    attendance = 0
+    for start in range(window_count):
+        attendance += starts[start]
+        if attendance < min_attendance:
+            continue
+        windows.append({
+            'start_date': matrix.date_at(start),
+            'end_date': matrix.date_at(start + window_length - 1),
+            'attendance': attendance,
+            'score': prefix[start + window_length] - prefix[start]
+        })
+
+    windows.sort(key=lambda w: (-w['attendance'], -w['score'], w['start_date']))
+    return windows[:top_k]
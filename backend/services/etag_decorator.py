@@ -0,0 +1,33 @@
+from flask import request, g, Response
+from functools import wraps
+from werkzeug.http import quote_etag
+
+def conditional_get():
+    """
+    Decorator adding an ETag derived from the event's version to successful responses and
+    answering If-None-Match with 304 Not Modified. Must be applied inside token_required.
+    """
+    from ..models import Event
+
+    def decorator(f):
+        @wraps(f)
+        def wrapped(*args, **kwargs):
+            # Read before the handler runs so a concurrent write can only make the ETag stale, never too new
+            version = Event.get_version(g.event_uuid)
+            if version is None:
+                return f(*args, **kwargs)
+
+            g.event_version = version
+            etag = str(version)
+            headers = {'ETag': quote_etag(etag, weak=True), 'Cache-Control': 'no-cache'}
+            if request.if_none_match.contains_weak(etag):
+                return Response(status=304, headers=headers)
+
+            response = f(*args, **kwargs)
+            if isinstance(response, Response) and response.status_code == 200:
+                response.headers.update(headers)
+            elif isinstance(response, tuple) and len(response) in (2, 3) and response[1] == 200:
+                return response[0], response[1], {**(response[2] if len(response) == 3 else {}), **headers}
+            return response
+        return wrapped
+    return decorator
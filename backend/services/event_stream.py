@@ -0,0 +1,274 @@
+import asyncio
+import json
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBroker:
+    """
+    In-process broker: published messages are delivered straight back to the hub.
+    Used in development and tests, and whenever a single worker process serves the API.
+    """
+
+    def __init__(self):
+        self._listener = None
+
+    def attach(self, listener):
+        self._listener = listener
+
+    def publish(self, event_uuid, payload):
+        if self._listener is not None:
+            self._listener(event_uuid, payload)
+
+    def close(self):
+        self._listener = None
+
+
+class RedisBroker:
+    """
+    Shares messages between worker processes through Redis pub/sub, one channel per event.
+    A single listener thread per process forwards every message to the local hub.
+    The redis package is only required when this broker is configured.
+    """
+
+    def __init__(self, url, prefix='event-stream:'):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._pubsub = None
+        self._thread = None
+
+    def attach(self, listener):
+        prefix_length = len(self._prefix)
+
+        def handle(message):
+            channel = message['channel'].decode()
+            listener(channel[prefix_length:], message['data'].decode())
+
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.psubscribe(**{self._prefix + '*': handle})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def publish(self, event_uuid, payload):
+        self._client.publish(self._prefix + event_uuid, payload)
+
+    def close(self):
+        if self._thread is not None:
+            self._thread.stop()
+        if self._pubsub is not None:
+            self._pubsub.close()
+
+
+def make_broker(url=None):
+    if not url:
+        return LocalBroker()
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisBroker(url)
+    raise ValueError(f'Unsupported event stream broker: {url}')
+
+
+class Subscription:
+    """
+    One client's view of an event's stream. Messages are buffered in a bounded queue; a client
+    that falls queue_size messages behind is told to resync instead of stalling the publisher.
+    """
+
+    def __init__(self, hub, event_uuid, queue_size):
+        self.hub = hub
+        self.event_uuid = event_uuid
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=queue_size)
+
+    def put(self, payload):
+        try:
+            self._queue.put_nowait(payload)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout=None):
+        """
+        Returns the next payload, or None if nothing arrived within timeout seconds.
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stream(self, heartbeat):
+        """
+        Yields Server-Sent Events frames until the client disconnects or overflows.
+        A comment line is sent every heartbeat seconds so proxies keep the connection open.
+        """
+        try:
+            yield ': connected\n\n'
+            while True:
+                payload = self.get(timeout=heartbeat)
+                if self.overflowed:
+                    yield format_frame('resync', {'event_uuid': self.event_uuid})
+                    return
+                yield payload if payload is not None else ': heartbeat\n\n'
+        finally:
+            self.close()
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+
+class AsyncSubscription(Subscription):
+    """
+    Subscription read from an asyncio event loop, used by the ASGI app. The hub delivers from
+    whichever thread published, so messages are handed to the loop with call_soon_threadsafe
+    and a waiting client holds no thread. Overflow is counted on the publishing side.
+    """
+
+    def __init__(self, hub, event_uuid, queue_size, loop):
+        self.hub = hub
+        self.event_uuid = event_uuid
+        self.overflowed = False
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._queue_size = queue_size
+
+    def put(self, payload):
+        with self._lock:
+            if self._pending >= self._queue_size:
+                self.overflowed = True
+                payload = None
+            else:
+                self._pending += 1
+        try:
+            # A None payload only wakes the reader so it notices the overflow
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, payload)
+        except RuntimeError:
+            # The loop has been closed; the reader is gone
+            self.overflowed = True
+
+    async def get(self, timeout=None):
+        try:
+            payload = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if payload is not None:
+            with self._lock:
+                self._pending -= 1
+        return payload
+
+    async def stream(self, heartbeat):
+        try:
+            yield ': connected\n\n'
+            while True:
+                payload = await self.get(timeout=heartbeat)
+                if self.overflowed:
+                    yield format_frame('resync', {'event_uuid': self.event_uuid})
+                    return
+                yield payload if payload is not None else ': heartbeat\n\n'
+        finally:
+            self.close()
+
+
+def format_frame(kind, data):
+    return f'event: {kind}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+class EventHub:
+    """
+    Per-event pub/sub hub fanning committed changes out to streaming clients.
+
+    Messages are serialized to an SSE frame once, handed to the broker, and delivered by the
+    broker to the hub of every process, which copies them into the queues of its local subscribers.
+    """
+
+    def __init__(self, broker=None, queue_size=100):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._broker = None
+        self.queue_size = queue_size
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.configure(broker or LocalBroker(), queue_size)
+
+    def configure(self, broker, queue_size):
+        """
+        Swaps the broker and disconnects every subscriber.
+        """
+        with self._lock:
+            if self._broker is not None:
+                self._broker.close()
+            self._broker = broker
+            self._broker.attach(self._dispatch)
+            self.queue_size = queue_size
+            self._subscribers.clear()
+            self.published = 0
+            self.delivered = 0
+            self.dropped = 0
+
+    def subscribe(self, event_uuid):
+        subscription = Subscription(self, event_uuid, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(event_uuid, set()).add(subscription)
+        return subscription
+
+    def subscribe_async(self, event_uuid):
+        """
+        Subscribes from a coroutine; the subscription delivers to the running event loop.
+        """
+        subscription = AsyncSubscription(self, event_uuid, self.queue_size, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(event_uuid, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.event_uuid)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[subscription.event_uuid]
+
+    def publish(self, event_uuid, kind, data):
+        """
+        Publishes a change to every subscriber of an event. Call only after the change is
+        committed. Broker failures are logged rather than raised so they never fail the write.
+        """
+        try:
+            self._broker.publish(event_uuid, format_frame(kind, data))
+        except Exception as e:
+            logger.exception(e)
+            return
+        with self._lock:
+            self.published += 1
+
+    def _dispatch(self, event_uuid, payload):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(event_uuid, ()))
+        delivered = dropped = 0
+        for subscription in subscriptions:
+            subscription.put(payload)
+            if subscription.overflowed:
+                dropped += 1
+            else:
+                delivered += 1
+        # Publishers and the broker's listener thread dispatch concurrently
+        with self._lock:
+            self.delivered += delivered
+            self.dropped += dropped
+
+    def stats(self):
+        with self._lock:
+            return {
+                'events': len(self._subscribers),
+                'subscribers': sum(len(s) for s in self._subscribers.values()),
+                'published': self.published,
+                'delivered': self.delivered,
+                'dropped': self.dropped
+            }
+
+
+event_hub = EventHub()
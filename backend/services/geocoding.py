@@ -0,0 +1,20 @@
+import json
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+
+def geocode(url, query, timeout=5):
+    """
+    Looks up a free-form address on a Nominatim-compatible search endpoint.
+    Returns (latitude, longitude), or None when nothing matched. Network errors propagate,
+    so a job calling this is retried.
+    """
+    request = Request(
+        f'{url}?{urlencode({"q": query, "format": "json", "limit": 1})}',
+        headers={'User-Agent': 'PickADate', 'Accept': 'application/json'}
+    )
+    with urlopen(request, timeout=timeout) as response:
+        results = json.load(response)
+    if not results:
+        return None
+    return round(float(results[0]['lat']), 6), round(float(results[0]['lon']), 6)
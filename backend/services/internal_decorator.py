@@ -0,0 +1,25 @@
+import hmac
+from flask import request, current_app
+from functools import wraps
+
+from ..utilities import Utility
+
+standardize_response = Utility.standardize_response
+
+def internal_only():
+    """
+    Decorator restricting operational endpoints to callers presenting INTERNAL_API_TOKEN in the
+    X-Internal-Token header. Without a configured token they are only served in debug mode.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapped(*args, **kwargs):
+            expected = current_app.config.get('INTERNAL_API_TOKEN')
+            if expected:
+                if not hmac.compare_digest(request.headers.get('X-Internal-Token', ''), expected):
+                    return standardize_response(status='error', message='Not found', code=404)
+            elif not current_app.debug:
+                return standardize_response(status='error', message='Not found', code=404)
+            return f(*args, **kwargs)
+        return wrapped
+    return decorator
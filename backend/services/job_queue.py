@@ -0,0 +1,216 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class JobQueue:
+    """
+    Durable in-process job queue. Jobs are rows in the job table, so enqueueing inside a request
+    commits the job together with the write that caused it, and nothing is lost on restart.
+
+    Each process runs a pool of worker threads that claim due jobs, run the handler registered
+    for their kind in an app context, and retry failures with exponential backoff until
+    max_attempts. With JOB_WORKERS = 0 no threads start and jobs run through `flask run-jobs`.
+    """
+
+    def __init__(self, clock=utcnow):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._handlers = {}
+        self._threads = []
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._app = None
+        self.workers = 0
+        self.poll_interval = 1.0
+        self.max_attempts = 5
+        self.backoff_base = 2.0
+        self.backoff_max = 300.0
+        self.lease = 300.0
+        self._reset()
+
+    def init_app(self, app):
+        """
+        Applies the app's JOB_* settings. Workers start with the first request, so CLI commands
+        and processes that never serve traffic do not run jobs.
+        """
+        self.stop()
+        self._app = app
+        self.workers = app.config['JOB_WORKERS']
+        self.poll_interval = app.config['JOB_POLL_INTERVAL']
+        self.max_attempts = app.config['JOB_MAX_ATTEMPTS']
+        self.backoff_base = app.config['JOB_BACKOFF_BASE']
+        self.backoff_max = app.config['JOB_BACKOFF_MAX']
+        self.lease = app.config['JOB_LEASE_SECONDS']
+        with self._lock:
+            self._reset()
+        if self.workers > 0:
+            app.before_request(self.start)
+
+    def task(self, kind):
+        """
+        Decorator registering the handler for a job kind. Handlers receive the payload as keyword
+        arguments and run inside an app context; raising makes the job retry.
+        """
+        def decorator(f):
+            self._handlers[kind] = f
+            return f
+        return decorator
+
+    def enqueue(self, kind, delay=0, max_attempts=None, **payload):
+        """
+        Adds a job to the current session; it is committed with the request's transaction and
+        the workers are woken once it is. payload must be JSON serializable.
+        """
+        from ..models import Job, db
+
+        now = self._clock()
+        job = Job.create(
+            kind=kind,
+            payload=payload,
+            run_at=now + timedelta(seconds=delay),
+            created_at=now,
+            max_attempts=max_attempts or self.max_attempts
+        )
+        db.session.info['jobs_enqueued'] = True
+        return job
+
+    def notify(self):
+        self._wake.set()
+
+    def start(self):
+        with self._lock:
+            if self._threads or self._app is None:
+                return
+            self._stopping.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, args=(self._app,), name=f'job-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=5):
+        with self._lock:
+            threads, self._threads = self._threads, []
+        self._stopping.set()
+        self._wake.set()
+        for thread in threads:
+            thread.join(timeout)
+
+    def run_next(self):
+        """
+        Claims and runs one due job in the current app context. Returns False when none was due.
+        """
+        from ..models import Job, db
+
+        now = self._clock()
+        claimed = Job.claim(now, now + timedelta(seconds=self.lease))
+        if claimed is None:
+            return False
+        job_id, kind, payload, attempts, max_attempts, created_at = claimed
+
+        start = time.perf_counter()
+        error = None
+        try:
+            handler = self._handlers.get(kind)
+            if handler is None:
+                raise LookupError(f'No handler for job kind {kind}')
+            handler(**payload)
+        except Exception as e:
+            db.session.rollback()
+            logger.exception('job %s (%s) failed on attempt %d', job_id, kind, attempts)
+            error = f'{type(e).__name__}: {e}'
+        elapsed = time.perf_counter() - start
+
+        retry_at = None
+        if error is not None and attempts < max_attempts:
+            retry_at = self._clock() + timedelta(seconds=self.backoff(attempts))
+        if not Job.finish(job_id, attempts, self._clock(), error=error, retry_at=retry_at):
+            logger.warning('job %s (%s) outlived its lease; its attempt %d was discarded', job_id, kind, attempts)
+            with self._lock:
+                self.lost_leases += 1
+            return True
+
+        with self._lock:
+            self.processed += 1
+            if error is None:
+                self.succeeded += 1
+            elif retry_at is not None:
+                self.retried += 1
+            else:
+                self.failed += 1
+            wait = max(0.0, (now - created_at).total_seconds())
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.run_total += elapsed
+            self.run_max = max(self.run_max, elapsed)
+        return True
+
+    def run_pending(self, limit=None):
+        """
+        Runs due jobs in the calling thread until none is left or limit jobs have run.
+        Returns the number of jobs run.
+        """
+        count = 0
+        while (limit is None or count < limit) and self.run_next():
+            count += 1
+        return count
+
+    def backoff(self, attempts):
+        """
+        Seconds to wait before retrying a job that has failed attempts times.
+        """
+        return min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+
+    def stats(self):
+        from ..models import Job
+
+        depth = Job.count_by_status()
+        with self._lock:
+            return {
+                'queued': depth.get('queued', 0),
+                'running': depth.get('running', 0),
+                'workers': len(self._threads),
+                'processed': self.processed,
+                'succeeded': self.succeeded,
+                'retried': self.retried,
+                'failed': self.failed,
+                'lost_leases': self.lost_leases,
+                'wait_avg_ms': self.wait_total / self.processed * 1000 if self.processed else 0.0,
+                'wait_max_ms': self.wait_max * 1000,
+                'run_avg_ms': self.run_total / self.processed * 1000 if self.processed else 0.0,
+                'run_max_ms': self.run_max * 1000
+            }
+
+    def _work(self, app):
+        while not self._stopping.is_set():
+            try:
+                with app.app_context():
+                    ran = self.run_next()
+            except Exception as e:
+                # e.g. the database is unreachable; keep polling
+                logger.exception(e)
+                ran = False
+            if not ran:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def _reset(self):
+        self.processed = 0
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+        self.lost_leases = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.run_total = 0.0
+        self.run_max = 0.0
+
+
+job_queue = JobQueue()
@@ -0,0 +1,170 @@
+import threading
+import time
+import weakref
+from bisect import bisect_left
+
+from flask import Response, current_app, g, request
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _ShardOwner:
+    """
+    Held only by a thread's local storage, so it is collected when the thread ends.
+    """
+    __slots__ = ('__weakref__',)
+
+
+class ShardedCounters:
+    """
+    Counters sharded per thread: each thread only ever writes its own dict, so increments take
+    no lock. The lock is held only to register or retire a thread's shard and while a scrape
+    sums them. When a thread ends its shard is folded into a shared total, so a thread-per-request
+    server keeps one shard per live thread rather than one per thread ever started.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = {}
+        self._retired = {}
+
+    def inc(self, key, amount=1):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            owner = self._local.owner = _ShardOwner()
+            with self._lock:
+                self._shards[id(shard)] = shard
+            weakref.finalize(owner, self._retire, shard)
+        shard[key] = shard.get(key, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            totals = dict(self._retired)
+            shards = list(self._shards.values())
+        for shard in shards:
+            for key, value in list(shard.items()):
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def clear(self):
+        with self._lock:
+            self._retired.clear()
+            for shard in self._shards.values():
+                shard.clear()
+
+    def _retire(self, shard):
+        # The owning thread has ended, so nothing writes to shard any more
+        with self._lock:
+            self._shards.pop(id(shard), None)
+            for key, value in shard.items():
+                self._retired[key] = self._retired.get(key, 0) + value
+
+
+class RequestMetrics:
+    """
+    Request counters and latency histograms labelled by Flask-RESTX resource class name rather than
+    by path, so token-bearing URLs cannot inflate label cardinality.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._counters = ShardedCounters()
+        self._collectors = []
+
+    def init_app(self, app):
+        self._counters.clear()
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.add_url_rule('/metrics', 'metrics', self._view())
+
+    def register_collector(self, name, collect):
+        """
+        Adds a callable returning a flat dict of numbers, exported as <prefix>_<name>_<key> gauges.
+        """
+        self._collectors = [c for c in self._collectors if c[0] != name] + [(name, collect)]
+
+    def observe(self, resource, method, status, seconds):
+        counters = self._counters
+        counters.inc(('requests', resource, method, status))
+        if status >= 400:
+            counters.inc(('errors', resource, status))
+        counters.inc(('bucket', resource, method, bisect_left(self.buckets, seconds)))
+        counters.inc(('sum', resource, method), seconds)
+
+    def render(self, prefix='pickadate'):
+        """
+        Returns every metric in the Prometheus text exposition format.
+        """
+        totals = self._counters.snapshot()
+        lines = [
+            f'# HELP {prefix}_http_requests_total Requests by resource, method and status.',
+            f'# TYPE {prefix}_http_requests_total counter'
+        ]
+        for key, value in sorted(item for item in totals.items() if item[0][0] == 'requests'):
+            _, resource, method, status = key
+            lines.append(f'{prefix}_http_requests_total{{resource="{resource}",method="{method}",status="{status}"}} {value}')
+
+        lines += [
+            f'# HELP {prefix}_http_errors_total Responses with a 4xx or 5xx status by resource.',
+            f'# TYPE {prefix}_http_errors_total counter'
+        ]
+        for key, value in sorted(item for item in totals.items() if item[0][0] == 'errors'):
+            _, resource, status = key
+            lines.append(f'{prefix}_http_errors_total{{resource="{resource}",status="{status}"}} {value}')
+
+        lines += [
+            f'# HELP {prefix}_http_request_duration_seconds Request latency by resource and method.',
+            f'# TYPE {prefix}_http_request_duration_seconds histogram'
+        ]
+        series = sorted({(key[1], key[2]) for key in totals if key[0] == 'sum'})
+        for resource, method in series:
+            labels = f'resource="{resource}",method="{method}"'
+            cumulative = 0
+            for i, bound in enumerate(self.buckets + (float('inf'),)):
+                cumulative += totals.get(('bucket', resource, method, i), 0)
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{prefix}_http_request_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_http_request_duration_seconds_sum{{{labels}}} {totals[("sum", resource, method)]}')
+            lines.append(f'{prefix}_http_request_duration_seconds_count{{{labels}}} {cumulative}')
+
+        for name, collect in self._collectors:
+            for key, value in collect().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                metric = f'{prefix}_{name}_{key}'
+                lines += [f'# TYPE {metric} gauge', f'{metric} {value}']
+        return '\n'.join(lines) + '\n'
+
+    def _start_request(self):
+        g.metrics_start = time.perf_counter()
+
+    def _finish_request(self, response):
+        start = g.pop('metrics_start', None)
+        if start is None or request.endpoint == 'metrics':
+            return response
+        self.observe(resource_name(), request.method, response.status_code, time.perf_counter() - start)
+        return response
+
+    def _view(self):
+        from .internal_decorator import internal_only
+
+        @internal_only()
+        def metrics():
+            return Response(self.render(), mimetype='text/plain; version=0.0.4')
+        return metrics
+
+
+def resource_name():
+    """
+    Returns the resource class serving the request, e.g. EventDetailResource.
+    """
+    if request.url_rule is None:
+        return 'unmatched'
+    view = current_app.view_functions.get(request.endpoint)
+    view_class = getattr(view, 'view_class', None)
+    return view_class.__name__ if view_class is not None else request.endpoint
+
+
+request_metrics = RequestMetrics()
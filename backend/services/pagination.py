@@ -0,0 +1,53 @@
+import base64
+import binascii
+
+
+def encode_cursor(last_id):
+    """
+    Encodes the key of the last row on a page as an opaque cursor.
+    """
+    return base64.urlsafe_b64encode(f'k:{last_id}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Returns the key encoded by encode_cursor. Raises ValueError for malformed cursors.
+    """
+    try:
+        value = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError(cursor)
+    if not value.startswith('k:'):
+        raise ValueError(cursor)
+    return int(value[2:])
+
+
+def parse_page_args(args, allowed_fields, key, default_limit, max_limit):
+    """
+    Reads limit, cursor and fields from request args.
+
+    Returns (fields, after, limit). fields always contains the key column, which the next
+    cursor is built from, and keeps allowed_fields order. Raises ValueError on invalid input.
+    """
+    limit = int(args.get('limit', default_limit))
+    if limit < 1 or limit > max_limit:
+        raise ValueError(limit)
+
+    cursor = args.get('cursor')
+    after = decode_cursor(cursor) if cursor else None
+
+    requested = args.get('fields')
+    if requested:
+        names = {name.strip() for name in requested.split(',') if name.strip()}
+        unknown = names - set(allowed_fields)
+        if unknown:
+            raise ValueError(unknown)
+        names.add(key)
+        fields = tuple(name for name in allowed_fields if name in names)
+    else:
+        fields = tuple(allowed_fields)
+    return fields, after, limit
+
+
+def next_cursor(rows, key, has_more):
+    return encode_cursor(rows[-1][key]) if has_more and rows else None
@@ -0,0 +1,115 @@
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """
+    Connection pool counters for sizing workers against the database.
+
+    Checkouts, checkins, new connections and invalidations (including stale connections
+    caught by pre-ping) come from SQLAlchemy pool events. Wait time, timeouts and overflow
+    checkouts are recorded by MeteredQueuePool, so they are only reported for MySQL configs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engine = None
+        self._reset()
+
+    def attach(self, engine):
+        """
+        Starts collecting metrics for engine and resets every counter.
+        """
+        with self._lock:
+            self._engine = engine
+            self._reset()
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'invalidate', self._on_invalidate)
+
+    def record_wait(self, seconds, overflowed, timed_out=False):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if overflowed:
+                self.overflow_checkouts += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'overflow_checkouts': self.overflow_checkouts,
+                'timeouts': self.timeouts,
+                'wait_avg_ms': self.wait_total / self.wait_count * 1000 if self.wait_count else 0.0,
+                'wait_max_ms': self.wait_max * 1000
+            }
+            pool = self._engine.pool if self._engine is not None else None
+        stats['pool'] = type(pool).__name__ if pool is not None else None
+        if isinstance(pool, QueuePool):
+            stats.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow(), idle=pool.checkedin())
+        return stats
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def _reset(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+pool_metrics = PoolMetrics()
+replica_pool_metrics = PoolMetrics()
+
+
+class MeteredQueuePool(QueuePool):
+    """
+    QueuePool reporting how long each checkout waited and whether it needed an overflow connection.
+    """
+    metrics = pool_metrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, overflowed=False, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start, overflowed=self.overflow() > 0)
+        return connection
+
+
+class ReplicaMeteredQueuePool(MeteredQueuePool):
+    """
+    Keeps the replica's checkout waits out of the primary's pool_metrics, which size the primary pool.
+    """
+    metrics = replica_pool_metrics
@@ -0,0 +1,88 @@
+import json
+import logging
+import random
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+
+class QueryTimer:
+    """
+    Per-request SQL instrumentation: query count, total database time and the slowest statement.
+
+    Timing every statement costs two perf_counter calls, so it always runs and slow statements
+    are always logged. The Server-Timing header and the per-request log line are only emitted
+    for the sampled fraction of requests.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.slow_query_seconds = 0.2
+
+    def init_app(self, app):
+        self.enabled = app.config['SQL_TIMING_ENABLED']
+        self.sample_rate = app.config['SQL_TIMING_SAMPLE_RATE']
+        self.slow_query_seconds = app.config['SQL_SLOW_QUERY_MS'] / 1000
+        if not self.enabled:
+            return
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    def attach(self, engine):
+        if not self.enabled:
+            return
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _start_request(self):
+        g.sql_timing = {'count': 0, 'seconds': 0.0, 'slowest': 0.0, 'slowest_statement': None}
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Kept on the execution context, which is discarded with the statement even when it raises
+        context._query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+        if elapsed >= self.slow_query_seconds:
+            logger.warning(json.dumps({
+                'event': 'slow_query',
+                'duration_ms': round(elapsed * 1000, 2),
+                'path': request.path if has_request_context() else None,
+                'statement': statement
+            }))
+        stats = g.get('sql_timing') if has_request_context() else None
+        if stats is None:
+            return
+        stats['count'] += 1
+        stats['seconds'] += elapsed
+        if elapsed > stats['slowest']:
+            stats['slowest'] = elapsed
+            stats['slowest_statement'] = statement
+
+    def _finish_request(self, response):
+        stats = g.pop('sql_timing', None)
+        if stats is None or random.random() >= self.sample_rate:
+            return response
+        total_ms = stats['seconds'] * 1000
+        slowest_ms = stats['slowest'] * 1000
+        timing = f'db;dur={total_ms:.2f};desc="{stats["count"]} queries", db-slowest;dur={slowest_ms:.2f}'
+        existing = response.headers.get('Server-Timing')
+        response.headers['Server-Timing'] = f'{existing}, {timing}' if existing else timing
+        logger.info(json.dumps({
+            'event': 'request_sql',
+            'method': request.method,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'queries': stats['count'],
+            'db_ms': round(total_ms, 2),
+            'slowest_ms': round(slowest_ms, 2),
+            'slowest_statement': stats['slowest_statement']
+        }))
+        return response
+
+
+query_timer = QueryTimer()
@@ -0,0 +1,28 @@
+import math
+from functools import wraps
+
+from flask import request
+
+from ..utilities import Utility
+from .admission import rate_limiter
+
+standardize_response = Utility.standardize_response
+
+def rate_limited(action, by=('ip',)):
+    """
+    Decorator applying the RATE_LIMITS buckets named <action>:<key type> for each key type in by:
+    'ip' keys on the client address, 'token' on the event token in the URL. Apply it outside
+    token_required so throttled requests never reach the database.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapped(*args, **kwargs):
+            keys = {'ip': request.remote_addr, 'token': kwargs.get('token')}
+            for key_type in by:
+                retry_after = rate_limiter.check(action, key_type, keys[key_type])
+                if retry_after is not None:
+                    body, code = standardize_response(status='error', message='Too many requests', code=429)
+                    return body, code, {'Retry-After': str(max(1, math.ceil(retry_after)))}
+            return f(*args, **kwargs)
+        return wrapped
+    return decorator
@@ -0,0 +1,89 @@
+import time
+from contextlib import contextmanager
+
+import sqlalchemy as sa
+from flask import current_app, g, has_app_context, request
+from flask_sqlalchemy.session import Session
+
+from .pool_metrics import MeteredQueuePool, ReplicaMeteredQueuePool
+
+READ_PRIMARY_COOKIE = 'read_primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RoutingSession(Session):
+    """
+    Session sending the reads of read-only requests to the replica bind.
+
+    Writes, flushes and anything issued while the session holds pending changes always go to
+    the primary, as does every statement outside a request marked by init_replica_routing.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _reading_from_replica() and not self._flushing and not isinstance(clause, sa.UpdateBase):
+            replica = get_replica_engine()
+            if replica is not None and not (self.new or self.dirty or self.deleted):
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _reading_from_replica():
+    return has_app_context() and g.get('use_replica', False)
+
+
+def get_replica_engine():
+    """
+    Returns the current app's replica engine, or None when no replica is configured.
+    """
+    return current_app.extensions.get('replica_engine')
+
+
+@contextmanager
+def on_primary():
+    """
+    Sends the reads issued inside the block to the primary, e.g. to retry a lookup the replica
+    may not have caught up with yet.
+    """
+    previous = g.get('use_replica', False)
+    g.use_replica = False
+    try:
+        yield
+    finally:
+        g.use_replica = previous
+
+
+def init_replica_routing(app):
+    """
+    Routes GET/HEAD requests to the replica, except for clients inside their read-your-writes
+    window: every successful write sets a cookie that keeps that client on the primary for
+    READ_YOUR_WRITES_SECONDS, so a client always reads back what it just wrote.
+
+    The replica engine is kept outside SQLALCHEMY_BINDS, which would give it its own metadata
+    and tables, and shares the primary's engine options except that a metered pool reports
+    to replica_pool_metrics.
+    """
+    if not app.config.get('SQLALCHEMY_REPLICA_URI'):
+        return
+    options = dict(app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+    if options.get('poolclass') is MeteredQueuePool:
+        options['poolclass'] = ReplicaMeteredQueuePool
+    app.extensions['replica_engine'] = sa.create_engine(app.config['SQLALCHEMY_REPLICA_URI'], **options)
+
+    @app.before_request
+    def route_reads():
+        g.use_replica = request.method in SAFE_METHODS and not _in_write_window()
+
+    @app.after_request
+    def start_write_window(response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            window = app.config['READ_YOUR_WRITES_SECONDS']
+            until = time.time() + window
+            response.set_cookie(READ_PRIMARY_COOKIE, f'{until:.3f}', max_age=int(window) + 1, httponly=True, samesite='Lax')
+        return response
+
+
+def _in_write_window():
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
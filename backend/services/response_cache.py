@@ -0,0 +1,222 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class RedisBackend:
+    """
+    Shared tier in Redis, so every worker process reuses a payload built once.
+    The redis package is only required when this backend is configured.
+    """
+
+    def __init__(self, url):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        return self._client.get(key)
+
+    def set(self, key, value, ttl):
+        self._client.set(key, value, ex=max(1, int(ttl)))
+
+    def delete(self, key):
+        self._client.delete(key)
+
+
+class MemoryBackend:
+    """
+    In-process stand-in for a shared backend, with the same bytes-only interface as RedisBackend.
+    Used in tests to share one store between several caches as if they were separate workers.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._values = {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= self._clock():
+                del self._values[key]
+                return None
+            return entry[0]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._values[key] = (bytes(value), self._clock() + ttl)
+
+    def delete(self, key):
+        with self._lock:
+            self._values.pop(key, None)
+
+
+def make_backend(url=None):
+    if not url:
+        return None
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisBackend(url)
+    if url == 'memory://':
+        return MemoryBackend()
+    raise ValueError(f'Unsupported response cache backend: {url}')
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.payload = None
+        self.failed = False
+
+
+class ResponseCache:
+    """
+    Two-tier cache of serialized response bodies keyed by event uuid and version.
+
+    Each event keeps one entry holding the version it was built for, so a write, which always
+    bumps the version, makes the entry unreachable even before it is invalidated. Lookups try
+    the in-process LRU, then the optional shared backend, and only then build the payload.
+    Concurrent misses for the same event and version are coalesced into a single build.
+    """
+
+    def __init__(self, maxsize=256, ttl=60, shared=None, prefix='event-detail:', clock=time.monotonic):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._flights = {}
+        self.prefix = prefix
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.shared = shared
+        self._reset()
+
+    def configure(self, maxsize, ttl, shared=None):
+        """
+        Applies new limits and backend and empties the local tier.
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            self.ttl = ttl
+            self.shared = shared
+            self._entries.clear()
+            self._reset()
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get_or_build(self, event_uuid, version, build):
+        """
+        Returns the payload cached for this event version, or calls build() once to produce it,
+        however many threads ask at the same time. A None payload is returned but not cached.
+        """
+        if not self.enabled:
+            return build()
+
+        payload = self._get_local(event_uuid, version)
+        if payload is not None:
+            return payload
+
+        with self._lock:
+            flight = self._flights.get((event_uuid, version))
+            leader = flight is None
+            if leader:
+                flight = self._flights[(event_uuid, version)] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            return build() if flight.failed else flight.payload
+
+        try:
+            payload = self._get_shared(event_uuid, version)
+            if payload is None:
+                with self._lock:
+                    self.builds += 1
+                payload = build()
+                if payload is not None and self.shared is not None:
+                    self.shared.set(self.prefix + event_uuid, b'%d\n' % version + payload, self.ttl)
+            if payload is not None:
+                self._set_local(event_uuid, version, payload)
+            flight.payload = payload
+            return payload
+        except Exception:
+            flight.failed = True
+            raise
+        finally:
+            with self._lock:
+                del self._flights[(event_uuid, version)]
+            flight.done.set()
+
+    def invalidate(self, event_uuid):
+        """
+        Drops an event's payload from both tiers. Call after the write is committed.
+        """
+        with self._lock:
+            self._entries.pop(event_uuid, None)
+        if self.shared is not None:
+            self.shared.delete(self.prefix + event_uuid)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._reset()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'builds': self.builds,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl
+            }
+
+    def _get_local(self, event_uuid, version):
+        with self._lock:
+            entry = self._entries.get(event_uuid)
+            if entry is not None and entry[0] == version and entry[2] > self._clock():
+                self._entries.move_to_end(event_uuid)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def _get_shared(self, event_uuid, version):
+        if self.shared is None:
+            return None
+        raw = self.shared.get(self.prefix + event_uuid)
+        if raw is None:
+            return None
+        cached_version, _, payload = bytes(raw).partition(b'\n')
+        if int(cached_version) != version:
+            return None
+        with self._lock:
+            self.shared_hits += 1
+        return payload
+
+    def _set_local(self, event_uuid, version, payload):
+        with self._lock:
+            self._entries[event_uuid] = (version, payload, self._clock() + self.ttl)
+            self._entries.move_to_end(event_uuid)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _reset(self):
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.builds = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+
+event_detail_cache = ResponseCache()
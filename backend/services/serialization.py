@@ -0,0 +1,68 @@
+def iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def as_float(value):
+    return float(value) if value is not None else None
+
+
+class Schema:
+    """
+    Ordered response fields of a model, each optionally paired with a converter.
+
+    Fields are given as names or (name, converter) tuples. Each schema compiles two extractors
+    once, at import time: one reading attributes off ORM objects and one reading row tuples
+    selected in schema order. Both build the response dict in a single literal, the same code
+    a hand-written to_dict would be, without per-field loops or lookups.
+    """
+
+    def __init__(self, *fields):
+        self.fields = fields
+        self.names = tuple(f if isinstance(f, str) else f[0] for f in fields)
+        converters = {name: f[1] for name, f in zip(self.names, fields) if not isinstance(f, str)}
+        self.dump = _compile(self.names, converters, 'obj.{name}')
+        self.dump_row = _compile(self.names, converters, 'obj[{index}]')
+        self._projections = {}
+
+    def dump_many(self, objs):
+        dump = self.dump
+        return [dump(obj) for obj in objs]
+
+    def dump_rows(self, rows):
+        dump_row = self.dump_row
+        return [dump_row(row) for row in rows]
+
+    def only(self, names):
+        """
+        Returns the schema restricted to names, in this schema's field order. Cached per name set.
+        """
+        key = frozenset(names)
+        projection = self._projections.get(key)
+        if projection is None:
+            projection = Schema(*(f for f, name in zip(self.fields, self.names) if name in key))
+            self._projections[key] = projection
+        return projection
+
+    def columns(self, model):
+        """
+        Returns the model attributes to select for rows that dump_row can serialize.
+        """
+        return [getattr(model, name) for name in self.names]
+
+
+def _compile(names, converters, accessor):
+    """
+    Builds a function returning {name: value} for names, reading each value with accessor.
+    """
+    namespace = {}
+    items = []
+    for index, name in enumerate(names):
+        if not name.isidentifier():
+            raise ValueError(name)
+        value = accessor.format(name=name, index=index)
+        if name in converters:
+            namespace[f'convert_{name}'] = converters[name]
+            value = f'convert_{name}({value})'
+        items.append(f'{name!r}: {value}')
+    exec(f'def extract(obj):\n    return {{{", ".join(items)}}}', namespace)
+    return namespace['extract']
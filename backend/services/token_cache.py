@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenCache:
+    """
+    Bounded LRU cache with a TTL mapping access tokens to event uuids.
+
+    Only the event uuid is cached, never ORM objects, so entries are safe to share across
+    requests and threads. Entries are dropped explicitly when a token is revoked or its event
+    is deactivated.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300, clock=time.monotonic):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._tokens_by_event = {}
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, maxsize, ttl):
+        """
+        Applies new limits and empties the cache.
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            self.ttl = ttl
+            self._clear()
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, token):
+        """
+        Returns the cached event uuid for a token, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            event_uuid, expires_at = entry
+            if expires_at <= self._clock():
+                self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return event_uuid
+
+    def set(self, token, event_uuid):
+        if not self.enabled:
+            return
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (event_uuid, self._clock() + self.ttl)
+            self._tokens_by_event.setdefault(event_uuid, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_token(self, token):
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+
+    def invalidate_event(self, event_uuid):
+        with self._lock:
+            for token in list(self._tokens_by_event.get(event_uuid, ())):
+                self._remove(token)
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl
+            }
+
+    def _remove(self, token):
+        event_uuid, _ = self._entries.pop(token)
+        tokens = self._tokens_by_event.get(event_uuid)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_event[event_uuid]
+
+    def _clear(self):
+        self._entries.clear()
+        self._tokens_by_event.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+token_cache = TokenCache()
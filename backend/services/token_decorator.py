@@ -2,14 +2,20 @@ from flask import request, g
 from functools import wraps
 
 from ..utilities import Utility
+from .token_cache import token_cache
+from .replica_routing import on_primary
 
 standardize_response = Utility.standardize_response
 
-def token_required():
+def token_required(allow_archived=False):
     """
     Decorator to check if the request has a valid access token.
+    Token lookups are served from token_cache when possible.
+
+    Tokens of archived events are answered with 410, unless allow_archived is set: the handler
+    then runs with g.event_archived set and must read the event from EventArchive.
     """
-    from ..models import AccessToken
+    from ..models import AccessToken, ArchivedToken
 
     def decorator(f):
         @wraps(f)
@@ -18,12 +24,29 @@ def token_required():
             if not token:
                 return standardize_response(status='error', message="Token is missing", code=401)
             
-            access_token = AccessToken.get_by_token(token)
+            event_uuid = token_cache.get(token)
+            if event_uuid is None:
+                access_token = AccessToken.get_by_token(token)
+                if not access_token and g.get('use_replica'):
+                    # The token may be newer than the replica, e.g. right after the event was created
+                    with on_primary():
+                        access_token = AccessToken.get_by_token(token)
+                if not access_token:
+                    archived_event_uuid = ArchivedToken.get_event_uuid(token)
+                    if archived_event_uuid is None:
+                        return standardize_response(status='error', message="Invalid token", code=401)
+                    if not allow_archived:
+                        return standardize_response(status='error', message="Event has been archived", code=410)
+                    g.event_uuid = archived_event_uuid
+                    g.event_archived = True
+                    return f(*args, **kwargs)
+                event_uuid = access_token.event_uuid
+                token_cache.set(token, event_uuid)
 
             # TODO: Add logging
 
             # Inject context
-            g.event_uuid = access_token.event_uuid
+            g.event_uuid = event_uuid
 
             return f(*args, **kwargs)
         return wrapped
@@ -0,0 +1,33 @@
+import os
+import uuid
+
+from sqlalchemy import String
+from sqlalchemy.types import BINARY, TypeDecorator
+
+# Schema-level choice, so it is fixed per process rather than per app: BINARY(16) uuid columns
+# when set, the original VARCHAR(45) strings otherwise. Existing databases need a migration.
+COMPACT_UUIDS = os.getenv('DB_COMPACT_UUIDS', 'false').lower() == 'true'
+
+
+class CompactUUID(TypeDecorator):
+    """
+    Stores uuid strings as their 16 raw bytes and returns them as the same canonical strings,
+    so models and API responses are unchanged while rows and indexes shrink.
+    """
+
+    impl = BINARY(16)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return uuid.UUID(str(value)).bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return str(uuid.UUID(bytes=bytes(value)))
+
+
+def uuid_column_type(compact=COMPACT_UUIDS):
+    return CompactUUID() if compact else String(45)
@@ -0,0 +1,35 @@
+"""
+Handlers for the background jobs in services.job_queue, registered when the app imports this module.
+"""
+from flask import current_app
+
+from .models import EventAddress
+from .services.archival import archive_expired_events
+from .services.geocoding import geocode
+from .services.job_queue import job_queue
+
+
+@job_queue.task('geocode_address')
+def geocode_address(event_address_id):
+    """
+    Fills in the coordinates of an address created without them.
+    """
+    url = current_app.config['GEOCODER_URL']
+    lookup = EventAddress.get_geocoding_query(event_address_id)
+    if not url or lookup is None:
+        return
+    event_uuid, query = lookup
+    coordinates = geocode(url, query, timeout=current_app.config['GEOCODER_TIMEOUT'])
+    if coordinates is not None:
+        EventAddress.set_coordinates(event_uuid, event_address_id, *coordinates)
+
+
+@job_queue.task('archive_events')
+def archive_events(max_batches=None):
+    archive_expired_events(
+        after_days=current_app.config['ARCHIVE_AFTER_DAYS'],
+        inactive_after_days=current_app.config['ARCHIVE_INACTIVE_AFTER_DAYS'],
+        batch_size=current_app.config['ARCHIVE_BATCH_SIZE'],
+        pause=current_app.config['ARCHIVE_BATCH_PAUSE'],
+        max_batches=max_batches
+    )
@@ -1,4 +1,54 @@
-from flask import jsonify
+from datetime import date, datetime
+from decimal import Decimal
+import json
+
+from flask import jsonify, make_response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def text_parser(max_length, nullable=False):
+    """
+    Returns a PATCH field parser accepting non-blank strings of at most max_length characters.
+    """
+    def parse(value):
+        if value is None and nullable:
+            return None
+        if not isinstance(value, str) or not value.strip() or len(value) > max_length:
+            raise ValueError(value)
+        return value
+    return parse
+
+
+def parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def parse_id(value):
+    """
+    Parses a positive integer id taken from a URL segment.
+    """
+    if not value.isascii() or not value.isdigit() or int(value) < 1:
+        raise ValueError(value)
+    return int(value)
+
+
+def parse_bool(value):
+    if not isinstance(value, bool):
+        raise ValueError(value)
+    return value
+
 
 class Utility:
     @staticmethod
@@ -7,4 +57,36 @@ class Utility:
             'status': status,
             'data': data,
             'message': message,
-        }, code
\ No newline at end of file
+        }, code
+
+    @staticmethod
+    def parse_patch(data, parsers):
+        """
+        Returns the fields of a PATCH body, each converted by its parser. Raises ValueError or
+        TypeError when the body is not a non-empty object, names an unknown field or holds an invalid value.
+        """
+        if not isinstance(data, dict) or not data:
+            raise ValueError(data)
+        unknown = set(data) - set(parsers)
+        if unknown:
+            raise ValueError(unknown)
+        return {name: parsers[name](value) for name, value in data.items()}
+
+    @staticmethod
+    def dump_json(data):
+        """
+        Encodes a response body compactly, with orjson when it is installed.
+        """
+        if orjson is not None:
+            return orjson.dumps(data, default=_default)
+        return json.dumps(data, default=_default, separators=(',', ':')).encode()
+
+    @staticmethod
+    def output_json(data, code, headers=None):
+        """
+        Flask-RESTX representation for application/json, used for every standardize_response body.
+        """
+        response = make_response(Utility.dump_json(data), code)
+        response.mimetype = 'application/json'
+        response.headers.extend(headers or {})
+        return response
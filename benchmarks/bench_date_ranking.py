@@ -0,0 +1,59 @@
+"""
+Benchmark for the best-date ranking engine and the consecutive window search.
+
+Usage: python -m benchmarks.bench_date_ranking [--participants 500] [--days 365]
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from backend.services.date_ranking import AvailabilityMatrix, rank_days, find_windows
+
+
+def build_rows(participant_count, day_count, seed=0):
+    rng = random.Random(seed)
+    min_date = date(2025, 1, 1)
+    participants = [
+        (i, 'organizer' if i < 3 else 'participant', rng.random() < 0.2)
+        for i in range(participant_count)
+    ]
+    date_rows = [
+        (participant_id, min_date + timedelta(days=day), rng.choice((0, 0, 1, 2)))
+        for participant_id, _, _ in participants
+        for day in range(day_count)
+    ]
+    return min_date, min_date + timedelta(days=day_count - 1), participants, date_rows
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--participants', type=int, default=500)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    min_date, max_date, participants, date_rows = build_rows(args.participants, args.days)
+    matrix = AvailabilityMatrix.from_rows(min_date, max_date, participants, date_rows)
+
+    load_ms = best_of(lambda: AvailabilityMatrix.from_rows(min_date, max_date, participants, date_rows), args.repeat)
+    rank_ms = best_of(lambda: rank_days(matrix, top_k=10, min_drivers=1), args.repeat)
+    window_ms = best_of(lambda: find_windows(matrix, window_length=3, top_k=10), args.repeat)
+
+    print(f'{args.participants} participants x {args.days} days ({len(date_rows)} rows)')
+    print(f'  build matrix: {load_ms:8.2f} ms')
+    print(f'  rank days:    {rank_ms:8.2f} ms')
+    print(f'  3-day window: {window_ms:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
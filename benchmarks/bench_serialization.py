@@ -0,0 +1,134 @@
+"""
+Benchmark for event detail serialization: the schema serializer with the compact JSON encoder
+against the previous hand-written to_detail_dict with Flask-RESTX's default encoder.
+
+Usage: python -m benchmarks.bench_serialization [--participants 1000] [--days 30]
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from backend.app import create_app, db
+from backend.utilities import Utility
+
+
+def legacy_detail_dict(event):
+    return {
+        'event_name': event.event_name,
+        'description': event.description,
+        'date_created': event.date_created.isoformat() if event.date_created else None,
+        'max_date': event.max_date.isoformat() if event.max_date else None,
+        'min_date': event.min_date.isoformat() if event.min_date else None,
+        'is_active': event.is_active,
+        'participants_count': event.participants_count,
+        'addresses_count': event.addresses_count,
+        'participants': [
+            {
+                'participant_id': p.participant_id,
+                'name': p.name,
+                'phone': p.phone,
+                'postal_code': p.postal_code,
+                'icon_path': p.icon_path,
+                'color': p.color,
+                'is_driver': p.is_driver,
+                'role': p.role
+            } for p in event.participants
+        ],
+        'addresses': [
+            {
+                'event_address_id': a.event_address_id,
+                'address_name': a.address_name,
+                'street_line_1': a.street_line_1,
+                'street_line_2': a.street_line_2,
+                'city': a.city,
+                'state_or_province': a.state_or_province,
+                'country_code': a.country_code,
+                'postal_code': a.postal_code,
+                'latitude': float(a.latitude) if a.latitude is not None else None,
+                'longitude': float(a.longitude) if a.longitude is not None else None
+            } for a in event.addresses
+        ],
+        'dates': [
+            {
+                'date_id': d.date_id,
+                'participant_id': d.participant_id,
+                'date': d.date.isoformat() if d.date else None,
+                'availability_level': d.availability_level
+            } for d in event.dates
+        ]
+    }
+
+
+def seed(participant_count, day_count, seed=0):
+    from backend.models import Event, EventAddress, Participant, Date
+
+    rng = random.Random(seed)
+    min_date = date(2025, 1, 1)
+    event = Event.create(
+        event_name='bench',
+        description='serialization benchmark',
+        max_date=min_date + timedelta(days=day_count - 1),
+        min_date=min_date
+    )
+    db.session.flush()
+    EventAddress.create(
+        event_uuid=event.event_uuid, address_name='Bench', street_line_1='1 Main St', street_line_2='',
+        city='City', state_or_province='State', country_code='US', postal_code='12345', latitude=1.5, longitude=2.5
+    )
+    db.session.execute(Participant.__table__.insert(), [
+        {
+            'participant_id': i + 1, 'event_uuid': event.event_uuid, 'name': f'Participant {i}', 'phone': f'555{i:07d}',
+            'postal_code': '12345', 'icon_path': 'default.png', 'color': '#123456', 'is_driver': rng.random() < 0.2,
+            'role': 'participant'
+        } for i in range(participant_count)
+    ])
+    db.session.execute(Date.__table__.insert(), [
+        {
+            'event_uuid': event.event_uuid, 'participant_id': i + 1, 'date': min_date + timedelta(days=day),
+            'availability_level': rng.choice((0, 1, 2))
+        } for i in range(participant_count) for day in range(day_count)
+    ])
+    db.session.commit()
+    return event.event_uuid
+
+
+def cpu_best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        timings.append(time.process_time() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--participants', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    with app.app_context():
+        from backend.models import Event
+
+        db.create_all()
+        event = Event.get_event_detail_by_uuid(seed(args.participants, args.days))
+        response = {'status': 'success', 'data': event.to_detail_dict(), 'message': ''}
+        assert legacy_detail_dict(event) == response['data']
+
+        legacy_dict_ms = cpu_best_of(lambda: legacy_detail_dict(event), args.repeat)
+        schema_dict_ms = cpu_best_of(lambda: event.to_detail_dict(), args.repeat)
+        legacy_json_ms = cpu_best_of(lambda: json.dumps(response) + '\n', args.repeat)
+        fast_json_ms = cpu_best_of(lambda: Utility.dump_json(response), args.repeat)
+
+    print(f'{args.participants} participants x {args.days} days, CPU ms per response')
+    print(f'  hand-written dict: {legacy_dict_ms:8.2f}    schema dict: {schema_dict_ms:8.2f}')
+    print(f'  restx json:        {legacy_json_ms:8.2f}    dump_json:   {fast_json_ms:8.2f}')
+    print(f'  total:             {legacy_dict_ms + legacy_json_ms:8.2f}    total:       {schema_dict_ms + fast_json_ms:8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Startup benchmark: import time of backend.app (python -X importtime), create_app time and
+time to first response, each measured in a fresh interpreter.
+
+Results are compared against benchmarks/startup_baseline.json; --check exits non-zero when a
+metric regresses beyond --tolerance, and --write-baseline records the current numbers.
+
+Usage: python -m benchmarks.bench_startup [--repeat 5] [--check] [--write-baseline]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'startup_baseline.json')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BOOT_SCRIPT = """
+import json, logging, time
+start = time.perf_counter()
+from backend.app import create_app, db
+imported = time.perf_counter()
+app = create_app('testing')
+created = time.perf_counter()
+logging.disable(logging.CRITICAL)
+with app.app_context():
+    db.create_all()
+ready = time.perf_counter()
+app.test_client().get('/events/not-a-token')
+answered = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_response_ms': (answered - ready) * 1000
+}))
+"""
+
+
+def run(args):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def importtime(module='backend.app', top=5):
+    """
+    Returns the cumulative import time of module and the slowest imports by self time, in ms.
+    """
+    lines = run(['-X', 'importtime', '-c', f'import {module}']).stderr.splitlines()
+    entries = []
+    for line in lines:
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    total = next(cumulative for name, _, cumulative in entries if name == module)
+    slowest = sorted(entries, key=lambda e: -e[1])[:top]
+    return total, [(name, self_ms) for name, self_ms, _ in slowest]
+
+
+def boot():
+    return json.loads(run(['-c', BOOT_SCRIPT]).stdout.strip().splitlines()[-1])
+
+
+def measure(repeat):
+    samples = [boot() for _ in range(repeat)]
+    results = {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+    results['importtime_ms'] = statistics.median(importtime()[0] for _ in range(repeat))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative regression for --check')
+    parser.add_argument('--check', action='store_true')
+    parser.add_argument('--write-baseline', action='store_true')
+    args = parser.parse_args()
+
+    results = measure(args.repeat)
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+
+    regressions = []
+    print(f'median of {args.repeat} fresh interpreters')
+    for key, value in results.items():
+        reference = baseline.get(key)
+        delta = f'{(value / reference - 1) * 100:+6.1f}% vs baseline' if reference else ''
+        print(f'  {key:18} {value:8.1f} ms  {delta}')
+        if reference and value > reference * (1 + args.tolerance):
+            regressions.append(key)
+
+    print('slowest imports (self time):')
+    for name, self_ms in importtime()[1]:
+        print(f'  {name:40} {self_ms:8.1f} ms')
+
+    if args.write_baseline:
+        with open(BASELINE, 'w') as f:
+            json.dump({key: round(value, 1) for key, value in results.items()}, f, indent=2)
+            f.write('\n')
+    if args.check and regressions:
+        print(f'regressed: {", ".join(regressions)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
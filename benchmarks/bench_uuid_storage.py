@@ -0,0 +1,105 @@
+"""
+Benchmark for uuid storage: VARCHAR(45) strings against BINARY(16) (DB_COMPACT_UUIDS=true).
+
+Seeds the same synthetic data into a SQLite file for each mode and reports the size of the date
+table and its indexes (from dbstat) and the time of an event -> participant -> date join.
+
+Usage: python -m benchmarks.bench_uuid_storage [--events 200] [--participants 20] [--days 30]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE_SCRIPT = """
+import json, logging, random, sys, time
+from datetime import date, timedelta
+from sqlalchemy import select, func, text
+from backend.app import create_app, db
+from backend.models import Event, Participant, Date, generate_uuid
+
+path, event_count, participant_count, day_count, repeat = sys.argv[1], *map(int, sys.argv[2:])
+app = create_app('testing', config_overrides={'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}'})
+logging.disable(logging.CRITICAL)
+with app.app_context():
+    db.create_all()
+    rng = random.Random(0)
+    min_date = date(2025, 1, 1)
+    event_uuids = [generate_uuid() for _ in range(event_count)]
+    db.session.execute(Event.__table__.insert(), [
+        {'event_uuid': u, 'event_name': 'bench', 'min_date': min_date, 'max_date': min_date + timedelta(days=day_count)}
+        for u in event_uuids
+    ])
+    participants = [(i * participant_count + p + 1, u) for i, u in enumerate(event_uuids) for p in range(participant_count)]
+    db.session.execute(Participant.__table__.insert(), [
+        {'participant_id': pid, 'event_uuid': u, 'name': 'p', 'phone': str(pid), 'role': 'participant'} for pid, u in participants
+    ])
+    db.session.execute(Date.__table__.insert(), [
+        {'event_uuid': u, 'participant_id': pid, 'date': min_date + timedelta(days=d), 'availability_level': rng.choice((0, 1, 2))}
+        for pid, u in participants for d in range(day_count)
+    ])
+    db.session.commit()
+    db.session.execute(text('VACUUM'))
+
+    sizes = dict(db.session.execute(text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")).all())
+    payload, rows = db.session.execute(text("SELECT SUM(payload), SUM(ncell) FROM dbstat WHERE name = 'date' AND pagetype = 'leaf'")).one()
+
+    timings = []
+    for _ in range(repeat):
+        sample = rng.sample(event_uuids, min(50, len(event_uuids)))
+        start = time.perf_counter()
+        for u in sample:
+            db.session.execute(
+                select(func.count(Date.date_id))
+                .join(Participant, Participant.participant_id == Date.participant_id)
+                .join(Event, Event.event_uuid == Participant.event_uuid)
+                .where(Event.event_uuid == u)
+            ).scalar()
+        timings.append((time.perf_counter() - start) / len(sample))
+
+print(json.dumps({
+    'date_table_kb': sizes['date'] / 1024,
+    'date_indexes_kb': {name: size / 1024 for name, size in sizes.items() if name.startswith(('ix_date', 'sqlite_autoindex_date'))},
+    'date_row_bytes': payload / rows,
+    'join_ms': min(timings) * 1000
+}))
+"""
+
+
+def measure(compact, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        result = subprocess.run(
+            [sys.executable, '-c', MEASURE_SCRIPT, os.path.join(tmp, 'bench.db'),
+             str(args.events), str(args.participants), str(args.days), str(args.repeat)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+            env={**os.environ, 'DB_COMPACT_UUIDS': 'true' if compact else 'false'}
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--participants', type=int, default=20)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    before = measure(False, args)
+    after = measure(True, args)
+
+    print(f'{args.events} events x {args.participants} participants x {args.days} days')
+    print(f'  {"":28} {"VARCHAR(45)":>12} {"BINARY(16)":>12}')
+    print(f'  {"date row payload (bytes)":28} {before["date_row_bytes"]:12.1f} {after["date_row_bytes"]:12.1f}')
+    print(f'  {"date table (KB)":28} {before["date_table_kb"]:12.1f} {after["date_table_kb"]:12.1f}')
+    for name in sorted(before['date_indexes_kb']):
+        print(f'  {name + " (KB)":28} {before["date_indexes_kb"][name]:12.1f} {after["date_indexes_kb"].get(name, 0):12.1f}')
+    print(f'  {"event join (ms per event)":28} {before["join_ms"]:12.3f} {after["join_ms"]:12.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""
+Load test for the REST API.
+
+Seeds synthetic events into SQLite (or --database-url, e.g. a local MySQL container), then drives
+the real Flask endpoints through the test client from --threads concurrent workers, each issuing a
+weighted mix of requests. Reports p50/p95/p99 latency, throughput and SQL queries per request for
+every endpoint, and writes them with the run parameters and git commit to --output as JSON.
+
+Usage: python -m benchmarks.load_test [--events 50] [--participants 20] [--days 30]
+                                      [--threads 8] [--duration 10] [--output load_test.json]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from backend.app import create_app, db
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> (weight, method, url template); templates are filled from a random seeded event
+SCENARIOS = {
+    'get_event': (30, 'GET', '/events/{token}'),
+    'get_availability': (15, 'GET', '/events/{token}/availability'),
+    'list_participants': (20, 'GET', '/events/{token}/participants'),
+    'list_dates': (15, 'GET', '/events/{token}/participants/{participant_id}/dates'),
+    'put_dates': (10, 'PUT', '/events/{token}/participants/{participant_id}/dates'),
+    'join_event': (5, 'POST', '/events/{token}/participants'),
+    'create_event': (5, 'POST', '/events')
+}
+
+
+def seed(event_count, participant_count, day_count, seed=0):
+    """
+    Inserts events with participants, dates and one access token each.
+    Returns (token, participant_ids, min_date, day_count) per event.
+    """
+    from backend.models import Event, Participant, Date, AccessToken, generate_uuid, generate_token
+
+    rng = random.Random(seed)
+    min_date = date(2025, 1, 1)
+    events = []
+    participant_rows, date_rows, token_rows = [], [], []
+    next_participant_id = 1
+    for _ in range(event_count):
+        event_uuid = generate_uuid()
+        token = generate_token()
+        participant_ids = list(range(next_participant_id, next_participant_id + participant_count))
+        next_participant_id += participant_count
+        events.append((token, participant_ids, min_date, day_count))
+        db.session.execute(Event.__table__.insert(), [{
+            'event_uuid': event_uuid, 'event_name': 'load test', 'description': '',
+            'min_date': min_date, 'max_date': min_date + timedelta(days=day_count - 1)
+        }])
+        token_rows.append({'token': token, 'event_uuid': event_uuid, 'account_id': '0'})
+        for i, participant_id in enumerate(participant_ids):
+            participant_rows.append({
+                'participant_id': participant_id, 'event_uuid': event_uuid, 'name': f'Participant {i}',
+                'phone': f'555{participant_id:07d}', 'postal_code': '12345', 'icon_path': 'default.png',
+                'color': '#123456', 'is_driver': rng.random() < 0.2, 'role': 'organizer' if i == 0 else 'participant'
+            })
+            date_rows.extend({
+                'event_uuid': event_uuid, 'participant_id': participant_id, 'date': min_date + timedelta(days=d),
+                'availability_level': rng.choice((0, 0, 1, 2))
+            } for d in range(day_count))
+    db.session.execute(AccessToken.__table__.insert(), token_rows)
+    db.session.execute(Participant.__table__.insert(), participant_rows)
+    db.session.execute(Date.__table__.insert(), date_rows)
+    db.session.commit()
+    return events
+
+
+def request_body(name, rng, min_date, day_count):
+    if name == 'put_dates':
+        return {'dates': [
+            {'date': (min_date + timedelta(days=d)).isoformat(), 'availability_level': rng.choice((0, 1, 2))}
+            for d in range(day_count) if rng.random() < 0.8
+        ]}
+    if name == 'join_event':
+        return {'name': 'Load Tester', 'phone': f'9{rng.getrandbits(40)}', 'postal_code': '12345', 'is_driver': False}
+    if name == 'create_event':
+        return {
+            'event_name': 'load test', 'description': '', 'min_date': min_date.isoformat(),
+            'max_date': (min_date + timedelta(days=day_count - 1)).isoformat()
+        }
+    return None
+
+
+class QueryCounter:
+    """
+    Counts SQL statements per thread, so each worker can attribute queries to its own requests.
+    """
+
+    def __init__(self, engine):
+        self._local = threading.local()
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.count = getattr(self._local, 'count', 0) + 1
+
+    def reset(self):
+        self._local.count = 0
+
+    @property
+    def count(self):
+        return getattr(self._local, 'count', 0)
+
+
+def worker(app, events, counter, deadline, seed):
+    rng = random.Random(seed)
+    names = list(SCENARIOS)
+    weights = [SCENARIOS[name][0] for name in names]
+    samples = []
+    client = app.test_client()
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        _, method, template = SCENARIOS[name]
+        token, participant_ids, min_date, day_count = rng.choice(events)
+        participant_id = rng.choice(participant_ids)
+        url = template.format(token=token, participant_id=participant_id)
+        body = request_body(name, rng, min_date, day_count)
+
+        counter.reset()
+        start = time.perf_counter()
+        response = client.open(url, method=method, json=body)
+        elapsed = time.perf_counter() - start
+        samples.append((name, elapsed, counter.count, response.status_code))
+    return samples
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, duration):
+    by_name = defaultdict(list)
+    for sample in samples:
+        by_name[sample[0]].append(sample)
+    by_name['all'] = samples
+
+    report = {}
+    for name, group in sorted(by_name.items()):
+        latencies = sorted(s[1] * 1000 for s in group)
+        report[name] = {
+            'requests': len(group),
+            'errors': sum(1 for s in group if s[3] >= 500),
+            'throughput_rps': len(group) / duration,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'queries_per_request': sum(s[2] for s in group) / len(group)
+        }
+    return report
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='defaults to a temporary SQLite file')
+    parser.add_argument('--events', type=int, default=50)
+    parser.add_argument('--participants', type=int, default=20)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10, help='seconds')
+    parser.add_argument('--output', default='load_test.json')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f'sqlite:///{os.path.join(tmp, "load_test.db")}'
+        overrides = {'SQLALCHEMY_DATABASE_URI': database_url}
+        if database_url.startswith('sqlite'):
+            overrides['SQLALCHEMY_ENGINE_OPTIONS'] = {'connect_args': {'timeout': 30, 'check_same_thread': False}}
+        app = create_app('testing', config_overrides=overrides)
+        logging.disable(logging.CRITICAL)
+
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            events = seed(args.events, args.participants, args.days)
+            counter = QueryCounter(db.engine)
+
+        deadline = time.perf_counter() + args.duration
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            futures = [pool.submit(worker, app, events, counter, deadline, i) for i in range(args.threads)]
+            samples = [sample for future in futures for sample in future.result()]
+        elapsed = time.perf_counter() - start
+
+    report = summarize(samples, elapsed)
+    result = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'database': database_url.split(':', 1)[0],
+        'parameters': {k: v for k, v in vars(args).items() if k not in ('output', 'database_url')},
+        'endpoints': report
+    }
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2)
+        f.write('\n')
+
+    print(f'{"endpoint":18} {"reqs":>6} {"err":>4} {"rps":>8} {"p50":>8} {"p95":>8} {"p99":>8} {"q/req":>6}')
+    for name, stats in report.items():
+        print(
+            f'{name:18} {stats["requests"]:6d} {stats["errors"]:4d} {stats["throughput_rps"]:8.1f} '
+            f'{stats["p50_ms"]:8.2f} {stats["p95_ms"]:8.2f} {stats["p99_ms"]:8.2f} {stats["queries_per_request"]:6.1f}'
+        )
+    print(f'results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
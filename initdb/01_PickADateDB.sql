@@ -21,7 +21,9 @@ CREATE TABLE IF NOT EXISTS `PickADateDB`.`event` (
   `date_created` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
   `min_date` DATE NOT NULL,
   `max_date` DATE NOT NULL,
-  `is_active` BOOLEAN NOT NULL DEFAULT TRUE
+  `is_active` BOOLEAN NOT NULL DEFAULT TRUE,
+  `version` INT UNSIGNED NOT NULL DEFAULT 0,
+  INDEX `ix_event_max_date` (`max_date`)
 );
 
 -- -----------------------------------------------------
@@ -34,7 +36,7 @@ CREATE TABLE IF NOT EXISTS `PickADateDB`.`access_token` (
   `event_uuid` VARCHAR(45) NOT NULL,
   `account_id` VARCHAR(45) NOT NULL,
   `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP,
-  INDEX `event_uuid_idx` (`event_uuid`),
+  INDEX `ix_access_token_event` (`event_uuid`),
   CONSTRAINT `token_event_fk`
     FOREIGN KEY (`event_uuid`)
     REFERENCES `PickADateDB`.`event` (`event_uuid`)
@@ -60,6 +62,7 @@ CREATE TABLE IF NOT EXISTS `PickADateDB`.`event_address` (
   `postal_code` VARCHAR(20) NOT NULL,
   `latitude` DECIMAL(9,6) NULL,
   `longitude` DECIMAL(9,6) NULL,
+  INDEX `ix_event_address_event` (`event_uuid`),
   CONSTRAINT `event_address_event_uuid`
     FOREIGN KEY (`event_uuid`)
     REFERENCES `PickADateDB`.`event` (`event_uuid`)
@@ -74,7 +77,7 @@ DROP TABLE IF EXISTS `PickADateDB`.`account` ;
 
 CREATE TABLE IF NOT EXISTS `PickADateDB`.`account` (
   `account_id` VARCHAR(45) NOT NULL PRIMARY KEY,
-  `email` VARCHAR(255) NOT NULL UNIQUE,
+  `email` VARCHAR(255) NOT NULL,
   `password_hash` VARCHAR(255) NOT NULL,
   `first_name` VARCHAR(100) NOT NULL,
   `last_name` VARCHAR(100) NOT NULL,
@@ -85,7 +88,7 @@ CREATE TABLE IF NOT EXISTS `PickADateDB`.`account` (
   `is_active` BOOLEAN DEFAULT TRUE,
   `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP,
   `updated_at` DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-  UNIQUE (`email`)
+  CONSTRAINT `uix_email` UNIQUE (`email`)
 );
 
 -- -----------------------------------------------------
@@ -104,7 +107,8 @@ CREATE TABLE IF NOT EXISTS `PickADateDB`.`participant` (
   `color` VARCHAR(45),
   `is_driver` BOOLEAN DEFAULT FALSE,
   `role` ENUM('organizer', 'participant') NOT NULL DEFAULT 'participant',
-  UNIQUE(event_uuid, phone),
+  CONSTRAINT `uix_event_account_phone` UNIQUE (`event_uuid`, `phone`),
+  INDEX `ix_participant_event` (`event_uuid`, `participant_id`),
   FOREIGN KEY (event_uuid) REFERENCES event(event_uuid),
   FOREIGN KEY (account_id) REFERENCES account(account_id)
 );
@@ -120,8 +124,9 @@ CREATE TABLE IF NOT EXISTS `PickADateDB`.`date` (
   `participant_id` INT UNSIGNED NOT NULL,
   `date` DATE NOT NULL,
   `availability_level` INT NOT NULL DEFAULT 0, -- 0: Available, 1: Preferred, 2: Unavailable
-  INDEX `event_uuid_idx` (`event_uuid` ASC) VISIBLE,
-  INDEX `participant_id_idx` (`participant_id` ASC) VISIBLE,
+  INDEX `ix_date_event_day` (`event_uuid`, `date`, `availability_level`),
+  INDEX `ix_date_participant` (`participant_id`, `date_id`),
+  INDEX `ix_date_day` (`date`),
   CONSTRAINT `date_event_uuid`
     FOREIGN KEY (`event_uuid`)
     REFERENCES `PickADateDB`.`event` (`event_uuid`)
@@ -132,12 +137,58 @@ CREATE TABLE IF NOT EXISTS `PickADateDB`.`date` (
     REFERENCES `PickADateDB`.`participant` (`participant_id`)
     ON DELETE CASCADE
     ON UPDATE CASCADE,
-  CONSTRAINT `one_participant_id_per_date`
+  CONSTRAINT `uix_participant_date`
     UNIQUE (`event_uuid`, `participant_id`, `date`),
   CHECK (`availability_level` IN (0, 1, 2)) -- restricts availability level to 0, 1, or 2
 );
 
 
+-- -----------------------------------------------------
+-- Table `PickADateDB`.`event_archive`
+-- -----------------------------------------------------
+DROP TABLE IF EXISTS `PickADateDB`.`event_archive` ;
+
+CREATE TABLE IF NOT EXISTS `PickADateDB`.`event_archive` (
+  `event_uuid` VARCHAR(45) NOT NULL PRIMARY KEY,
+  `max_date` DATE NOT NULL,
+  `archived_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `payload` MEDIUMBLOB NOT NULL -- zlib-compressed JSON of the event's detail and rows
+);
+
+-- -----------------------------------------------------
+-- Table `PickADateDB`.`archived_token`
+-- -----------------------------------------------------
+DROP TABLE IF EXISTS `PickADateDB`.`archived_token` ;
+
+CREATE TABLE IF NOT EXISTS `PickADateDB`.`archived_token` (
+  `token` VARCHAR(64) NOT NULL PRIMARY KEY,
+  `event_uuid` VARCHAR(45) NOT NULL,
+  INDEX `ix_archived_token_event` (`event_uuid`),
+  CONSTRAINT `archived_token_event_fk`
+    FOREIGN KEY (`event_uuid`)
+    REFERENCES `PickADateDB`.`event_archive` (`event_uuid`)
+    ON DELETE CASCADE
+);
+
+-- -----------------------------------------------------
+-- Table `PickADateDB`.`job`
+-- -----------------------------------------------------
+DROP TABLE IF EXISTS `PickADateDB`.`job` ;
+
+CREATE TABLE IF NOT EXISTS `PickADateDB`.`job` (
+  `job_id` INT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+  `kind` VARCHAR(64) NOT NULL,
+  `payload` TEXT NOT NULL, -- JSON keyword arguments for the handler
+  `status` ENUM('queued', 'running', 'done', 'failed') NOT NULL DEFAULT 'queued',
+  `attempts` INT UNSIGNED NOT NULL DEFAULT 0,
+  `max_attempts` INT UNSIGNED NOT NULL,
+  `run_at` DATETIME NOT NULL, -- next due time, or the lease expiry while running
+  `created_at` DATETIME NOT NULL,
+  `finished_at` DATETIME NULL,
+  `last_error` VARCHAR(255) NULL,
+  INDEX `ix_job_due` (`status`, `run_at`)
+);
+
 -- ------------------------------------------------
 -- Triggers
 -- ------------------------------------------------
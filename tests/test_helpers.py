@@ -0,0 +1,31 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from backend.app import db
+
+@contextmanager
+def count_queries():
+    """
+    Collects the SQL statements executed on the default engine while the block runs.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+class FakeClock:
+    """
+    A clock to inject into time-dependent services; tests move time by assigning now.
+    """
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
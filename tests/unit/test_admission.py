@@ -0,0 +1,89 @@
+import pytest
+
+from backend.app import create_app, db
+from backend.services.admission import LocalBucketStore, rate_limiter, concurrency_limiter
+
+from ..test_helpers import FakeClock
+from .test_events import create_event
+from .test_participants import create_participant, participan_payload
+
+@pytest.fixture
+def make_client():
+    contexts = []
+
+    def make(**overrides):
+        app = create_app('testing', config_overrides=overrides)
+        context = app.app_context()
+        context.push()
+        db.create_all()
+        contexts.append(context)
+        return app.test_client()
+
+    yield make
+    for context in contexts:
+        db.drop_all()
+        context.pop()
+
+def test_token_bucket_refills():
+    clock = FakeClock()
+    store = LocalBucketStore(max_keys=2, clock=clock)
+
+    assert store.take('a', 2, 1.0) == (True, 0.0)
+    assert store.take('a', 2, 1.0) == (True, 0.0)
+    allowed, retry_after = store.take('a', 2, 1.0)
+    assert not allowed
+    assert retry_after == pytest.approx(1.0)
+
+    clock.now = 1.0
+    assert store.take('a', 2, 1.0)[0]
+    assert not store.take('a', 2, 1.0)[0]
+
+    # The least recently used bucket is dropped and starts full again
+    store.take('b', 1, 1.0)
+    store.take('c', 1, 1.0)
+    assert store.take('a', 2, 1.0)[0]
+
+def test_event_creation_is_rate_limited_per_ip(make_client):
+    client = make_client(RATE_LIMIT_ENABLED=True, RATE_LIMITS={'event_create:ip': (2, 60)})
+
+    assert create_event(client).status_code == 201
+    assert create_event(client).status_code == 201
+    response = create_event(client)
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) == 30
+
+    # Another client address has its own bucket
+    response = client.post('/events', json={}, environ_base={'REMOTE_ADDR': '10.0.0.2'})
+    assert response.status_code != 429
+    assert rate_limiter.stats() == {'rejected_event_create_ip': 1}
+
+def test_participant_join_is_rate_limited_per_token(make_client):
+    client = make_client(RATE_LIMIT_ENABLED=True, RATE_LIMITS={'participant_join:token': (1, 60)})
+    token = create_event(client).get_json()['data']['token']
+    other_token = create_event(client).get_json()['data']['token']
+
+    assert create_participant(client, token=token).status_code == 201
+    response = create_participant(client, payload={**participan_payload, 'phone': '5550001111'}, token=token)
+    assert response.status_code == 429
+    assert create_participant(client, token=other_token).status_code == 201
+
+def test_concurrency_limit_sheds_load(make_client):
+    client = make_client(MAX_CONCURRENT_REQUESTS=1, ADMISSION_TIMEOUT=0.01)
+    token = create_event(client).get_json()['data']['token']
+
+    # Hold the only slot, as a long-running request would
+    concurrency_limiter._slots.acquire()
+    try:
+        response = client.get(f'/events/{token}')
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+        # Exempt endpoints are still served
+        assert client.get('/metrics').status_code == 200
+    finally:
+        concurrency_limiter._slots.release()
+
+    assert client.get(f'/events/{token}').status_code == 200
+    stats = concurrency_limiter.stats()
+    assert stats['shed'] == 1
+    assert stats['in_flight'] == 0
+    assert 'pickadate_admission_shed 1' in client.get('/metrics').get_data(as_text=True)
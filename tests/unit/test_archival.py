@@ -0,0 +1,64 @@
+from datetime import date
+
+from sqlalchemy import select, func
+
+from backend.app import db
+from backend.models import Event, Participant, Date, AccessToken, EventArchive, ArchivedToken
+from backend.services.archival import archive_expired_events
+
+from .test_events import create_event, event_payload
+from .test_participants import create_participant
+from .test_dates import create_date
+
+def create_event_ending(client, max_date):
+    return create_event(client, payload={**event_payload, 'min_date': '2025-01-01', 'max_date': max_date}).get_json()['data']['token']
+
+def archive(batch_size=100):
+    return archive_expired_events(after_days=180, inactive_after_days=30, batch_size=batch_size, today=date(2026, 1, 1))
+
+def event_uuid_of(token):
+    return db.session.execute(select(AccessToken.event_uuid).where(AccessToken.token == token)).scalar()
+
+def test_archive_moves_expired_events(client):
+    expired = create_event_ending(client, '2025-01-31')
+    participant_id = create_participant(client, token=expired).get_json()['data']['participant_id']
+    create_date(client, expired, participant_id)
+    current = create_event_ending(client, '2025-12-31')
+    expired_uuid = event_uuid_of(expired)
+    expected = client.get(f'/events/{expired}').get_json()
+
+    # Batches of one: the first archives the expired event, the second finds nothing left
+    assert archive(batch_size=1) == 1
+
+    for model in (Event, Participant, Date, AccessToken):
+        assert db.session.execute(select(func.count()).select_from(model).where(model.event_uuid == expired_uuid)).scalar() == 0
+    rows = EventArchive.decode(db.session.get(EventArchive, expired_uuid).payload)['rows']
+    assert [len(rows[name]) for name in ('event', 'participant', 'date', 'access_token', 'event_address')] == [1, 1, 1, 1, 1]
+    assert ArchivedToken.get_event_uuid(expired) == expired_uuid
+
+    # The archived event is still served read-through by its token
+    response = client.get(f'/events/{expired}')
+    assert response.status_code == 200
+    assert response.get_json()['data'] == expected['data']
+    assert client.get(f'/events/{expired}/participants').status_code == 410
+    assert client.get('/events/unknown-token').status_code == 401
+
+    assert client.get(f'/events/{current}').status_code == 200
+    assert archive() == 0
+
+def test_archive_deactivated_events_sooner(client):
+    inactive = create_event_ending(client, '2025-11-01')
+    active = create_event_ending(client, '2025-11-01')
+    Event.deactivate(event_uuid_of(inactive))
+
+    assert archive() == 1
+    assert ArchivedToken.get_event_uuid(inactive) is not None
+    assert ArchivedToken.get_event_uuid(active) is None
+
+def test_archive_events_command(client):
+    token = create_event(client).get_json()['data']['token']
+
+    result = client.application.test_cli_runner().invoke(args=['archive-events', '--max-batches', '1'])
+
+    assert result.output == 'Archived 1 events\n'
+    assert ArchivedToken.get_event_uuid(token) is not None
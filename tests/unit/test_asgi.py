@@ -0,0 +1,160 @@
+import asyncio
+import json
+
+import pytest
+
+from backend.app import db
+from backend.asgi import async_database_uri, create_asgi_app
+from backend.services.archival import archive_expired_events
+from backend.services.event_stream import event_hub
+from backend.services.response_cache import event_detail_cache
+
+from .test_events import create_event
+from .test_participants import create_participant
+from .test_dates import create_date
+
+@pytest.fixture
+def asgi_app(tmp_path):
+    # SQLite in memory would give the async engine its own empty database, so both share a file
+    app = create_asgi_app('testing', config_overrides={'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path}/asgi.db'})
+    with app.flask_app.app_context():
+        db.create_all()
+    yield app
+    with app.flask_app.app_context():
+        db.drop_all()
+
+async def call(app, path, headers=(), query=b''):
+    """
+    Sends one GET request to the ASGI app and returns (status, headers, body).
+    """
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'root_path': '', 'query_string': query,
+        'headers': [(name.encode(), value.encode()) for name, value in headers],
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 1234)
+    }
+    await app(scope, receive, send)
+    start = messages[0]
+    return start['status'], {k.decode(): v.decode() for k, v in start['headers']}, b''.join(m.get('body', b'') for m in messages[1:])
+
+def get(app, path, headers=(), query=b''):
+    return asyncio.run(call(app, path, headers, query))
+
+def test_async_driver_for_each_database():
+    assert async_database_uri('mysql+pymysql://u:p@db:3306/PickADateDB') == 'mysql+aiomysql://u:p@db:3306/PickADateDB'
+    assert async_database_uri('sqlite:///app.db') == 'sqlite+aiosqlite:///app.db'
+    assert async_database_uri('mysql+asyncmy://u:p@db/PickADateDB') == 'mysql+asyncmy://u:p@db/PickADateDB'
+    with pytest.raises(ValueError):
+        async_database_uri('postgresql://db/PickADateDB')
+
+def test_async_reads_match_flask(asgi_app):
+    client = asgi_app.flask_app.test_client()
+    token = create_event(client).get_json()['data']['token']
+    participant_id = create_participant(client, token=token).get_json()['data']['participant_id']
+    create_date(client, token, participant_id)
+
+    for path, query in (
+        (f'/events/{token}', b''),
+        (f'/events/{token}/availability', b''),
+        (f'/events/{token}/participants', b'limit=1&fields=name')
+    ):
+        expected = client.get(path, query_string=query.decode())
+        status, headers, body = get(asgi_app, path, query=query)
+        assert status == expected.status_code == 200
+        assert json.loads(body) == expected.get_json()
+        assert headers['etag'] == expected.headers['ETag']
+
+        status, _, body = get(asgi_app, path, headers=[('If-None-Match', expected.headers['ETag'])])
+        assert status == 304
+        assert body == b''
+
+def test_async_event_detail_is_cached(asgi_app):
+    client = asgi_app.flask_app.test_client()
+    token = create_event(client).get_json()['data']['token']
+
+    async def concurrent_reads():
+        return await asyncio.gather(*(call(asgi_app, f'/events/{token}') for _ in range(5)))
+
+    responses = asyncio.run(concurrent_reads())
+    assert {body for _, _, body in responses} == {responses[0][2]}
+    assert event_detail_cache.stats()['builds'] == 1
+
+    # The Flask path serves the same cached bytes
+    assert client.get(f'/events/{token}').get_data() == responses[0][2]
+    assert event_detail_cache.stats()['builds'] == 1
+
+    create_participant(client, token=token)
+    status, _, body = get(asgi_app, f'/events/{token}')
+    assert status == 200
+    assert json.loads(body)['data']['participants_count'] == 1
+    assert event_detail_cache.stats()['builds'] == 2
+
+def test_async_errors_and_fallback(asgi_app):
+    status, _, body = get(asgi_app, '/events/not-a-token')
+    assert status == 401
+    assert json.loads(body)['message'] == 'Invalid token'
+
+    token = create_event(asgi_app.flask_app.test_client()).get_json()['data']['token']
+    status, _, _ = get(asgi_app, f'/events/{token}/participants', query=b'limit=0')
+    assert status == 400
+
+    # Endpoints without an async handler are served by the Flask app
+    status, _, body = get(asgi_app, f'/events/{token}/best-dates')
+    assert status == 200
+    assert json.loads(body)['status'] == 'success'
+
+    # Events stored before a lower cap are refused rather than summarized day by day
+    asgi_app.config['EVENT_MAX_DAYS'] = 30
+    status, headers, _ = get(asgi_app, f'/events/{token}/availability')
+    assert (status, 'etag' in headers) == (422, False)
+
+def test_async_stream_delivers_writes(asgi_app):
+    client = asgi_app.flask_app.test_client()
+    token = create_event(client).get_json()['data']['token']
+
+    async def stream():
+        sent = asyncio.Queue()
+        disconnect = asyncio.Event()
+
+        async def receive():
+            await disconnect.wait()
+            return {'type': 'http.disconnect'}
+
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': f'/events/{token}/stream', 'query_string': b'', 'headers': []
+        }
+        task = asyncio.ensure_future(asgi_app(scope, receive, sent.put))
+        assert (await sent.get())['status'] == 200
+        assert (await sent.get())['body'] == b': connected\n\n'
+
+        # The write runs in a worker thread, as it would through the WSGI fallback
+        await asyncio.to_thread(create_participant, client, None, token)
+        frame = (await asyncio.wait_for(sent.get(), 5))['body'].decode()
+
+        disconnect.set()
+        await asyncio.wait_for(task, 5)
+        return frame
+
+    frame = asyncio.run(stream())
+    assert frame.startswith('event: participant_joined\n')
+    assert event_hub.stats()['subscribers'] == 0
+
+def test_async_read_through_archive(asgi_app):
+    client = asgi_app.flask_app.test_client()
+    token = create_event(client).get_json()['data']['token']
+    with asgi_app.flask_app.app_context():
+        archive_expired_events(after_days=0, inactive_after_days=0)
+    expected = client.get(f'/events/{token}')
+
+    status, _, body = get(asgi_app, f'/events/{token}')
+    assert status == expected.status_code == 200
+    assert json.loads(body) == expected.get_json()
+    assert get(asgi_app, f'/events/{token}/availability')[0] == 410
@@ -0,0 +1,45 @@
+from .test_events import create_event, event_payload
+from .test_participants import create_participant
+from .test_dates import create_date
+
+def get_availability(client, token):
+    response = client.get(f'/events/{token}/availability')
+    return response
+
+def test_get_availability(client):
+    token = create_event(client).get_json()['data']['token']
+
+    first = create_participant(client, token=token).get_json()['data']['participant_id']
+    second = create_participant(client, payload={
+        "name": "Jane Doe",
+        "phone": "0987654321",
+        "postal_code": "12345",
+        "is_driver": True
+    }, token=token).get_json()['data']['participant_id']
+
+    create_date(client, token, first, {"date": "2025-05-10", "availability_level": 0})
+    create_date(client, token, second, {"date": "2025-05-10", "availability_level": 1})
+    create_date(client, token, second, {"date": "2025-05-11", "availability_level": 2})
+
+    response = get_availability(client, token)
+
+    assert response.status_code == 200
+
+    response_json = response.get_json()
+
+    assert response_json['status'] == 'success'
+    days = response_json['data']['days']
+    assert len(days) == 31
+    assert days[0]['date'] == event_payload['min_date']
+    assert days[-1]['date'] == event_payload['max_date']
+
+    by_date = {day['date']: day for day in days}
+    assert by_date['2025-05-10'] == {'date': '2025-05-10', 'available': 1, 'tentative': 1, 'unavailable': 0}
+    assert by_date['2025-05-11'] == {'date': '2025-05-11', 'available': 0, 'tentative': 0, 'unavailable': 1}
+    assert by_date['2025-05-12'] == {'date': '2025-05-12', 'available': 0, 'tentative': 0, 'unavailable': 0}
+
+def test_availability_span_is_capped(client):
+    token = create_event(client).get_json()['data']['token']
+    # Events stored before a lower cap are refused rather than summarized day by day
+    client.application.config['EVENT_MAX_DAYS'] = 30
+    assert get_availability(client, token).status_code == 422
@@ -0,0 +1,113 @@
+from datetime import date
+
+from backend.app import db
+from backend.models import Event, AccessToken
+from backend.services.date_ranking import AvailabilityMatrix, rank_days, find_windows
+
+from .test_events import create_event, event_payload
+from .test_participants import create_participant
+from .test_dates import create_date
+
+participants = [
+    (1, 'organizer', False),
+    (2, 'participant', True),
+    (3, 'participant', False)
+]
+
+date_rows = [
+    (1, date(2025, 5, 1), 0),
+    (2, date(2025, 5, 1), 0),
+    (3, date(2025, 5, 1), 0),
+    (1, date(2025, 5, 2), 2),
+    (2, date(2025, 5, 2), 0),
+    (3, date(2025, 5, 2), 0),
+    (1, date(2025, 5, 3), 1),
+    (3, date(2025, 5, 3), 0)
+]
+
+def build_matrix():
+    return AvailabilityMatrix.from_rows(date(2025, 5, 1), date(2025, 5, 3), participants, date_rows)
+
+def test_rank_days():
+    days = rank_days(build_matrix(), top_k=3)
+
+    # 2025-05-02 is dropped because the organizer is unavailable
+    assert [d['date'] for d in days] == [date(2025, 5, 1), date(2025, 5, 3)]
+    assert days[0]['score'] == 3.0
+    assert days[1]['score'] == 1.5
+    assert days[1]['no_response'] == 1
+
+def test_rank_days_constraints():
+    matrix = build_matrix()
+
+    days = rank_days(matrix, require_organizers=False, weights={'unavailable': -1.0})
+    assert [d['date'] for d in days] == [date(2025, 5, 1), date(2025, 5, 3), date(2025, 5, 2)]
+
+    days = rank_days(matrix, min_drivers=1)
+    assert [d['date'] for d in days] == [date(2025, 5, 1)]
+
+def test_find_windows():
+    windows = find_windows(build_matrix(), window_length=2)
+
+    assert [(w['start_date'], w['attendance'], w['score']) for w in windows] == [
+        (date(2025, 5, 1), 2, 5.0),
+        (date(2025, 5, 2), 1, 3.5)
+    ]
+    assert windows[0]['end_date'] == date(2025, 5, 2)
+
+    assert len(find_windows(build_matrix(), window_length=2, min_attendance=2)) == 1
+    assert find_windows(build_matrix(), window_length=4) == []
+
+def test_get_best_dates(client):
+    token = create_event(client).get_json()['data']['token']
+    participant_id = create_participant(client, token=token).get_json()['data']['participant_id']
+
+    create_date(client, token, participant_id, {"date": "2025-05-10", "availability_level": 1})
+    create_date(client, token, participant_id, {"date": "2025-05-11", "availability_level": 0})
+
+    response = client.get(f'/events/{token}/best-dates?top_k=2')
+
+    assert response.status_code == 200
+
+    response_json = response.get_json()
+
+    assert response_json['status'] == 'success'
+    assert [d['date'] for d in response_json['data']['dates']] == ['2025-05-11', '2025-05-10']
+
+    for query in ('top_k=0', 'top_k=-1', 'top_k=101', 'min_drivers=-1', 'available_weight=nan', 'tentative_weight=inf'):
+        assert client.get(f'/events/{token}/best-dates?{query}').status_code == 400, query
+
+def test_get_windows(client):
+    token = create_event(client).get_json()['data']['token']
+    participant_id = create_participant(client, token=token).get_json()['data']['participant_id']
+
+    for day in ("2025-05-10", "2025-05-11", "2025-05-12"):
+        create_date(client, token, participant_id, {"date": day, "availability_level": 0})
+
+    response = client.get(f'/events/{token}/windows?window_length=3&min_attendance=1')
+
+    assert response.status_code == 200
+
+    response_json = response.get_json()
+
+    assert response_json['status'] == 'success'
+    assert response_json['data']['windows'] == [
+        {'start_date': '2025-05-10', 'end_date': '2025-05-12', 'attendance': 1, 'score': 3.0}
+    ]
+
+    response = client.get(f'/events/{token}/windows')
+    assert response.status_code == 400
+
+    for query in ('top_k=0', 'top_k=-2', 'top_k=101', 'min_attendance=-1'):
+        assert client.get(f'/events/{token}/windows?window_length=2&{query}').status_code == 400, query
+
+def test_event_span_is_capped(client):
+    response = create_event(client, payload={**event_payload, 'min_date': '0001-01-01', 'max_date': '9999-12-31'})
+    assert response.status_code == 400
+
+    # Events stored before the cap are refused rather than ranked
+    token = create_event(client).get_json()['data']['token']
+    Event.apply_update(AccessToken.get_by_token(token).event_uuid, {'min_date': date(1, 1, 1)})
+    db.session.commit()
+    assert client.get(f'/events/{token}/best-dates').status_code == 422
+    assert client.get(f'/events/{token}/windows?window_length=2').status_code == 422
@@ -1,6 +1,187 @@
 import json
-from .test_events import test_create_event
-from .test_participants import test_create_participant
+import threading
+
+from backend.app import create_app, db
+from .test_events import test_create_event, create_event
+from .test_participants import test_create_participant, create_participant
+
+date_payload = {
+    "date": "2025-05-10",
+    "availability_level": 0
+}
+
+def create_date(client, token, participant_id, payload=None):
+    if payload is None:
+        payload = date_payload
+
+    response = client.post(f'/events/{token}/participants/{participant_id}/dates', data=json.dumps(payload), content_type='application/json')
+    return response
+
+def test_create_date(client):
+    token = create_event(client).get_json()['data']['token']
+    participant_id = create_participant(client, token=token).get_json()['data']['participant_id']
+
+    response = create_date(client, token, participant_id)
+
+    assert response.status_code == 201
+
+    response_json = response.get_json()
+
+    assert response_json['status'] == 'success'
+    assert response_json['data']['participant_id'] == participant_id
+    assert response_json['data']['date'] == date_payload['date']
+    assert response_json['data']['availability_level'] == date_payload['availability_level']
+
+def bulk_create_dates(client, token, participant_id, items):
+    response = client.post(f'/events/{token}/participants/{participant_id}/dates/bulk', data=json.dumps({'dates': items}), content_type='application/json')
+    return response
+
+def test_bulk_create_dates(client):
+    token = create_event(client).get_json()['data']['token']
+    participant_id = create_participant(client, token=token).get_json()['data']['participant_id']
+    create_date(client, token, participant_id, {"date": "2025-05-10", "availability_level": 2})
+
+    response = bulk_create_dates(client, token, participant_id, [
+        {"date": "2025-05-10", "availability_level": 0},
+        {"date": "2025-05-11", "availability_level": 1},
+        {"date": "not a date", "availability_level": 0},
+        {"date": "2025-05-12", "availability_level": 7}
+    ])
+
+    assert response.status_code == 200
+
+    results = response.get_json()['data']
+    assert [r['status'] for r in results] == ['success', 'success', 'error', 'error']
+    assert all(r['date_id'] for r in results[:2])
+
+    dates = client.get(f'/events/{token}/participants/{participant_id}/dates').get_json()['data']
+    assert sorted((d['date'], d['availability_level']) for d in dates) == [('2025-05-10', 0), ('2025-05-11', 1)]
+
+    # Replaying the same request leaves the rows unchanged
+    response = bulk_create_dates(client, token, participant_id, [{"date": "2025-05-11", "availability_level": 1}])
+    assert response.get_json()['data'][0]['date_id'] == results[1]['date_id']
+    assert len(client.get(f'/events/{token}/participants/{participant_id}/dates').get_json()['data']) == 2
+
+def test_bulk_create_dates_validates_participant(client):
+    token = create_event(client).get_json()['data']['token']
+    participant_id = create_participant(client, token=token).get_json()['data']['participant_id']
+    other_token = create_event(client).get_json()['data']['token']
+    items = [{"date": "2025-05-10", "availability_level": 0}]
+
+    response = bulk_create_dates(client, token, participant_id, [{"date": "2025-05-10", "availability_level": True}])
+    assert response.status_code == 400
+    assert response.get_json()['data'][0]['status'] == 'error'
+
+    assert bulk_create_dates(client, token, 'abc', items).status_code == 400
+    # A participant of another event cannot be written through this token
+    assert bulk_create_dates(client, other_token, participant_id, items).status_code == 404
+    assert client.get(f'/events/{token}/participants/{participant_id}/dates').get_json()['data'] == []
+
+def sync_dates(client, token, participant_id, items):
+    response = client.put(f'/events/{token}/participants/{participant_id}/dates', data=json.dumps({'dates': items}), content_type='application/json')
+    return response
+
+def test_sync_dates(client):
+    token = create_event(client).get_json()['data']['token']
+    participant_id = create_participant(client, token=token).get_json()['data']['participant_id']
+    bulk_create_dates(client, token, participant_id, [
+        {"date": "2025-05-10", "availability_level": 0},
+        {"date": "2025-05-11", "availability_level": 0},
+        {"date": "2025-05-12", "availability_level": 0}
+    ])
+
+    response = sync_dates(client, token, participant_id, [
+        {"date": "2025-05-10", "availability_level": 0},
+        {"date": "2025-05-11", "availability_level": 2},
+        {"date": "2025-05-13", "availability_level": 1}
+    ])
+
+    assert response.status_code == 200
+
+    data = response.get_json()['data']
+    assert (data['created'], data['updated'], data['deleted']) == (1, 1, 1)
+
+    dates = client.get(f'/events/{token}/participants/{participant_id}/dates').get_json()['data']
+    assert sorted((d['date'], d['availability_level']) for d in dates) == [
+        ('2025-05-10', 0), ('2025-05-11', 2), ('2025-05-13', 1)
+    ]
+
+    response = sync_dates(client, token, participant_id, [{"date": "2025-05-10", "availability_level": 9}])
+    assert response.status_code == 400
+    response = sync_dates(client, token, participant_id, [{"date": "2025-05-10", "availability_level": False}])
+    assert response.status_code == 400
+    assert sync_dates(client, token, 'abc', []).status_code == 400
+
+    # A participant of another event cannot be written through this token
+    other_token = create_event(client).get_json()['data']['token']
+    assert sync_dates(client, other_token, participant_id, []).status_code == 404
+    assert len(client.get(f'/events/{token}/participants/{participant_id}/dates').get_json()['data']) == 3
+
+def test_concurrent_syncs_never_fail(tmp_path):
+    # Threads need their own connections, which SQLite in memory cannot give them
+    app = create_app('testing', config_overrides={'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path}/sync.db'})
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    token = create_event(client).get_json()['data']['token']
+    participant_id = create_participant(client, token=token).get_json()['data']['participant_id']
+
+    payloads = [
+        [{"date": f"2025-05-{day}", "availability_level": (thread + day) % 3} for day in range(10, 10 + thread + 1)]
+        for thread in range(6)
+    ]
+    statuses = []
+
+    def sync(items):
+        for _ in range(5):
+            statuses.append(sync_dates(app.test_client(), token, participant_id, items).status_code)
+
+    threads = [threading.Thread(target=sync, args=(items,)) for items in payloads]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Losing a race is reported as a conflict to retry, never as a server error
+    assert set(statuses) <= {200, 409}
+    assert 200 in statuses
+    # SQLite ignores FOR UPDATE, so syncs may interleave here; only their rows must stay intact
+    dates = client.get(f'/events/{token}/participants/{participant_id}/dates').get_json()['data']
+    assert len({d['date'] for d in dates}) == len(dates)
+    written = {(item['date'], item['availability_level']) for items in payloads for item in items}
+    assert {(d['date'], d['availability_level']) for d in dates} <= written
+    with app.app_context():
+        db.drop_all()
+
+def test_get_dates_conditional(client):
+    token = create_event(client).get_json()['data']['token']
+    participant_id = create_participant(client, token=token).get_json()['data']['participant_id']
+
+    etag = client.get(f'/events/{token}/participants/{participant_id}/dates').headers['ETag']
+    response = client.get(f'/events/{token}/participants/{participant_id}/dates', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+    bulk_create_dates(client, token, participant_id, [{"date": "2025-05-10", "availability_level": 0}])
+
+    response = client.get(f'/events/{token}/participants/{participant_id}/dates', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert len(response.get_json()['data']) == 1
+
+def test_get_dates_paginated(client):
+    token = create_event(client).get_json()['data']['token']
+    participant_id = create_participant(client, token=token).get_json()['data']['participant_id']
+    for day in range(10, 15):
+        create_date(client, token, participant_id, {"date": f"2025-05-{day}", "availability_level": 0})
+
+    response = client.get(f'/events/{token}/participants/{participant_id}/dates?limit=3&fields=date')
+    assert response.headers['ETag']
+    first = response.get_json()['data']
+    assert [set(d) for d in first] == [{'date_id', 'date'}] * 3
+
+    response = client.get(f'/events/{token}/participants/{participant_id}/dates?limit=3&cursor={response.headers["X-Next-Cursor"]}')
+    second = response.get_json()['data']
+    assert 'X-Next-Cursor' not in response.headers
+    assert [d['date'] for d in first + second] == [f"2025-05-{day}" for day in range(10, 15)]
 
 # def test_create_date(client):
     
@@ -64,4 +245,4 @@ from .test_participants import test_create_participant
 
 #     assert response.status_code == 200
 
-#     assert response.get_json()['status'] == 'success'
\ No newline at end of file
+#     assert response.get_json()['status'] == 'success'
@@ -0,0 +1,65 @@
+import json
+
+from backend.services.event_stream import EventHub
+
+from .test_events import create_event
+from .test_participants import create_participant
+from .test_dates import create_date
+
+def read_frame(chunks):
+    """
+    Returns the next (event, data) frame from an SSE response, skipping comment lines.
+    """
+    while True:
+        frame = next(chunks).decode()
+        if not frame.startswith(':'):
+            kind, data = frame.strip().split('\n')
+            return kind[len('event: '):], json.loads(data[len('data: '):])
+
+def test_event_hub_fan_out_and_overflow():
+    hub = EventHub(queue_size=2)
+    first = hub.subscribe('event-a')
+    second = hub.subscribe('event-a')
+    other = hub.subscribe('event-b')
+
+    hub.publish('event-a', 'participant_joined', {'participant_id': 1})
+
+    assert first.get(timeout=0) == second.get(timeout=0)
+    assert other.get(timeout=0) is None
+
+    for i in range(3):
+        hub.publish('event-a', 'date_added', {'date_id': i})
+    assert first.overflowed
+
+    first.close()
+    second.close()
+    other.close()
+    assert hub.stats()['subscribers'] == 0
+
+def test_stream_pushes_committed_changes(client):
+    token = create_event(client).get_json()['data']['token']
+
+    response = client.get(f'/events/{token}/stream')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    chunks = response.iter_encoded()
+    assert next(chunks).decode().startswith(':')
+
+    participant_id = create_participant(client, token=token).get_json()['data']['participant_id']
+    kind, data = read_frame(chunks)
+    assert kind == 'participant_joined'
+    assert data['participant_id'] == participant_id
+
+    date_id = create_date(client, token, participant_id).get_json()['data']['date_id']
+    kind, data = read_frame(chunks)
+    assert kind == 'date_added'
+    assert data['date_id'] == date_id
+
+    client.delete(f'/events/{token}/participants/{participant_id}/dates/{date_id}')
+    assert read_frame(chunks) == ('date_removed', {'date_id': date_id, 'participant_id': participant_id})
+
+    response.close()
+
+def test_stream_requires_token(client):
+    response = client.get('/events/not-a-token/stream')
+    assert response.status_code == 401
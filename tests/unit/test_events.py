@@ -1,5 +1,7 @@
 import json
 
+from ..test_helpers import count_queries
+
 event_payload = {
     "event_name": "test event",
     "description": "This is a test event",
@@ -60,4 +62,102 @@ def test_get_event_by_token(client):
 
     assert response_json['status'] == 'success'
     assert response_json['data']['event_name'] == event_payload['event_name']
-    assert response_json['data']['description'] == event_payload['description']
\ No newline at end of file
+    assert response_json['data']['description'] == event_payload['description']
+
+def test_get_event_query_count_is_constant(client):
+    token = create_event(client).get_json()['data']['token']
+    get_event_by_token(client, token)
+
+    query_counts = []
+    for i in range(3):
+        client.post(f'/events/{token}/participants', data=json.dumps({
+            "name": f"Participant {i}",
+            "phone": f"555000{i}",
+            "postal_code": "12345",
+            "is_driver": False
+        }), content_type='application/json')
+
+        with count_queries() as statements:
+            response = get_event_by_token(client, token)
+        query_counts.append(len(statements))
+
+    assert response.get_json()['data']['participants_count'] == 3
+    assert response.get_json()['data']['addresses_count'] == 1
+    assert query_counts == [4, 4, 4]
+
+def test_get_event_conditional(client):
+    token = create_event(client).get_json()['data']['token']
+
+    response = get_event_by_token(client, token)
+    etag = response.headers['ETag']
+    assert etag
+
+    response = client.get(f'/events/{token}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+
+    client.post(f'/events/{token}/participants', data=json.dumps({
+        "name": "Jane Doe",
+        "phone": "0987654321",
+        "postal_code": "12345",
+        "is_driver": False
+    }), content_type='application/json')
+
+    response = client.get(f'/events/{token}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+def test_patch_event_is_one_update(client):
+    token = create_event(client).get_json()['data']['token']
+    etag = get_event_by_token(client, token).headers['ETag']
+
+    with count_queries() as statements:
+        response = client.patch(f'/events/{token}', data=json.dumps({
+            "event_name": "renamed",
+            "description": None,
+            "max_date": "2025-06-30"
+        }), content_type='application/json')
+
+    assert response.status_code == 200
+    assert response.get_json()['data'] == {"event_name": "renamed", "description": None, "max_date": "2025-06-30"}
+    # The event is never loaded, and the token lookup is cached
+    assert len(statements) == 1
+    assert statements[0].startswith('UPDATE event SET')
+
+    response = get_event_by_token(client, token)
+    assert response.headers['ETag'] != etag
+    assert response.get_json()['data']['event_name'] == 'renamed'
+    assert response.get_json()['data']['description'] is None
+    assert response.get_json()['data']['max_date'] == '2025-06-30'
+
+def test_patch_event_validation(client):
+    token = create_event(client).get_json()['data']['token']
+
+    def patch(payload):
+        return client.patch(f'/events/{token}', data=json.dumps(payload), content_type='application/json')
+
+    assert patch({}).status_code == 400
+    assert patch({"is_active": False}).status_code == 400
+    assert patch({"event_name": ""}).status_code == 400
+    assert patch({"min_date": "not a date"}).status_code == 400
+    assert patch({"min_date": "2025-06-02", "max_date": "2025-06-01"}).status_code == 400
+    # Checked against the stored max_date of 2025-05-31
+    assert patch({"min_date": "2025-06-01"}).status_code == 400
+    assert patch({"min_date": "2025-05-31"}).status_code == 200
+    assert get_event_by_token(client, token).get_json()['data']['min_date'] == '2025-05-31'
+
+def test_patch_event_span_is_capped(client):
+    client.application.config['EVENT_MAX_DAYS'] = 31
+    token = create_event(client).get_json()['data']['token']
+
+    def patch(payload):
+        return client.patch(f'/events/{token}', data=json.dumps(payload), content_type='application/json')
+
+    assert patch({"min_date": "2025-05-01", "max_date": "2025-06-01"}).status_code == 400
+    # Checked against the stored bounds of 2025-05-01..2025-05-31
+    assert patch({"max_date": "2025-06-01"}).status_code == 400
+    assert patch({"min_date": "2025-04-30"}).status_code == 400
+    assert patch({"min_date": "2025-05-02"}).status_code == 200
+    assert patch({"max_date": "2025-06-01"}).status_code == 200
+    data = get_event_by_token(client, token).get_json()['data']
+    assert (data['min_date'], data['max_date']) == ('2025-05-02', '2025-06-01')
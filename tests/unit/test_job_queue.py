@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from backend.app import db
+from backend.models import Job
+from backend.services.job_queue import job_queue
+from backend import tasks
+
+from ..test_helpers import FakeClock
+from .test_events import create_event, event_payload
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock(datetime(2025, 5, 1, 12, 0))
+    monkeypatch.setattr(job_queue, '_clock', clock)
+    return clock
+
+def jobs():
+    return db.session.execute(select(Job).order_by(Job.job_id)).scalars().all()
+
+def test_enqueued_jobs_run_after_commit(client, clock, monkeypatch):
+    calls = []
+    monkeypatch.setitem(job_queue._handlers, 'record', lambda value: calls.append(value))
+
+    job_queue.enqueue('record', value=1)
+    # Not committed yet, so not visible to workers
+    db.session.rollback()
+    assert job_queue.run_pending() == 0
+
+    job_queue.enqueue('record', value=2)
+    db.session.commit()
+    assert job_queue.run_pending() == 1
+    assert calls == [2]
+    assert [(job.status, job.attempts) for job in jobs()] == [('done', 1)]
+
+def test_failed_jobs_retry_with_backoff(client, clock, monkeypatch):
+    outcomes = [RuntimeError('down'), RuntimeError('still down'), None]
+
+    def flaky():
+        outcome = outcomes.pop(0)
+        if outcome is not None:
+            raise outcome
+
+    monkeypatch.setitem(job_queue._handlers, 'flaky', flaky)
+    job_queue.enqueue('flaky')
+    db.session.commit()
+
+    assert job_queue.run_pending() == 1
+    job = jobs()[0]
+    assert (job.status, job.last_error) == ('queued', 'RuntimeError: down')
+    assert job.run_at == clock.now + timedelta(seconds=2)
+
+    # Not due until the backoff has passed, which doubles after each failure
+    assert job_queue.run_pending() == 0
+    clock.now += timedelta(seconds=2)
+    assert job_queue.run_pending() == 1
+    db.session.expire_all()
+    assert jobs()[0].run_at == clock.now + timedelta(seconds=4)
+
+    clock.now += timedelta(seconds=4)
+    assert job_queue.run_pending() == 1
+    db.session.expire_all()
+    assert [(job.status, job.attempts) for job in jobs()] == [('done', 3)]
+    assert job_queue.backoff(20) == 300
+
+def test_jobs_fail_after_max_attempts(client, clock, monkeypatch):
+    def broken():
+        raise ValueError('bad payload')
+
+    monkeypatch.setitem(job_queue._handlers, 'broken', broken)
+    job_queue.enqueue('broken', max_attempts=2)
+    job_queue.enqueue('unknown')
+    db.session.commit()
+
+    job_queue.run_pending()
+    clock.now += timedelta(seconds=2)
+    job_queue.run_pending()
+    db.session.expire_all()
+    assert [(job.kind, job.status, job.attempts) for job in jobs()] == [
+        ('broken', 'failed', 2),
+        ('unknown', 'queued', 2)
+    ]
+
+    stats = job_queue.stats()
+    assert (stats['processed'], stats['succeeded'], stats['retried'], stats['failed']) == (4, 0, 3, 1)
+    assert (stats['queued'], stats['running']) == (1, 0)
+    assert 'pickadate_jobs_failed 1' in client.get('/metrics').get_data(as_text=True)
+
+def test_expired_lease_is_retried(client, clock, monkeypatch):
+    monkeypatch.setitem(job_queue._handlers, 'noop', lambda: None)
+    job_queue.enqueue('noop')
+    db.session.commit()
+
+    # A worker claimed the job and died before finishing it
+    assert Job.claim(clock.now, clock.now + timedelta(seconds=300)) is not None
+    assert job_queue.run_pending() == 0
+    clock.now += timedelta(seconds=300)
+    assert job_queue.run_pending() == 1
+    db.session.expire_all()
+    assert [(job.status, job.attempts) for job in jobs()] == [('done', 2)]
+
+def test_expired_lease_on_last_attempt_fails(client, clock, monkeypatch):
+    monkeypatch.setitem(job_queue._handlers, 'noop', lambda: None)
+    job_queue.enqueue('noop', max_attempts=1)
+    db.session.commit()
+
+    # The only attempt hung its worker past the lease
+    assert Job.claim(clock.now, clock.now + timedelta(seconds=300)) is not None
+    clock.now += timedelta(seconds=300)
+    assert job_queue.run_pending() == 0
+    db.session.expire_all()
+    assert [(job.status, job.attempts, job.last_error) for job in jobs()] == [('failed', 1, 'Lease expired on the last attempt')]
+
+def test_outcome_of_an_expired_lease_is_discarded(client, clock, monkeypatch):
+    monkeypatch.setitem(job_queue._handlers, 'noop', lambda: None)
+    job_queue.enqueue('noop')
+    db.session.commit()
+
+    job_id, _, _, stale_attempt, _, _ = Job.claim(clock.now, clock.now + timedelta(seconds=300))
+    clock.now += timedelta(seconds=300)
+    # Another worker reclaims the job and is still running it when the first one finishes
+    assert Job.claim(clock.now, clock.now + timedelta(seconds=300))[3] == stale_attempt + 1
+    assert not Job.finish(job_id, stale_attempt, clock.now, error='RuntimeError: too late')
+    db.session.expire_all()
+    assert [(job.status, job.last_error) for job in jobs()] == [('running', None)]
+
+def test_event_addresses_are_geocoded_in_the_background(client, monkeypatch):
+    client.application.config['GEOCODER_URL'] = 'https://geocoder.test/search'
+    queries = []
+
+    def geocode(url, query, timeout):
+        queries.append(query)
+        return 40.7128, -74.006
+
+    monkeypatch.setattr(tasks, 'geocode', geocode)
+    address = {key: value for key, value in event_payload['addresses'][0].items() if key not in ('latitude', 'longitude')}
+    token = create_event(client, payload={**event_payload, 'addresses': [address, event_payload['addresses'][0]]}).get_json()['data']['token']
+    assert [job.kind for job in jobs()] == ['geocode_address']
+
+    before = client.get(f'/events/{token}')
+    assert job_queue.run_pending() == 1
+    assert queries == ['21 Test St, Apt 1, Test City, Test State, 12345, US']
+
+    response = client.get(f'/events/{token}', headers={'If-None-Match': before.headers['ETag']})
+    assert response.status_code == 200
+    coordinates = [(a['latitude'], a['longitude']) for a in response.get_json()['data']['addresses']]
+    assert sorted(coordinates) == [(0.0, 0.0), (40.7128, -74.006)]
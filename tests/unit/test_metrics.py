@@ -0,0 +1,53 @@
+import gc
+import threading
+
+from backend.services.metrics import ShardedCounters
+
+from .test_events import create_event, get_event_by_token
+
+def test_sharded_counters_across_threads():
+    counters = ShardedCounters()
+
+    def work():
+        for _ in range(1000):
+            counters.inc('requests')
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counters.snapshot() == {'requests': 8000}
+
+def test_sharded_counters_retire_finished_threads():
+    counters = ShardedCounters()
+
+    # As under a thread-per-request server
+    for _ in range(2000):
+        thread = threading.Thread(target=counters.inc, args=('requests',))
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    assert len(counters._shards) <= 1
+    assert counters.snapshot() == {'requests': 2000}
+    counters.clear()
+    assert counters.snapshot() == {}
+
+def test_metrics_endpoint(client):
+    token = create_event(client).get_json()['data']['token']
+    get_event_by_token(client, token)
+    client.get('/events/not-a-token')
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+
+    assert 'pickadate_http_requests_total{resource="EventListResource",method="POST",status="201"} 1' in body
+    assert 'pickadate_http_requests_total{resource="EventDetailResource",method="GET",status="200"} 1' in body
+    assert 'pickadate_http_errors_total{resource="EventDetailResource",status="401"} 1' in body
+    assert 'pickadate_http_request_duration_seconds_count{resource="EventDetailResource",method="GET"} 2' in body
+    assert 'pickadate_token_cache_hits' in body
+    assert 'pickadate_db_pool_checkouts' in body
+    assert token not in body
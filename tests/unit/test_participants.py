@@ -1,5 +1,9 @@
 import json
 
+import pytest
+
+from backend.models import Participant, AccessToken
+
 from .test_events import create_event
 
 participan_payload = {
@@ -78,4 +82,67 @@ def test_get_participant_by_token(client):
     assert response_json['status'] == 'success'
     assert len(response_json['data']['participants']) > 0
     assert 'participant_id' in response_json['data']['participants'][0]
-    assert response_json['data']['participants'][0]['name'] == participan_payload['name']
\ No newline at end of file
+    assert response_json['data']['participants'][0]['name'] == participan_payload['name']
+
+def test_get_participants_paginated(client):
+    token = create_event(client).get_json()['data']['token']
+    for i in range(5):
+        create_participant(client, payload={**participan_payload, "phone": f"555000{i}"}, token=token)
+
+    seen = []
+    cursor = None
+    while True:
+        query = '?limit=2&fields=name' + (f'&cursor={cursor}' if cursor else '')
+        data = client.get(f'/events/{token}/participants{query}').get_json()['data']
+        assert all(set(p) == {'participant_id', 'name'} for p in data['participants'])
+        seen.extend(p['participant_id'] for p in data['participants'])
+        cursor = data['next_cursor']
+        if cursor is None:
+            break
+
+    assert len(seen) == 5
+    assert seen == sorted(seen)
+
+    assert client.get(f'/events/{token}/participants?fields=password').status_code == 400
+    assert client.get(f'/events/{token}/participants?cursor=garbage').status_code == 400
+
+def test_patch_participant(client):
+    token = create_event(client).get_json()['data']['token']
+    create_participant(client, token=token)
+    phone = participan_payload['phone']
+
+    response = client.patch(f'/events/{token}/participants/{phone}', data=json.dumps({
+        "postal_code": "54321",
+        "is_driver": True
+    }), content_type='application/json')
+    assert response.status_code == 200
+
+    participant = client.get(f'/events/{token}/participants/{phone}').get_json()['data']
+    assert participant['postal_code'] == '54321'
+    assert participant['is_driver'] is True
+
+    def patch(phone, payload):
+        return client.patch(f'/events/{token}/participants/{phone}', data=json.dumps(payload), content_type='application/json')
+
+    assert patch(phone, {"is_driver": "yes"}).status_code == 400
+    assert patch(phone, {"phone": "1"}).status_code == 400
+    assert patch('0000000000', {"name": "Nobody"}).status_code == 404
+
+    # Participants of other events cannot be updated through this token
+    other_token = create_event(client).get_json()['data']['token']
+    create_participant(client, payload={**participan_payload, "phone": "5550009999"}, token=other_token)
+    assert patch('5550009999', {"name": "Intruder"}).status_code == 404
+
+def test_participant_apply_update_requires_one_key(client):
+    token = create_event(client).get_json()['data']['token']
+    create_participant(client, token=token)
+    create_participant(client, payload={**participan_payload, "phone": "5550009999"}, token=token)
+    event_uuid = AccessToken.get_by_token(token).event_uuid
+
+    with pytest.raises(ValueError):
+        Participant.apply_update(event_uuid, {'name': 'Everyone'})
+    with pytest.raises(ValueError):
+        Participant.apply_update(event_uuid, {'name': 'Both'}, participant_id=1, phone='5550009999')
+
+    names = [p['name'] for p in client.get(f'/events/{token}/participants').get_json()['data']['participants']]
+    assert names == [participan_payload['name']] * 2
@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from backend.services.pool_metrics import MeteredQueuePool, pool_metrics
+
+def test_pool_metrics_track_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path}/pool.db', poolclass=MeteredQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.01)
+    pool_metrics.attach(engine)
+
+    with engine.connect() as connection:
+        connection.execute(text('SELECT 1'))
+        assert pool_metrics.stats()['checked_out'] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = pool_metrics.stats()
+    assert stats['checkouts'] == 1
+    assert stats['checkins'] == 1
+    assert stats['connects'] == 1
+    assert stats['timeouts'] == 1
+    assert stats['checked_out'] == 0
+    assert stats['pool'] == 'MeteredQueuePool'
+    engine.dispose()
+
+def test_pool_endpoint(client):
+    response = client.get('/internal/pool')
+    assert response.status_code == 200
+    assert 'checkouts' in response.get_json()['data']
+
+    client.application.config['INTERNAL_API_TOKEN'] = 'secret'
+    assert client.get('/internal/pool').status_code == 404
+    assert client.get('/internal/pool', headers={'X-Internal-Token': 'secret'}).status_code == 200
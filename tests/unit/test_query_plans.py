@@ -0,0 +1,119 @@
+import os
+import re
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event
+
+from backend.app import db
+from backend.models import Event, Participant, Date, EventAddress, AccessToken, EventArchive, ArchivedToken, Job
+
+INITDB = os.path.join(os.path.dirname(__file__), '..', '..', 'initdb', '01_PickADateDB.sql')
+
+# A SCAN of a table without an index reads every row; SEARCH and index-ordered scans do not
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+@contextmanager
+def capture_statements():
+    """
+    Collects the (statement, parameters) pairs of the reads and writes executed while the block runs.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+def full_scans(statements):
+    scans = []
+    connection = db.session.connection()
+    for statement, parameters in statements:
+        for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters):
+            match = FULL_SCAN.match(row[-1])
+            # Aliased tables show up as <table>_<n>; subqueries and co-routines are not tables
+            if match and re.sub(r'_\d+$', '', match.group(1)) in db.metadata.tables:
+                scans.append((match.group(1), statement))
+    return scans
+
+@pytest.fixture
+def seeded(client):
+    event_row = Event.create(event_name='plans', description='', max_date=date(2025, 5, 31), min_date=date(2025, 5, 1))
+    db.session.flush()
+    EventAddress.create(
+        event_uuid=event_row.event_uuid, address_name='a', street_line_1='s', street_line_2='', city='c',
+        state_or_province='p', country_code='US', postal_code='1'
+    )
+    token = AccessToken.create(event_uuid=event_row.event_uuid)
+    participant = Participant.create(
+        event_uuid=event_row.event_uuid, name='p', phone='555', postal_code='1', icon_path='', color='', is_driver=True
+    )
+    db.session.flush()
+    Date.create(event_uuid=event_row.event_uuid, participant_id=participant.participant_id, date=date(2025, 5, 10))
+    db.session.commit()
+    return event_row.event_uuid, participant.participant_id, token.token
+
+def query_methods(event_uuid, participant_id, token):
+    return {
+        'Event.get_event_by_uuid': lambda: Event.get_event_by_uuid(event_uuid),
+        'Event.get_version': lambda: Event.get_version(event_uuid),
+        'Event.bump_version': lambda: Event.bump_version(event_uuid),
+        'Event.get_event_detail_by_uuid': lambda: Event.get_event_detail_by_uuid(event_uuid),
+        'Event.update_name': lambda: Event.update_name(event_uuid, 'renamed'),
+        'Event.update_description': lambda: Event.update_description(event_uuid, 'described'),
+        'Event.apply_update': lambda: Event.apply_update(event_uuid, {'min_date': date(2025, 5, 2)}),
+        'Participant.get_participants_by_event_uuid': lambda: Participant.get_participants_by_event_uuid(event_uuid),
+        'Participant.get_participants_page': lambda: Participant.get_participants_page(event_uuid, after=0, limit=10),
+        'Participant.get_roster_by_event_uuid': lambda: Participant.get_roster_by_event_uuid(event_uuid),
+        'Participant.get_participant_by_phone_and_event_uuid': lambda: Participant.get_participant_by_phone_and_event_uuid('555', event_uuid),
+        'Participant.get_participants_by_date': lambda: Participant.get_participants_by_date(date(2025, 5, 10)),
+        'Participant.update_location': lambda: Participant.update_location(participant_id, '2', event_uuid),
+        'Participant.update_is_driver': lambda: Participant.update_is_driver(participant_id, False, event_uuid),
+        'Participant.lock_in_event': lambda: Participant.lock_in_event(participant_id, event_uuid),
+        'Participant.apply_update': lambda: Participant.apply_update(event_uuid, {'name': 'q'}, phone='555'),
+        'Date.get_date_by_date_by_id_participant_and_event': lambda: Date.get_date_by_date_by_id_participant_and_event(1, participant_id, event_uuid),
+        'Date.get_dates_by_participant_and_event': lambda: Date.get_dates_by_participant_and_event(participant_id, event_uuid),
+        'Date.get_dates_page': lambda: Date.get_dates_page(participant_id, event_uuid, after=0, limit=10),
+        'Date.get_availability_rows_by_event': lambda: Date.get_availability_rows_by_event(event_uuid),
+        'Date.get_availability_counts_by_event': lambda: Date.get_availability_counts_by_event(event_uuid),
+        'Date.sync_participant_dates': lambda: (Date.sync_participant_dates(event_uuid, participant_id, {date(2025, 5, 11): 1}), db.session.flush()),
+        'Date.bulk_upsert': lambda: Date.bulk_upsert(event_uuid, participant_id, {date(2025, 5, 12): 0}),
+        'AccessToken.get_by_token': lambda: AccessToken.get_by_token(token),
+        'AccessToken.revoke': lambda: AccessToken.revoke(token),
+        'EventAddress.set_coordinates': lambda: EventAddress.set_coordinates(event_uuid, 1, 1.5, 2.5),
+        'Event.deactivate': lambda: Event.deactivate(event_uuid),
+        'EventArchive.archive_batch': lambda: EventArchive.archive_batch(date(2025, 7, 1), date(2025, 7, 1), 10),
+        'EventArchive.get_detail': lambda: EventArchive.get_detail(event_uuid),
+        'ArchivedToken.get_event_uuid': lambda: ArchivedToken.get_event_uuid(token),
+        'Job.claim': lambda: Job.claim(datetime(2025, 5, 1), datetime(2025, 5, 2)),
+        'Job.finish': lambda: Job.finish(1, 1, datetime(2025, 5, 1)),
+        'Job.count_by_status': lambda: Job.count_by_status()
+    }
+
+def test_model_queries_use_indexes(seeded):
+    failures = {}
+    for name, method in query_methods(*seeded).items():
+        with capture_statements() as statements:
+            method()
+        assert statements, name
+        scans = full_scans(statements)
+        if scans:
+            failures[name] = scans
+    assert failures == {}
+
+def test_initdb_declares_the_model_indexes():
+    with open(INITDB) as f:
+        sql = f.read()
+    for table in db.metadata.sorted_tables:
+        body = re.search(rf'CREATE TABLE IF NOT EXISTS `PickADateDB`.`{table.name}` \((.*?)\n\);', sql, re.S).group(1)
+        declared = set(re.findall(r'(?:INDEX|CONSTRAINT) `(\w+)`\s*(?:\(|UNIQUE)', body))
+        expected = {index.name for index in table.indexes}
+        expected |= {c.name for c in table.constraints if c.name and type(c).__name__ == 'UniqueConstraint'}
+        assert expected <= declared, table.name
+        assert {name for name in declared if name.startswith(('ix_', 'uix_'))} == expected, table.name
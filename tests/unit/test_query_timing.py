@@ -0,0 +1,68 @@
+import itertools
+import json
+import logging
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from backend.app import db
+from backend.models import Participant, AccessToken
+from backend.services import query_timing
+
+from ..test_helpers import count_queries
+from .test_events import create_event, get_event_by_token
+from .test_participants import create_participant, participan_payload
+
+def test_server_timing_header(client):
+    token = create_event(client).get_json()['data']['token']
+
+    response = get_event_by_token(client, token)
+
+    timing = response.headers['Server-Timing']
+    assert timing.startswith('db;dur=')
+    assert 'queries"' in timing
+    assert 'db-slowest;dur=' in timing
+
+def test_slow_queries_are_logged(client, caplog):
+    from backend.services.query_timing import query_timer
+    query_timer.slow_query_seconds = 0
+
+    with caplog.at_level(logging.WARNING, logger='backend.services.query_timing'):
+        create_event(client)
+
+    slow = [json.loads(r.message) for r in caplog.records if 'slow_query' in r.message]
+    assert slow
+    assert slow[0]['path'] == '/events'
+    assert 'INSERT INTO event' in ' '.join(s['statement'] for s in slow)
+
+def test_sampling_skips_header(client):
+    from backend.services.query_timing import query_timer
+    query_timer.sample_rate = 0
+
+    response = create_event(client)
+
+    assert 'Server-Timing' not in response.headers
+
+def test_timing_is_exact_after_a_failed_statement(client, monkeypatch):
+    token = create_event(client).get_json()['data']['token']
+    create_participant(client, token=token)
+    # Every perf_counter call advances one second, so each timed statement takes exactly 1000 ms
+    ticks = itertools.count()
+    monkeypatch.setattr(query_timing, 'time', SimpleNamespace(perf_counter=lambda: next(ticks)))
+
+    # The duplicate phone fails on the unique constraint, so after_cursor_execute never runs for it
+    connection_info = repr(db.session.connection().info)
+    with pytest.raises(IntegrityError):
+        Participant.create(event_uuid=AccessToken.get_by_token(token).event_uuid, **participan_payload, icon_path='', color='')
+        db.session.flush()
+    db.session.rollback()
+    # Nothing is left behind on the pooled connection
+    assert repr(db.session.connection().info) == connection_info
+
+    with count_queries() as statements:
+        response = client.get(f'/events/{token}/participants')
+    assert response.status_code == 200
+    assert statements
+    expected = f'db;dur={len(statements) * 1000:.2f};desc="{len(statements)} queries"'
+    assert response.headers['Server-Timing'].startswith(expected)
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import select
+
+from backend.app import create_app, db
+from backend.services.pool_metrics import MeteredQueuePool, pool_metrics, replica_pool_metrics
+from backend.services.replica_routing import get_replica_engine
+
+from .test_events import create_event
+
+@pytest.fixture
+def replica_app(tmp_path):
+    app = create_app('testing', config_overrides={
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path}/primary.db',
+        'SQLALCHEMY_REPLICA_URI': f'sqlite:///{tmp_path}/replica.db'
+    })
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(get_replica_engine())
+    yield app
+    with app.app_context():
+        db.metadata.drop_all(get_replica_engine())
+        db.drop_all()
+
+def replicate(app):
+    with app.app_context():
+        with db.engines[None].connect() as primary, get_replica_engine().begin() as replica:
+            for table in db.metadata.sorted_tables:
+                rows = [dict(row._mapping) for row in primary.execute(select(table))]
+                if rows:
+                    replica.execute(table.insert(), rows)
+
+def test_reads_go_to_replica_outside_write_window(replica_app):
+    writer = replica_app.test_client()
+    token = create_event(writer).get_json()['data']['token']
+
+    # The writer reads its own write from the primary
+    assert writer.get(f'/events/{token}').status_code == 200
+
+    # Another client reads from the replica, which has not caught up yet
+    reader = replica_app.test_client()
+    assert reader.get(f'/events/{token}').status_code == 404
+
+    replicate(replica_app)
+    assert reader.get(f'/events/{token}').status_code == 200
+
+def test_write_window_expires(replica_app):
+    replica_app.config['READ_YOUR_WRITES_SECONDS'] = 0
+    writer = replica_app.test_client()
+    token = create_event(writer).get_json()['data']['token']
+
+    assert writer.get(f'/events/{token}').status_code == 404
+
+def test_replica_pool_has_its_own_metrics(tmp_path):
+    app = create_app('testing', config_overrides={
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path}/primary.db',
+        'SQLALCHEMY_REPLICA_URI': f'sqlite:///{tmp_path}/replica.db',
+        'SQLALCHEMY_ENGINE_OPTIONS': {'poolclass': MeteredQueuePool, 'pool_size': 1, 'max_overflow': 0}
+    })
+    with app.app_context():
+        with get_replica_engine().connect():
+            pass
+        with db.engine.connect():
+            pass
+
+        # Replica checkouts must not skew the primary's pool sizing signal
+        assert (pool_metrics.wait_count, replica_pool_metrics.wait_count) == (1, 1)
+        assert replica_pool_metrics.stats()['pool'] == 'ReplicaMeteredQueuePool'
+        get_replica_engine().dispose()
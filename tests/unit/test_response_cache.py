@@ -0,0 +1,105 @@
+import threading
+import time
+
+from backend.services.response_cache import ResponseCache, MemoryBackend, event_detail_cache
+from backend.models import Event
+
+from ..test_helpers import count_queries
+from .test_events import create_event, get_event_by_token
+from .test_participants import create_participant
+
+def test_response_cache_versions_and_lru():
+    cache = ResponseCache(maxsize=2, ttl=60)
+    builds = []
+
+    def build(payload):
+        def run():
+            builds.append(payload)
+            return payload
+        return run
+
+    assert cache.get_or_build('a', 1, build(b'a1')) == b'a1'
+    assert cache.get_or_build('a', 1, build(b'unused')) == b'a1'
+    # A new version replaces the entry
+    assert cache.get_or_build('a', 2, build(b'a2')) == b'a2'
+
+    cache.get_or_build('b', 1, build(b'b1'))
+    cache.get_or_build('c', 1, build(b'c1'))
+    assert cache.get_or_build('a', 2, build(b'a2 again')) == b'a2 again'
+
+    # Missing events are not cached
+    assert cache.get_or_build('d', 1, lambda: None) is None
+    assert cache.get_or_build('d', 1, build(b'd1')) == b'd1'
+
+    assert builds == [b'a1', b'a2', b'b1', b'c1', b'a2 again', b'd1']
+    assert cache.stats()['evictions'] == 3
+
+def test_response_cache_single_flight():
+    cache = ResponseCache()
+    started = threading.Event()
+    release = threading.Event()
+    builds = []
+
+    def build():
+        builds.append(1)
+        started.set()
+        release.wait(5)
+        return b'payload'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_build('a', 1, build)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(cache.get_or_build('a', 1, build))) for _ in range(10)]
+    for thread in followers:
+        thread.start()
+    while cache.stats()['coalesced'] < 10:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert results == [b'payload'] * 11
+    assert len(builds) == 1
+
+def test_response_cache_shared_tier():
+    shared = MemoryBackend()
+    first = ResponseCache(shared=shared)
+    second = ResponseCache(shared=shared)
+
+    first.get_or_build('a', 1, lambda: b'payload')
+    # Another worker reuses the payload instead of rebuilding it
+    assert second.get_or_build('a', 1, lambda: b'rebuilt') == b'payload'
+    assert second.stats()['shared_hits'] == 1
+    # but not for another version
+    assert second.get_or_build('a', 2, lambda: b'v2') == b'v2'
+
+    second.invalidate('a')
+    assert shared.get('event-detail:a') is None
+    assert second.get_or_build('a', 2, lambda: b'rebuilt') == b'rebuilt'
+
+def test_cached_event_detail_skips_queries(client):
+    token = create_event(client).get_json()['data']['token']
+    expected = get_event_by_token(client, token)
+
+    with count_queries() as statements:
+        response = get_event_by_token(client, token)
+
+    # Only the version lookup for the ETag runs
+    assert len(statements) == 1
+    assert response.get_json() == expected.get_json()
+    assert response.headers['ETag'] == expected.headers['ETag']
+    assert event_detail_cache.stats()['hits'] == 1
+
+def test_writes_invalidate_event_detail(client):
+    token = create_event(client).get_json()['data']['token']
+    get_event_by_token(client, token)
+    event_uuid = next(iter(event_detail_cache._entries))
+
+    create_participant(client, token=token)
+    assert event_uuid not in event_detail_cache._entries
+    assert get_event_by_token(client, token).get_json()['data']['participants_count'] == 1
+
+    Event.update_name(event_uuid, 'Renamed')
+    assert event_uuid not in event_detail_cache._entries
+    assert get_event_by_token(client, token).get_json()['data']['event_name'] == 'Renamed'
@@ -0,0 +1,34 @@
+from datetime import date
+from decimal import Decimal
+
+from backend.services.serialization import Schema, iso, as_float
+from backend.utilities import Utility
+
+from .test_events import get_event_by_token, event_payload
+
+class Row:
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+def test_schema_dump_and_projection():
+    schema = Schema('id', ('day', iso), ('latitude', as_float))
+
+    assert schema.dump(Row(id=1, day=date(2025, 5, 1), latitude=Decimal('1.5'))) == {'id': 1, 'day': '2025-05-01', 'latitude': 1.5}
+    assert schema.dump_row((2, None, None)) == {'id': 2, 'day': None, 'latitude': None}
+
+    projection = schema.only(['latitude', 'id'])
+    assert projection.names == ('id', 'latitude')
+    assert projection is schema.only({'id', 'latitude'})
+    assert projection.dump_rows([(3, Decimal('2.25'))]) == [{'id': 3, 'latitude': 2.25}]
+
+def test_dump_json_is_compact():
+    assert Utility.dump_json({'a': [1, date(2025, 5, 1)]}) == b'{"a":[1,"2025-05-01"]}'
+
+def test_event_detail_serialization(client):
+    response = get_event_by_token(client)
+    data = response.get_json()['data']
+
+    assert data['min_date'] == event_payload['min_date']
+    assert data['addresses'][0]['street_line_1'] == event_payload['addresses'][0]['street_line_1']
+    assert data['participants_count'] == 0
+    assert b'\n    ' not in response.data
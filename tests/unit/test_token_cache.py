@@ -0,0 +1,65 @@
+from backend.services.token_cache import TokenCache, token_cache
+from backend.models import Event, AccessToken
+
+from ..test_helpers import count_queries, FakeClock
+from .test_events import create_event, get_event_by_token
+
+def test_token_cache_lru_and_ttl():
+    clock = FakeClock()
+    cache = TokenCache(maxsize=2, ttl=10, clock=clock)
+
+    cache.set('a', 'event-a')
+    cache.set('b', 'event-b')
+    assert cache.get('a') == 'event-a'
+
+    # 'b' is the least recently used entry
+    cache.set('c', 'event-c')
+    assert cache.get('b') is None
+    assert cache.get('c') == 'event-c'
+
+    clock.now = 11
+    assert cache.get('a') is None
+
+    stats = cache.stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 2
+    assert stats['evictions'] == 1
+
+def test_token_cache_invalidate_event():
+    cache = TokenCache()
+    cache.set('a', 'event-a')
+    cache.set('b', 'event-a')
+    cache.set('c', 'event-c')
+
+    cache.invalidate_event('event-a')
+
+    assert cache.get('a') is None
+    assert cache.get('b') is None
+    assert cache.get('c') == 'event-c'
+
+def test_cached_token_skips_lookup(client):
+    token = create_event(client).get_json()['data']['token']
+    get_event_by_token(client, token)
+
+    with count_queries() as statements:
+        response = get_event_by_token(client, token)
+
+    assert response.status_code == 200
+    assert not any('access_token' in s for s in statements)
+
+def test_revoked_token_is_rejected(client):
+    token = create_event(client).get_json()['data']['token']
+    assert get_event_by_token(client, token).status_code == 200
+
+    AccessToken.revoke(token)
+
+    assert get_event_by_token(client, token).status_code == 401
+
+def test_deactivate_invalidates_token(client):
+    token = create_event(client).get_json()['data']['token']
+    get_event_by_token(client, token)
+    event_uuid = token_cache.get(token)
+
+    Event.deactivate(event_uuid)
+
+    assert token_cache.get(token) is None
@@ -0,0 +1,19 @@
+import uuid
+
+from sqlalchemy import Column, MetaData, Table, create_engine, select
+
+from backend.services.uuid_type import CompactUUID
+
+def test_compact_uuid_round_trip():
+    engine = create_engine('sqlite://')
+    table = Table('t', MetaData(), Column('id', CompactUUID(), primary_key=True))
+    table.metadata.create_all(engine)
+    value = str(uuid.uuid4())
+
+    with engine.begin() as connection:
+        connection.execute(table.insert(), [{'id': value}])
+        stored = connection.exec_driver_sql('SELECT id FROM t').scalar()
+        loaded = connection.execute(select(table.c.id).where(table.c.id == value)).scalar()
+
+    assert stored == uuid.UUID(value).bytes
+    assert loaded == value